@@ -0,0 +1,87 @@
+"""Precompute the minimax bot's decisions into a memory-mappable table.
+
+Every reachable (ball y, ball y direction, ball approaching, paddle y)
+state is searched once with minimax_alpha_beta and the best move is stored
+in two bits. Load the result with `python main.py --policy-table FILE`.
+
+Usage:
+    python build_policy_table.py minimax_policy.bin --workers 8
+"""
+import argparse
+import os
+import time
+from multiprocessing import Pool
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import main as game
+
+BALL_SPEED = 7
+BALL_Y_MIN = 0
+BALL_Y_COUNT = game.SCREEN_HEIGHT + 1
+PADDLE_Y_MIN = 0
+PADDLE_Y_COUNT = game.SCREEN_HEIGHT - 120 + 1
+
+def search_row(row):
+    """Best move codes for every paddle y with one ball state"""
+    approaching, vy_index, ball_y_index = row
+    # Canonical left-paddle view: the folded-out dimensions do not change the move
+    ball = game.Ball(0, BALL_Y_MIN + ball_y_index)
+    ball.speed_x = -BALL_SPEED if approaching else BALL_SPEED
+    ball.speed_y = BALL_SPEED if vy_index else -BALL_SPEED
+    opponent = game.Paddle(game.SCREEN_WIDTH - 64, 0, game.WHITE)
+    codes = bytearray(PADDLE_Y_COUNT)
+    for paddle_y_index in range(PADDLE_Y_COUNT):
+        paddle = game.Paddle(40, PADDLE_Y_MIN + paddle_y_index, game.WHITE)
+        _, move = game.minimax_alpha_beta(ball, paddle, opponent, None, depth=4,
+                                          alpha=float('-inf'), beta=float('inf'),
+                                          maximizing=True, is_left_paddle=True)
+        codes[paddle_y_index] = game.POLICY_MOVES.index(move)
+    return codes
+
+def build_table(path, workers=None):
+    rows = [(approaching, vy_index, ball_y_index)
+            for approaching in range(2)
+            for vy_index in range(2)
+            for ball_y_index in range(BALL_Y_COUNT)]
+    entries = len(rows) * PADDLE_Y_COUNT
+    packed = bytearray((entries + 3) // 4)
+
+    index = 0
+    pool = Pool(workers)
+    try:
+        # Rows come back in order, so states land at their policy_table_index
+        for codes in pool.imap(search_row, rows, chunksize=8):
+            for code in codes:
+                packed[index >> 2] |= code << ((index & 3) * 2)
+                index += 1
+    finally:
+        # Not terminate(), which the with-statement calls: the workers inherit
+        # SDL's SIGTERM handler from importing main and would never exit
+        pool.close()
+        pool.join()
+
+    header = game.POLICY_HEADER.pack(game.POLICY_MAGIC, game.POLICY_VERSION, BALL_Y_MIN, BALL_Y_COUNT,
+                                     PADDLE_Y_MIN, PADDLE_Y_COUNT, BALL_SPEED)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(packed)
+    os.replace(tmp_path, path)
+    return entries
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the minimax policy table")
+    parser.add_argument("output", nargs="?", default="minimax_policy.bin")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    entries = build_table(args.output, args.workers)
+    size = os.path.getsize(args.output)
+    print(f"Wrote {entries} states to {args.output} ({size / 1024:.0f} KiB) "
+          f"in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
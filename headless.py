@@ -0,0 +1,296 @@
+"""Headless AI vs AI matches for analysis and batch runs.
+
+HeadlessMatch mirrors the main game loop frame by frame without drawing.
+EventDrivenMatch jumps the ball straight to the next event (paddle or
+center contact window, goal, AI decision tick), since between collisions
+it moves in a straight line. The AIs decide every frame in the real game,
+so at the default --decision-interval 1 the next decision tick is always
+one frame away. The event engine then runs as many iterations as the
+fixed one, with the same result. It only skips frames when the AIs decide
+less often, and then the match differs from the 60 Hz game.
+
+Usage:
+    python headless.py --matches 10 --engine event --decision-interval 4
+"""
+import argparse
+import math
+import os
+import random
+import struct
+import time
+
+# Pygame needs a video driver even though nothing is shown
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import main as game
+
+ARENA_CENTER_Y = game.HEADER_HEIGHT + 20 + (game.SCREEN_HEIGHT - game.HEADER_HEIGHT) // 2
+AI_COLORS = game.AI_COLORS
+MATCH_STATE = struct.Struct("<IIIIIiiB")  # tick, total_ticks, iterations, decisions, rally_hits, scores, last hitter
+
+class HeadlessMatch:
+    """One match stepped exactly like the main loop, one frame per iteration"""
+    def __init__(self, left_ai_type="minimax", right_ai_type="hybrid",
+                 duration=game.MATCH_DURATION, seed=None, left_params=None, right_params=None):
+        if seed is not None:
+            random.seed(seed)
+        self.seed = seed
+        self.left_ai_type = left_ai_type
+        self.right_ai_type = right_ai_type
+        self.left_params = left_params or game.DEFAULT_AI_PARAMS
+        self.right_params = right_params or game.DEFAULT_AI_PARAMS
+        self.left_paddle = game.Paddle(40, ARENA_CENTER_Y - 60, AI_COLORS.get(left_ai_type, game.WHITE))
+        self.right_paddle = game.Paddle(game.SCREEN_WIDTH - 64, ARENA_CENTER_Y - 60,
+                                        AI_COLORS.get(right_ai_type, game.WHITE))
+        self.ball = game.Ball(game.SCREEN_WIDTH // 2, ARENA_CENTER_Y)
+        self.center_ball = game.Ball(game.SCREEN_WIDTH // 2, ARENA_CENTER_Y)
+        self.center_ball.speed_x = 0
+        self.center_ball.speed_y = 5
+        self.left_score = 0
+        self.right_score = 0
+        self.last_hitter = None
+        self.tick = 0
+        self.total_ticks = int(duration * game.TICKS_PER_SECOND)
+        self.iterations = 0
+        self.decisions = 0
+        self.rally_hits = 0
+        self._switches_start = dict(game.hybrid_switches)
+        self._plan_stats_start = dict(game.hybrid_plan_stats)
+        self._mcts_start = dict(game.mcts_stats)
+
+    def finished(self):
+        return self.tick >= self.total_ticks
+
+    def move_ball(self, frames=1):
+        events, self.last_hitter = game.advance_ball(self.ball, self.left_paddle, self.right_paddle,
+                                                     self.center_ball, self.last_hitter, steps=frames)
+        self.rally_hits = game.record_ball_metrics(events, self.rally_hits)
+        for kind, side in events:
+            if kind == 'hit':
+                game.log_event("hit", "debug", side=side, tick=self.tick)
+            elif kind == 'score':
+                if side == 'left':
+                    self.left_score += 1
+                else:
+                    self.right_score += 1
+                game.log_event("score", scorer=side, left=self.left_score, right=self.right_score,
+                               tick=self.tick)
+        return events
+
+    def decide(self):
+        left_reaction, right_reaction = game.auto_balance_difficulty(self.left_score, self.right_score,
+                                                                     self.left_params, self.right_params)
+        start = time.perf_counter()
+        game.ai_frame(self.left_ai_type, self.right_ai_type, self.left_paddle, self.right_paddle,
+                      self.ball, self.center_ball, self.left_score, self.right_score,
+                      left_reaction, right_reaction, self.left_params, self.right_params)
+        game.ai_latency_metric.observe(time.perf_counter() - start)
+        self.decisions += 1
+
+    def step(self):
+        self.move_ball()
+        self.decide()
+        self.left_paddle.advance()
+        self.right_paddle.advance()
+        self.tick += 1
+        self.iterations += 1
+
+    def run(self):
+        while not self.finished():
+            self.step()
+        game.matches_metric.inc(1, game.match_winner(self.left_score, self.right_score))
+        return self.result()
+
+    def snapshot(self):
+        """This match as bytes (see main.snapshot_game for what is kept)"""
+        mcts = {key: value - self._mcts_start[key] for key, value in game.mcts_stats.items()}
+        switches = {key: value - self._switches_start[key] for key, value in game.hybrid_switches.items()}
+        plan_stats = {key: value - self._plan_stats_start[key] for key, value in game.hybrid_plan_stats.items()}
+        return b"".join((
+            game.snapshot_header(),
+            MATCH_STATE.pack(self.tick, self.total_ticks, self.iterations, self.decisions, self.rally_hits,
+                             self.left_score, self.right_score, game.HITTERS.index(self.last_hitter)),
+            game.pack_counters(switches, plan_stats, mcts),
+            game.pack_ball(self.ball),
+            game.pack_ball(self.center_ball),
+            game.pack_paddle(self.left_paddle),
+            game.pack_paddle(self.right_paddle),
+            game.pack_rng_state(),
+        ))
+
+    def restore(self, data):
+        """Continue from a snapshot() of a match with the same AI types and params"""
+        has_pcg, offset = game.read_snapshot_header(data)
+        (self.tick, self.total_ticks, self.iterations, self.decisions, self.rally_hits,
+         self.left_score, self.right_score, hitter) = MATCH_STATE.unpack_from(data, offset)
+        self.last_hitter = game.HITTERS[hitter]
+        # result() reports the global counters relative to these starting points
+        (_, _, switches, plan_stats, mcts), offset = game.unpack_counters(data, offset + MATCH_STATE.size)
+        self._switches_start = {key: game.hybrid_switches[key] - switches[key] for key in switches}
+        self._plan_stats_start = {key: game.hybrid_plan_stats[key] - plan_stats[key] for key in plan_stats}
+        self._mcts_start = {key: game.mcts_stats[key] - mcts[key] for key in mcts}
+        offset = game.unpack_ball(self.ball, data, offset)
+        offset = game.unpack_ball(self.center_ball, data, offset)
+        offset = game.unpack_paddle(self.left_paddle, data, offset)
+        offset = game.unpack_paddle(self.right_paddle, data, offset)
+        game.unpack_rng_state(data, offset, has_pcg)
+
+    def result(self):
+        switches = {k: game.hybrid_switches[k] - self._switches_start[k] for k in self._switches_start}
+        hits = game.hybrid_plan_stats["hits"] - self._plan_stats_start["hits"]
+        misses = game.hybrid_plan_stats["misses"] - self._plan_stats_start["misses"]
+        return {
+            'seed': self.seed,
+            'left_ai_type': self.left_ai_type,
+            'right_ai_type': self.right_ai_type,
+            'left_score': self.left_score,
+            'right_score': self.right_score,
+            'winner': game.match_winner(self.left_score, self.right_score),
+            'ticks': self.tick,
+            'iterations': self.iterations,
+            'decisions': self.decisions,
+            'hybrid_switches': switches,
+            'plan_cache_hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'mcts': game.mcts_summary(self._mcts_start),
+        }
+
+class EventDrivenMatch(HeadlessMatch):
+    """Jumps from event to event and only asks the AIs every `decision_interval` frames.
+
+    With decision_interval=1 every frame is a decision tick, so this steps
+    frame by frame and reproduces HeadlessMatch exactly, with no saving.
+    Larger intervals make the paddles follow their last decision in between.
+    That skips frames and AI calls, but it plays a different game from the
+    real one, so scores are not comparable with interval 1.
+    """
+    def __init__(self, *args, decision_interval=1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.decision_interval = max(1, decision_interval)
+
+    def contact_windows(self):
+        # x ranges the ball must stay clear of to fly without touching anything,
+        # padded by one frame of travel
+        margin = abs(self.ball.speed_x)
+        windows = []
+        for rect in (self.left_paddle.rect, self.right_paddle.rect):
+            windows.append((rect.left - margin, rect.right + margin))
+        center_x = game.SCREEN_WIDTH // 2
+        half = self.center_ball.rect.width // 2
+        windows.append((center_x - half - margin, center_x + half + margin))
+        return windows
+
+    def frames_to_next_event(self):
+        frames = min(self.total_ticks - self.tick,
+                     self.decision_interval - self.tick % self.decision_interval)
+        x = self.ball.rect.x
+        width = self.ball.rect.width
+        vx = self.ball.speed_x
+        if vx == 0:
+            return 1
+
+        for low, high in self.contact_windows():
+            if x < high and x + width > low:
+                return 1
+            # Time until the ball's leading edge reaches a window ahead of it
+            if vx > 0 and x + width <= low:
+                frames = min(frames, max(1, math.ceil((low - x - width) / vx)))
+            elif vx < 0 and x >= high:
+                frames = min(frames, max(1, math.ceil((x - high) / -vx)))
+
+        # Stop on the frame a goal is scored so the reset is not skipped over
+        if vx < 0:
+            goal_time = x / -vx
+        else:
+            goal_time = (game.SCREEN_WIDTH - width - x) / vx
+        return min(frames, max(1, int(goal_time) + 1))
+
+    def step(self):
+        frames = self.frames_to_next_event()
+        self.move_ball()
+        if self.tick % self.decision_interval == 0:
+            self.decide()
+        self.left_paddle.advance(frames)
+        self.right_paddle.advance(frames)
+        if frames > 1:
+            self.move_ball(frames - 1)
+        self.tick += frames
+        self.iterations += 1
+
+def play_match(left_ai_type="minimax", right_ai_type="hybrid", seed=None, duration=game.MATCH_DURATION,
+               engine="event", decision_interval=1, left_params=None, right_params=None):
+    """Run one headless match and return its result dict"""
+    if engine == "fixed":
+        match = HeadlessMatch(left_ai_type, right_ai_type, duration=duration, seed=seed,
+                              left_params=left_params, right_params=right_params)
+    else:
+        match = EventDrivenMatch(left_ai_type, right_ai_type, duration=duration, seed=seed,
+                                 decision_interval=decision_interval,
+                                 left_params=left_params, right_params=right_params)
+    return match.run()
+
+def profile_ticks(ticks, left_ai_type, right_ai_type, seed, duration, prefix, interval):
+    """Step HeadlessMatches for `ticks` frames under the sampling profiler and write its output"""
+    match = HeadlessMatch(left_ai_type, right_ai_type, duration=duration, seed=seed)
+    profiler = game.SamplingProfiler(interval)
+    profiler.start()
+    while profiler.ticks < ticks:
+        if match.finished():
+            seed += 1
+            match = HeadlessMatch(left_ai_type, right_ai_type, duration=duration, seed=seed)
+        match.step()
+        profiler.mark_tick()
+    profiler.stop()
+    print(profiler.report())
+    print("wrote {} and {}".format(*profiler.write(prefix)))
+
+def main():
+    parser = argparse.ArgumentParser(description="Run AI vs AI matches without a window")
+    parser.add_argument("--matches", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duration", type=float, default=game.MATCH_DURATION, help="match length in seconds")
+    parser.add_argument("--engine", choices=["event", "fixed"], default="event")
+    parser.add_argument("--decision-interval", type=int, default=1,
+                        help="frames between AI decisions; above 1 is faster but no longer the 60 Hz game")
+    parser.add_argument("--left", choices=game.AI_TYPES, default="minimax", help="left AI type")
+    parser.add_argument("--right", choices=game.AI_TYPES, default="hybrid", help="right AI type")
+    parser.add_argument("--policy-table", help="minimax policy table from build_policy_table.py")
+    parser.add_argument("--minimax-eval", choices=["tree", "batched"], help="minimax leaf evaluation mode")
+    parser.add_argument("--log-level", choices=list(game.LOG_LEVELS), default="warning",
+                        help="lowest event level to record")
+    parser.add_argument("--log-file", help="append events to this file as JSON lines")
+    parser.add_argument("--metrics-file", help="write Prometheus metrics to this file after each match")
+    parser.add_argument("--profile", type=int, metavar="TICKS",
+                        help="run TICKS frame-by-frame ticks under the sampling profiler instead of --matches")
+    parser.add_argument("--profile-out", default="profile", metavar="PREFIX",
+                        help="write PREFIX.folded (collapsed stacks) and PREFIX.txt (summary)")
+    parser.add_argument("--profile-interval", type=float, default=1.0, help="sampling interval in ms")
+    args = parser.parse_args()
+    game.configure_event_log(args.log_level, args.log_file)
+    if args.policy_table:
+        game.load_minimax_policy(args.policy_table)
+    game.set_minimax_eval_mode(args.minimax_eval)
+
+    if args.profile:
+        profile_ticks(args.profile, args.left, args.right, args.seed, args.duration,
+                      args.profile_out, args.profile_interval / 1000)
+        return
+
+    for i in range(args.matches):
+        start = time.perf_counter()
+        result = play_match(args.left, args.right, seed=args.seed + i, duration=args.duration,
+                            engine=args.engine, decision_interval=args.decision_interval)
+        elapsed = time.perf_counter() - start
+        print(f"seed {result['seed']}: {result['left_score']}-{result['right_score']} ({result['winner']}) "
+              f"| {result['ticks']} ticks in {result['iterations']} iterations, "
+              f"{result['decisions']} decision ticks, {elapsed:.2f}s | hybrid {result['hybrid_switches']}, "
+              f"plan cache hit rate {result['plan_cache_hit_rate']:.1%}")
+        if result['mcts']:
+            mcts = result['mcts']
+            print(f"    mcts: {mcts['mcts_rollouts_per_second']:,} rollouts/s, "
+                  f"{mcts['mcts_tree_nodes']:,} tree nodes per decision, {mcts['mcts_reuse_rate']:.1%} trees re-rooted")
+        if args.metrics_file:
+            game.metrics.write(args.metrics_file)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Glicko rating ladder for AI configurations.
+
+Register any number of configurations (an AI type plus DEFAULT_AI_PARAMS
+overrides), then let the ladder schedule headless matches between them on
+a pool of worker processes. Pairings are chosen by how much a result would
+teach us: close ratings and uncertain players are played first. Ratings,
+per-player W/D/L and per-pairing bot1/bot2/draw counts are written back to
+the ladder file as results come in, so an interrupted run loses nothing.
+
+Usage:
+    python ladder.py register deep_center --ai hybrid --param center_penalty=50
+    python ladder.py run --matches 2000 --workers 8
+    python ladder.py show
+"""
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import main as game
+import headless
+from sweep import parse_value
+
+LADDER_FILE = "ai_ladder.json"
+INITIAL_RATING = 1500.0
+INITIAL_RD = 350.0
+MIN_RD = 30.0
+GLICKO_Q = math.log(10) / 400
+
+def glicko_g(rd):
+    return 1 / math.sqrt(1 + 3 * GLICKO_Q ** 2 * rd ** 2 / math.pi ** 2)
+
+def expected_score(rating, opponent_rating, opponent_rd):
+    return 1 / (1 + 10 ** (-glicko_g(opponent_rd) * (rating - opponent_rating) / 400))
+
+def glicko_update(player, opponent, score):
+    """New (rating, rd) for `player` after one game scoring 1, 0.5 or 0"""
+    g = glicko_g(opponent["rd"])
+    e = expected_score(player["rating"], opponent["rating"], opponent["rd"])
+    d_squared = 1 / (GLICKO_Q ** 2 * g ** 2 * e * (1 - e))
+    denominator = 1 / player["rd"] ** 2 + 1 / d_squared
+    rating = player["rating"] + GLICKO_Q / denominator * g * (score - e)
+    return rating, max(MIN_RD, math.sqrt(1 / denominator))
+
+def pair_key(a, b):
+    return f"{a} vs {b}"
+
+class Ladder:
+    def __init__(self, path=LADDER_FILE):
+        self.path = path
+        self.load()
+
+    def load(self):
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.players = data.get('players', {})
+            self.pairs = data.get('pairs', {})
+            self.total_matches = data.get('total_matches', 0)
+            self.next_seed = data.get('next_seed', self.total_matches)
+        else:
+            self.players = {}
+            self.pairs = {}
+            self.total_matches = 0
+            self.next_seed = 0
+            self.register("minimax", "minimax")
+            self.register("hybrid", "hybrid")
+
+    def save(self):
+        data = {'players': self.players, 'pairs': self.pairs, 'total_matches': self.total_matches,
+                'next_seed': self.next_seed}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def register(self, name, ai_type, params=None):
+        game.ai_params(**(params or {}))  # reject unknown keys up front
+        self.players[name] = {
+            'ai': ai_type,
+            'params': params or {},
+            'rating': INITIAL_RATING,
+            'rd': INITIAL_RD,
+            'wins': 0,
+            'draws': 0,
+            'losses': 0,
+        }
+
+    def information(self, a, b):
+        """How much a game between a and b is expected to move the ratings"""
+        pa, pb = self.players[a], self.players[b]
+        e = expected_score(pa['rating'], pb['rating'], pb['rd'])
+        return e * (1 - e) * (pa['rd'] ** 2 + pb['rd'] ** 2)
+
+    def next_pairings(self, count, in_flight):
+        """The `count` most informative pairings.
+
+        A pairing that already has games in flight is discounted by their
+        number, so results still being played are not scheduled over and
+        over while the ratings they would update are stale.
+        """
+        names = list(self.players)
+        information = {(a, b): self.information(a, b) for i, a in enumerate(names) for b in names[i + 1:]}
+        if not information:
+            return []
+        scheduled = {pair: in_flight.count(pair) for pair in information}
+        chosen = []
+        for _ in range(count):
+            pair = max(information, key=lambda p: information[p] / (1 + scheduled[p]))
+            scheduled[pair] += 1
+            chosen.append(pair)
+        return chosen
+
+    def record_match(self, a, b, winner):
+        """Apply one result; winner is "bot1" (a), "bot2" (b) or "draw" """
+        pa, pb = self.players[a], self.players[b]
+        score = 1.0 if winner == "bot1" else 0.0 if winner == "bot2" else 0.5
+        new_a = glicko_update(pa, pb, score)
+        new_b = glicko_update(pb, pa, 1 - score)
+        pa['rating'], pa['rd'] = new_a
+        pb['rating'], pb['rd'] = new_b
+
+        if winner == "bot1":
+            pa['wins'] += 1
+            pb['losses'] += 1
+        elif winner == "bot2":
+            pb['wins'] += 1
+            pa['losses'] += 1
+        else:
+            pa['draws'] += 1
+            pb['draws'] += 1
+
+        pair = self.pairs.setdefault(pair_key(a, b),
+                                     {'bot1_wins': 0, 'bot2_wins': 0, 'draws': 0, 'total_matches': 0})
+        pair['total_matches'] += 1
+        if winner == "bot1":
+            pair['bot1_wins'] += 1
+        elif winner == "bot2":
+            pair['bot2_wins'] += 1
+        else:
+            pair['draws'] += 1
+        self.total_matches += 1
+
+    def standings(self):
+        return sorted(self.players.items(), key=lambda item: item[1]['rating'], reverse=True)
+
+def play_ladder_match(job):
+    """Worker side: play a vs b with a on the given side, return the result from a's point of view"""
+    a, b, player_a, player_b, a_left, seed, duration, decision_interval = job
+    left, right = (player_a, player_b) if a_left else (player_b, player_a)
+    result = headless.play_match(left['ai'], right['ai'], seed=seed, duration=duration,
+                                 decision_interval=decision_interval,
+                                 left_params=game.ai_params(**left['params']),
+                                 right_params=game.ai_params(**right['params']))
+    winner = result['winner']
+    if not a_left and winner != "draw":
+        winner = "bot2" if winner == "bot1" else "bot1"
+    return a, b, winner
+
+def run_ladder(ladder, matches, workers, duration, decision_interval, save_every):
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    pending = {}
+    played = 0
+    unsaved = 0
+    with ProcessPoolExecutor(workers) as pool:
+        while played < matches:
+            scheduled = played + len(pending)
+            slots = min(workers * 2 - len(pending), matches - scheduled)
+            if slots > 0:
+                for a, b in ladder.next_pairings(slots, list(pending.values())):
+                    seed = ladder.next_seed
+                    ladder.next_seed += 1
+                    job = (a, b, ladder.players[a], ladder.players[b], seed % 2 == 0, seed,
+                           duration, decision_interval)
+                    pending[pool.submit(play_ladder_match, job)] = (a, b)
+            if not pending:
+                raise SystemExit("Need at least two registered configurations")
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                del pending[future]
+                a, b, winner = future.result()
+                ladder.record_match(a, b, winner)
+                played += 1
+                unsaved += 1
+            if unsaved >= save_every:
+                ladder.save()
+                unsaved = 0
+            rate = played / (time.perf_counter() - start) * 3600
+            print(f"\r{played}/{matches} matches ({rate:.0f}/hour)", end="", flush=True)
+    ladder.save()
+    print()
+
+def show(ladder):
+    print(f"{'#':>3} {'name':<20} {'ai':<8} {'rating':>7} {'±':>5} {'W':>5} {'D':>5} {'L':>5}")
+    for rank, (name, player) in enumerate(ladder.standings(), 1):
+        print(f"{rank:>3} {name:<20} {player['ai']:<8} {player['rating']:>7.0f} {2 * player['rd']:>5.0f} "
+              f"{player['wins']:>5} {player['draws']:>5} {player['losses']:>5}")
+    print(f"{ladder.total_matches} matches played")
+
+def parse_param(text):
+    key, sep, value = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError("expected KEY=VALUE")
+    return key, parse_value(value)
+
+def main():
+    parser = argparse.ArgumentParser(description="Rate AI configurations against each other")
+    parser.add_argument("--ladder", default=LADDER_FILE, help="ladder file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    register = commands.add_parser("register", help="add or replace a configuration")
+    register.add_argument("name")
+    register.add_argument("--ai", choices=game.AI_TYPES, default="hybrid")
+    register.add_argument("--param", action="append", type=parse_param, default=[], metavar="KEY=VALUE")
+
+    run = commands.add_parser("run", help="play rated matches")
+    run.add_argument("--matches", type=int, default=100)
+    run.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    run.add_argument("--duration", type=float, default=game.MATCH_DURATION, help="match length in seconds")
+    run.add_argument("--decision-interval", type=int, default=1,
+                     help="frames between AI decisions; above 1 is faster but no longer the 60 Hz game")
+    run.add_argument("--save-every", type=int, default=10, help="results between ladder file writes")
+    run.add_argument("--policy-table", help="minimax policy table from build_policy_table.py")
+
+    commands.add_parser("show", help="print the standings")
+    args = parser.parse_args()
+
+    ladder = Ladder(args.ladder)
+    if args.command == "register":
+        try:
+            ladder.register(args.name, args.ai, dict(args.param))
+        except KeyError as e:
+            parser.error(e.args[0])
+        ladder.save()
+        print(f"Registered {args.name} ({args.ai}) with {len(ladder.players)} configurations on the ladder")
+    elif args.command == "run":
+        if args.policy_table:
+            game.load_minimax_policy(args.policy_table)
+        run_ladder(ladder, args.matches, args.workers, args.duration, args.decision_interval, args.save_every)
+        show(ladder)
+    else:
+        show(ladder)
+
+if __name__ == "__main__":
+    main()
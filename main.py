@@ -1,9 +1,34 @@
 import pygame
+import argparse
+import atexit
+import bisect
+import gc
+import http.server
 import random
 import time
 import json
 import os
 import math
+import mmap
+import queue
+import shutil
+import struct
+import subprocess
+import sys
+import threading
+import tracemalloc
+from collections import deque
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import resource
+except ImportError:  # not on Windows
+    resource = None
 
 # Initialize Pygame
 pygame.init()
@@ -56,16 +81,257 @@ def load_bot_images():
 
 bot1_image, bot2_image = load_bot_images()
 
-# Ball trail storage
-ball_trail = []
-game_logs = []
+# Trail lengths (samples kept in each ring buffer)
+BALL_TRAIL_LENGTH = 15
+PADDLE_TRAIL_LENGTH = 5
+
+# ============================================
+# EVENT LOG
+# ============================================
+
+LOG_LEVELS = {"debug": 10, "info": 20, "warning": 30, "off": 100}
+
+class EventLogger:
+    """Structured match events kept in a ring buffer and flushed off-thread.
+
+    log() filters by level before building anything, appends a dict to two
+    bounded deques and returns; a background thread writes the pending
+    records in batches as JSON lines to `path` and/or as text to stdout.
+    Nothing on the game thread waits on I/O.
+    """
+    def __init__(self, level="info", path=None, console=False, capacity=1000,
+                 pending_limit=100000, flush_interval=0.25):
+        self.threshold = LOG_LEVELS[level]
+        self.path = path
+        self.console = console
+        self.recent = deque(maxlen=capacity)
+        self.pending = deque()
+        self.pending_limit = pending_limit
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self._stop = threading.Event()
+        self._flusher = None
+        if path or console:
+            self._file = open(path, "a") if path else None
+            self._flusher = threading.Thread(target=self._flush_loop, name="event-log", daemon=True)
+            self._flusher.start()
+
+    def enabled(self, level):
+        return LOG_LEVELS[level] >= self.threshold
+
+    def log(self, event, level="info", **fields):
+        if LOG_LEVELS[level] < self.threshold:
+            return
+        record = {"t": round(time.time(), 4), "level": level, "event": event}
+        record.update(fields)
+        self.recent.append(record)
+        if self._flusher:
+            if len(self.pending) >= self.pending_limit:
+                self.dropped += 1
+            else:
+                self.pending.append(record)
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        batch = []
+        while self.pending:
+            batch.append(self.pending.popleft())
+        if not batch:
+            return
+        if self._file:
+            self._file.write("".join(json.dumps(record) + "\n" for record in batch))
+            self._file.flush()
+        if self.console:
+            sys.stdout.write("".join(format_event(record) + "\n" for record in batch))
+            sys.stdout.flush()
+        self.written += len(batch)
+
+    def close(self):
+        if self._flusher:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+            if self._file:
+                self._file.close()
+
+def format_event(record):
+    fields = " ".join(f"{k}={v}" for k, v in record.items() if k not in ("t", "level", "event"))
+    return f"[{record['level']}] {record['event']} {fields}".rstrip()
+
+# Replaced by main() from the command line; importers (headless tools)
+# get a quiet in-memory logger
+event_log = EventLogger()
+
+def configure_event_log(level="info", path=None, console=False):
+    global event_log
+    event_log.close()
+    event_log = EventLogger(level, path, console)
+    return event_log
+
+# The menus leave through quit(); flush whatever is still pending
+atexit.register(lambda: event_log.close())
 
 # Performance metrics
 minimax_decisions = 0
 fuzzy_decisions = 0
 hybrid_switches = {"fuzzy": 0, "minimax": 0}
+hybrid_plan_stats = {"hits": 0, "misses": 0}
+mcts_stats = {"decisions": 0, "rollouts": 0, "search_time": 0.0, "tree_nodes": 0, "reused": 0}
+
+# ============================================
+# METRICS
+# ============================================
+
+class Counter:
+    """Monotonic count, optionally split by one label"""
+    kind = "counter"
+
+    def __init__(self, name, help_text, label=None):
+        self.name = name
+        self.help = help_text
+        self.label = label
+        self.values = {}
+
+    def inc(self, amount=1, label_value=None):
+        self.values[label_value] = self.values.get(label_value, 0) + amount
+
+    def samples(self):
+        for label_value, value in self.values.items():
+            labels = f'{{{self.label}="{label_value}"}}' if self.label else ""
+            yield f"{self.name}{labels} {value}"
+
+class Gauge(Counter):
+    """Value read from the game state when exported"""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, read, label=None):
+        super().__init__(name, help_text, label)
+        self.read = read
+
+    def samples(self):
+        value = self.read()
+        self.values = value if self.label else {None: value}
+        return super().samples()
+
+class Histogram:
+    """Fixed buckets: observe() is a bisect and an increment"""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, bounds):
+        self.name = name
+        self.help = help_text
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        cumulative = 0
+        for bound, bucket in zip(self.bounds, self.counts):
+            cumulative += bucket
+            yield f'{self.name}_bucket{{le="{bound:g}"}} {cumulative}'
+        yield f'{self.name}_bucket{{le="+Inf"}} {self.count}'
+        yield f"{self.name}_sum {self.sum:.6f}"
+        yield f"{self.name}_count {self.count}"
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def to_prometheus(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serve /metrics from a daemon thread"""
+        registry = self
+
+        class MetricsHandler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+metrics = MetricsRegistry()
+frame_time_metric = metrics.add(Histogram(
+    "pong_frame_seconds", "Time to simulate and draw one frame, excluding the frame-rate wait",
+    (0.002, 0.004, 0.008, 0.012, 0.0167, 0.025, 0.033, 0.05, 0.1)))
+ai_latency_metric = metrics.add(Histogram(
+    "pong_ai_decision_seconds", "Time both AIs spend deciding one frame",
+    (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025)))
+rally_metric = metrics.add(Histogram(
+    "pong_rally_hits", "Paddle hits between goals", (0, 1, 2, 3, 5, 8, 13, 21)))
+matches_metric = metrics.add(Counter("pong_matches_total", "Matches finished", "winner"))
+goals_metric = metrics.add(Counter("pong_goals_total", "Goals scored", "side"))
+paddle_hits_metric = metrics.add(Counter("pong_paddle_hits_total", "Ball hits by paddles", "side"))
+idle_wall_metric = metrics.add(Counter("pong_idle_seconds_total", "Time spent on idle screens", "screen"))
+idle_cpu_metric = metrics.add(Counter("pong_idle_cpu_seconds_total", "CPU time used on idle screens", "screen"))
+metrics.add(Gauge("pong_match_minimax_decisions", "Minimax searches since the last match reset",
+                  lambda: minimax_decisions))
+metrics.add(Gauge("pong_match_fuzzy_decisions", "Fuzzy decisions since the last match reset",
+                  lambda: fuzzy_decisions))
+metrics.add(Gauge("pong_match_hybrid_strategy", "Hybrid AI turns per strategy since the last match reset",
+                  lambda: dict(hybrid_switches), "strategy"))
+metrics.add(Gauge("pong_match_plan_cache_hit_rate", "Hybrid plan cache hit rate since the last match reset",
+                  lambda: round(plan_cache_hit_rate(), 4)))
+metrics.add(Gauge("pong_match_mcts_rollouts_per_second", "MCTS rollouts per second of search since the last match reset",
+                  lambda: mcts_summary().get("mcts_rollouts_per_second", 0)))
+metrics.add(Gauge("pong_match_mcts_tree_nodes", "Mean MCTS tree size per decision since the last match reset",
+                  lambda: mcts_summary().get("mcts_tree_nodes", 0)))
+
+def record_ball_metrics(events, rally_hits):
+    """Count hits and goals from advance_ball events; returns the rally length so far"""
+    for kind, side in events:
+        if kind == 'hit':
+            paddle_hits_metric.inc(1, side)
+            rally_hits += 1
+        elif kind == 'score':
+            goals_metric.inc(1, side)
+            rally_metric.observe(rally_hits)
+            rally_hits = 0
+    return rally_hits
 
 # AI role tracking
+AI_TYPES = ("minimax", "hybrid", "mcts")
+AI_COLORS = {"minimax": NEON_PURPLE, "hybrid": NEON_CYAN, "mcts": GOLD}
+match_ai_types = ("minimax", "hybrid")  # the two bots randomize_ai_roles seats; main() takes --ai
 left_ai_type = "minimax"
 right_ai_type = "hybrid"
 left_ai_color = NEON_PURPLE
@@ -73,6 +339,41 @@ right_ai_color = NEON_CYAN
 left_ai_reaction = 0.05
 right_ai_reaction = 0.05
 
+# Tunable AI constants. Each paddle can be given its own copy, e.g. by
+# sweep.py; everything defaults to these values.
+DEFAULT_AI_PARAMS = {
+    # evaluate_state
+    "my_distance_weight": 0.5,
+    "opponent_distance_weight": 0.3,
+    "center_penalty": 30,
+    "intercept_bonus": 20,
+    "edge_penalty": 10,
+    # enhanced_hybrid_decision
+    "fuzzy_near_weight": 0.6,
+    "fuzzy_urgency_weight": 0.3,
+    "fuzzy_pressure_weight": 0.2,
+    "minimax_far_weight": 0.5,
+    "minimax_lead_weight": 0.4,
+    "minimax_center_weight": 0.3,
+    # auto_balance_difficulty
+    "base_reaction": 0.05,
+    "leader_reaction": 0.08,
+    # MCTS: search time per decision (s) and UCT exploration constant
+    "mcts_budget": 0.004,
+    "mcts_exploration": 0.7,
+}
+EVALUATION_PARAMS = ("my_distance_weight", "opponent_distance_weight", "center_penalty",
+                     "intercept_bonus", "edge_penalty")
+
+def ai_params(**overrides):
+    """Copy of DEFAULT_AI_PARAMS with some values replaced"""
+    unknown = set(overrides) - set(DEFAULT_AI_PARAMS)
+    if unknown:
+        raise KeyError(f"Unknown AI parameter(s): {', '.join(sorted(unknown))}")
+    params = dict(DEFAULT_AI_PARAMS)
+    params.update(overrides)
+    return params
+
 # Bot display names
 bot1_color = NEON_PURPLE
 bot2_color = NEON_CYAN
@@ -82,8 +383,8 @@ bot2_color = NEON_CYAN
 # ============================================
 
 class MatchStatistics:
-    def __init__(self):
-        self.stats_file = "ai_battle_stats.json"
+    def __init__(self, stats_file="ai_battle_stats.json"):
+        self.stats_file = stats_file
         self.load_stats()
     
     def load_stats(self):
@@ -167,6 +468,209 @@ except:
 
 paused = False
 
+class TrailBuffer:
+    """Fixed-size ring buffer of trail samples stored as (x, y, tag) arrays"""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.xs = array('h', [0]) * capacity
+        self.ys = array('h', [0]) * capacity
+        self.tags = array('B', [0]) * capacity
+        self.head = 0  # Next slot to overwrite
+        self.count = 0
+
+    def push(self, x, y, tag):
+        i = self.head
+        self.xs[i] = x
+        self.ys[i] = y
+        self.tags[i] = tag
+        self.head = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        # Oldest sample first, like the old list-based trails
+        start = (self.head - self.count) % self.capacity
+        for n in range(self.count):
+            i = (start + n) % self.capacity
+            yield self.xs[i], self.ys[i], self.tags[i]
+
+# Cached translucent sprites shared by trails and glows
+_sprite_cache = {}
+
+def get_circle_sprite(color, alpha, radius):
+    """Return a cached surface holding a filled circle of the given alpha"""
+    key = ('circle', color, alpha, radius)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius)
+        _sprite_cache[key] = sprite
+    return sprite
+
+def get_rounded_rect_sprite(color, alpha, size, rect, border_radius):
+    """Return a cached surface of `size` with a rounded rect drawn at `rect`"""
+    key = ('rect', color, alpha, size, rect, border_radius)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        sprite = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(sprite, (*color, alpha), rect, border_radius=border_radius)
+        _sprite_cache[key] = sprite
+    return sprite
+
+_font_cache = {96: font, 120: score_font, 64: menu_font, 48: small_score_font}
+
+def get_font(size):
+    """Default font at `size` px, shared by every arena that asks for it"""
+    cached = _font_cache.get(size)
+    if cached is None:
+        cached = _font_cache[size] = pygame.font.Font(None, size)
+    return cached
+
+def get_scaled_image(image, size):
+    key = ('image', id(image), size)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        sprite = _sprite_cache[key] = pygame.transform.scale(image, (size, size))
+    return sprite
+
+# ============================================
+# VIEWPORTS
+# ============================================
+
+# Effect detail, chosen from how large the arena ends up on screen
+DETAIL_LOW = 0      # flat shapes only
+DETAIL_MEDIUM = 1   # glows and short trails, no particles or grid
+DETAIL_FULL = 2
+
+def detail_for_scale(scale):
+    if scale >= 0.75:
+        return DETAIL_FULL
+    if scale >= 0.4:
+        return DETAIL_MEDIUM
+    return DETAIL_LOW
+
+class Viewport:
+    """A surface the arena is drawn onto, at `scale` times gameplay coordinates.
+
+    Gameplay always runs in SCREEN_WIDTH x SCREEN_HEIGHT coordinates; only
+    the draw functions go through a viewport.
+    """
+    def __init__(self, surface, scale=1.0, detail=None):
+        self.surface = surface
+        self.scale = scale
+        self.detail = detail_for_scale(scale) if detail is None else detail
+
+    def px(self, value):
+        return int(value * self.scale)
+
+    def size(self, value):
+        """Like px, but never shrinks a visible length to nothing"""
+        return max(1, int(value * self.scale))
+
+    def point(self, x, y):
+        return int(x * self.scale), int(y * self.scale)
+
+    def rect(self, rect):
+        return pygame.Rect(self.px(rect.x), self.px(rect.y), self.size(rect.width), self.size(rect.height))
+
+# The window itself, at full resolution; menus always draw here
+window_view = Viewport(screen)
+
+# The arena during a match: the window, or an offscreen surface at a lower
+# internal resolution that present_scene scales up to the window
+main_view = window_view
+
+def set_render_scale(scale):
+    """Render the arena at `scale` times the window resolution (1.0 draws to the window)"""
+    global main_view
+    if scale >= 1.0:
+        main_view = window_view
+        return
+    size = (max(1, int(SCREEN_WIDTH * scale)), max(1, int(SCREEN_HEIGHT * scale)))
+    # Every effect stays on: the render scale is a speed setting, not a small tile
+    main_view = Viewport(pygame.Surface(size).convert(), scale, DETAIL_FULL)
+
+def present_scene():
+    """Show the arena frame, upscaled to the window in one blit when rendered offscreen"""
+    if main_view is not window_view:
+        pygame.transform.scale(main_view.surface, screen.get_size(), screen)
+    pygame.display.flip()
+
+# ============================================
+# RENDER QUALITY
+# ============================================
+
+# Tiers from best to cheapest. "ultra" is the full effect set; the
+# governor walks down the list while frames run over budget.
+QUALITY_TIERS = (
+    {"name": "ultra", "particles": 4, "trail": BALL_TRAIL_LENGTH, "glow_layers": 5,
+     "background_particles": 30, "grid": True, "color": (80, 220, 120)},
+    {"name": "high", "particles": 2, "trail": 10, "glow_layers": 3,
+     "background_particles": 15, "grid": True, "color": (200, 220, 80)},
+    {"name": "medium", "particles": 1, "trail": 6, "glow_layers": 2,
+     "background_particles": 0, "grid": False, "color": ORANGE},
+    {"name": "low", "particles": 0, "trail": 3, "glow_layers": 1,
+     "background_particles": 0, "grid": False, "color": (230, 70, 70)},
+)
+QUALITY_NAMES = tuple(tier["name"] for tier in QUALITY_TIERS)
+
+render_quality = QUALITY_TIERS[0]
+
+def set_render_quality(name):
+    global render_quality
+    render_quality = QUALITY_TIERS[QUALITY_NAMES.index(name)]
+
+class QualityGovernor:
+    """Steps render_quality down when frames run over budget, back up when there is headroom.
+
+    Frame times are averaged over windows of `window` frames. One slow
+    window drops a tier; raising a tier takes `recover_windows` windows in
+    a row under `headroom` of the budget, so the tier does not flap.
+    """
+    def __init__(self, target_fps=60, window=30, headroom=0.7, recover_windows=4):
+        self.budget = 1 / target_fps
+        self.window = window
+        self.headroom = headroom
+        self.recover_windows = recover_windows
+        self.total = 0.0
+        self.frames = 0
+        self.calm = 0
+        self.changes = 0
+
+    def record(self, frame_time):
+        self.total += frame_time
+        self.frames += 1
+        if self.frames < self.window:
+            return
+        average = self.total / self.frames
+        self.total = 0.0
+        self.frames = 0
+        tier = QUALITY_NAMES.index(render_quality["name"])
+        if average > self.budget and tier < len(QUALITY_TIERS) - 1:
+            self.change(tier + 1, average)
+        elif average < self.budget * self.headroom and tier > 0:
+            self.calm += 1
+            if self.calm >= self.recover_windows:
+                self.change(tier - 1, average)
+        else:
+            self.calm = 0
+
+    def change(self, tier, average):
+        self.calm = 0
+        self.changes += 1
+        set_render_quality(QUALITY_NAMES[tier])
+        log_event("quality", tier=QUALITY_NAMES[tier], frame_ms=round(average * 1000, 2))
+
+quality_governor = None
+
+
 class Particle:
     def __init__(self, x, y, color):
         self.x = x
@@ -189,19 +693,15 @@ class Particle:
         self.lifetime -= 1
         self.rotation += 5
 
-    def draw(self, surface):
+    def draw(self, view):
         if self.lifetime > 0:
             alpha = max(0, int(255 * (self.lifetime / self.max_lifetime)))
-            glow_size = int(self.size * 2)
-            particle_surface = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-            color_with_alpha = (*self.color, alpha // 2)
-            pygame.draw.circle(particle_surface, color_with_alpha, (glow_size, glow_size), glow_size)
-            surface.blit(particle_surface, (self.x - glow_size, self.y - glow_size))
-            
-            main_color = (*self.color, alpha)
-            main_surface = pygame.Surface((int(self.size * 2), int(self.size * 2)), pygame.SRCALPHA)
-            pygame.draw.circle(main_surface, main_color, (int(self.size), int(self.size)), int(self.size))
-            surface.blit(main_surface, (self.x - self.size, self.y - self.size))
+            glow_size = view.size(self.size * 2)
+            view.surface.blit(get_circle_sprite(self.color, alpha // 2, glow_size),
+                              (view.px(self.x) - glow_size, view.px(self.y) - glow_size))
+            radius = view.size(self.size)
+            view.surface.blit(get_circle_sprite(self.color, alpha, radius),
+                              (view.px(self.x - self.size), view.px(self.y - self.size)))
 
 class Paddle:
     def __init__(self, x, y, color):
@@ -210,7 +710,9 @@ class Paddle:
         self.target_y = y
         self.color = color
         self.glow_intensity = 0
-        self.movement_trail = []
+        self.movement_trail = TrailBuffer(PADDLE_TRAIL_LENGTH)
+        self.hybrid_plan = None
+        self.mcts_tree = None
 
     def move(self, direction):
         if direction == "up" and self.rect.top > HEADER_HEIGHT:
@@ -220,42 +722,59 @@ class Paddle:
             self.target_y += self.speed
             self.glow_intensity = min(255, self.glow_intensity + 20)
 
-    def update(self):
+    def step_toward_target(self, max_step):
         if self.rect.centery < self.target_y:
-            self.rect.y += min(self.speed, self.target_y - self.rect.centery)
+            self.rect.y += min(max_step, self.target_y - self.rect.centery)
         elif self.rect.centery > self.target_y:
-            self.rect.y -= min(self.speed, self.rect.centery - self.target_y)
+            self.rect.y -= min(max_step, self.rect.centery - self.target_y)
+
+    def update(self):
+        self.step_toward_target(self.speed)
         
         # Add trail effect
-        self.movement_trail.append((self.rect.centery, self.glow_intensity))
-        if len(self.movement_trail) > 5:
-            self.movement_trail.pop(0)
+        self.movement_trail.push(self.rect.x, self.rect.centery, self.glow_intensity)
         
         # Fade glow
         self.glow_intensity = max(0, self.glow_intensity - 3)
 
-    def draw(self):
-        # Draw glow trail
-        for i, (y_pos, intensity) in enumerate(self.movement_trail):
-            if intensity > 0:
-                glow_surface = pygame.Surface((self.rect.width + 20, self.rect.height), pygame.SRCALPHA)
-                glow_color = (*self.color, int(intensity * 0.3 * (i / len(self.movement_trail))))
-                pygame.draw.rect(glow_surface, glow_color, (10, 0, self.rect.width, self.rect.height), border_radius=12)
-                screen.blit(glow_surface, (self.rect.x - 10, y_pos - self.rect.height // 2))
-        
-        # Draw main paddle with glow
-        glow_surface = pygame.Surface((self.rect.width + 16, self.rect.height + 16), pygame.SRCALPHA)
-        glow_alpha = int(self.glow_intensity * 0.6)
-        if glow_alpha > 0:
-            glow_color = (*self.color, glow_alpha)
-            pygame.draw.rect(glow_surface, glow_color, (8, 8, self.rect.width, self.rect.height), border_radius=12)
-            screen.blit(glow_surface, (self.rect.x - 8, self.rect.y - 8))
+    def advance(self, frames=1):
+        """Apply `frames` updates at once for headless runs (no trail)"""
+        self.step_toward_target(self.speed * frames)
+        self.glow_intensity = max(0, self.glow_intensity - 3 * frames)
+
+    def draw(self, view=None):
+        view = view or main_view
+        surface = view.surface
+        rect = view.rect(self.rect)
+        width, height = rect.width, rect.height
+        radius = view.size(12)
+        if view.detail >= DETAIL_MEDIUM and render_quality["glow_layers"] >= 3:
+            # Draw glow trail
+            trail_pad = view.size(10)
+            trail_length = len(self.movement_trail)
+            for i, (_, y_pos, intensity) in enumerate(self.movement_trail):
+                if intensity > 0:
+                    alpha = int(intensity * 0.3 * (i / trail_length))
+                    glow_surface = get_rounded_rect_sprite(self.color, alpha, (width + 2 * trail_pad, height),
+                                                           (trail_pad, 0, width, height), radius)
+                    surface.blit(glow_surface, (rect.x - trail_pad, view.px(y_pos) - height // 2))
+            
+            # Draw main paddle with glow
+            glow_alpha = int(self.glow_intensity * 0.6)
+            if glow_alpha > 0:
+                glow_pad = view.size(8)
+                glow_surface = get_rounded_rect_sprite(self.color, glow_alpha,
+                                                       (width + 2 * glow_pad, height + 2 * glow_pad),
+                                                       (glow_pad, glow_pad, width, height), radius)
+                surface.blit(glow_surface, (rect.x - glow_pad, rect.y - glow_pad))
         
         # Main paddle body
-        pygame.draw.rect(screen, self.color, self.rect, border_radius=12)
+        pygame.draw.rect(surface, self.color, rect, border_radius=radius)
         # Inner highlight
         highlight = tuple(min(255, c + 40) for c in self.color)
-        pygame.draw.rect(screen, highlight, (self.rect.x + 4, self.rect.y + 4, self.rect.width - 8, self.rect.height - 8), border_radius=8)
+        inset = view.size(4)
+        pygame.draw.rect(surface, highlight, (rect.x + inset, rect.y + inset, width - 2 * inset, height - 2 * inset),
+                         border_radius=view.size(8))
     
     def clone(self):
         new_paddle = Paddle(self.rect.x, self.rect.y, self.color)
@@ -271,58 +790,66 @@ class Ball:
         self.fire_color = FIRE_COLORS[0]
         self.particles = []
         self.rotation = 0
+        self.trail = TrailBuffer(BALL_TRAIL_LENGTH)
+        self.trajectory = 0  # Bumped on every bounce, hit and reset
 
-    def move(self):
-        self.rect.x += self.speed_x
-        self.rect.y += self.speed_y
+    def update_effects(self, particles=True):
+        """Spin, trail and particles for the frame after the ball has moved"""
         self.rotation += math.sqrt(self.speed_x**2 + self.speed_y**2) * 2
-        ball_trail.append((self.rect.copy(), self.fire_color))
-        if len(ball_trail) > 15:
-            ball_trail.pop(0)
-        for _ in range(4):
-            self.particles.append(Particle(self.rect.centerx, self.rect.centery, self.fire_color))
-
-    def draw(self):
-        # Draw trail with fade
-        for i, (trail_rect, trail_color) in enumerate(ball_trail):
-            alpha = int(255 * (i / len(ball_trail)) * 0.6)
-            if alpha > 0:
-                trail_surface = pygame.Surface((trail_rect.width + 10, trail_rect.height + 10), pygame.SRCALPHA)
-                trail_color_alpha = (*trail_color, alpha // 3)
-                pygame.draw.circle(trail_surface, trail_color_alpha, 
-                                 (trail_rect.width // 2 + 5, trail_rect.height // 2 + 5), 
-                                 (trail_rect.width // 2) + 5)
-                screen.blit(trail_surface, (trail_rect.x - 5, trail_rect.y - 5))
+        color_index = 0 if self.fire_color == FIRE_COLORS[0] else 1
+        self.trail.push(self.rect.x, self.rect.y, color_index)
+        if particles:
+            for _ in range(render_quality["particles"]):
+                self.particles.append(Particle(self.rect.centerx, self.rect.centery, self.fire_color))
+
+    def draw(self, view=None):
+        view = view or main_view
+        surface = view.surface
+        rect = view.rect(self.rect)
+        radius = rect.width // 2
+        if view.detail >= DETAIL_MEDIUM:
+            # Draw trail with fade; medium detail keeps only the newest samples
+            trail_length = len(self.trail)
+            trail_offset = view.size(5)
+            trail_radius = radius + trail_offset
+            skip = 0 if view.detail == DETAIL_FULL else trail_length // 2
+            skip = max(skip, trail_length - render_quality["trail"])
+            for i, (trail_x, trail_y, color_index) in enumerate(self.trail):
+                alpha = int(255 * (i / trail_length) * 0.6)
+                if alpha > 0 and i >= skip:
+                    trail_surface = get_circle_sprite(FIRE_COLORS[color_index], alpha // 3, trail_radius)
+                    surface.blit(trail_surface, (view.px(trail_x) - trail_offset, view.px(trail_y) - trail_offset))
         
         # Draw particles
         for particle in self.particles:
             particle.update()
-            particle.draw(screen)
+            if view.detail == DETAIL_FULL:
+                particle.draw(view)
         self.particles = [p for p in self.particles if p.lifetime > 0]
         
-        # Draw outer glow
-        glow_surface = pygame.Surface((self.rect.width + 16, self.rect.height + 16), pygame.SRCALPHA)
-        glow_color = (*self.fire_color, 100)
-        pygame.draw.circle(glow_surface, glow_color, (self.rect.width // 2 + 8, self.rect.height // 2 + 8), 
-                         self.rect.width // 2 + 8)
-        screen.blit(glow_surface, (self.rect.x - 8, self.rect.y - 8))
+        if view.detail >= DETAIL_MEDIUM:
+            # Draw outer glow
+            glow_pad = view.size(8)
+            glow_surface = get_circle_sprite(self.fire_color, 100, radius + glow_pad)
+            surface.blit(glow_surface, (rect.x - glow_pad, rect.y - glow_pad))
         
         # Draw main ball
-        pygame.draw.circle(screen, self.fire_color, self.rect.center, self.rect.width // 2)
+        pygame.draw.circle(surface, self.fire_color, rect.center, radius)
         # Inner highlight
         highlight = tuple(min(255, int(c * 1.3)) for c in self.fire_color)
-        pygame.draw.circle(screen, highlight, self.rect.center, self.rect.width // 3)
+        pygame.draw.circle(surface, highlight, rect.center, rect.width // 3)
         # Core
-        pygame.draw.circle(screen, WHITE, self.rect.center, self.rect.width // 6)
+        pygame.draw.circle(surface, WHITE, rect.center, max(1, rect.width // 6))
         
     def reset(self):
         self.rect.x = SCREEN_WIDTH // 2
         self.rect.y = HEADER_HEIGHT + 20 + (SCREEN_HEIGHT - HEADER_HEIGHT) // 2
         self.speed_x = 7 * random.choice((1, -1))
         self.speed_y = 7 * random.choice((1, -1))
-        ball_trail.clear()
+        self.trail.clear()
         self.particles.clear()
         self.rotation = 0
+        self.trajectory += 1
 
     def toggle_fire_color(self):
         self.fire_color = FIRE_COLORS[1] if self.fire_color == FIRE_COLORS[0] else FIRE_COLORS[0]
@@ -334,27 +861,237 @@ class Ball:
             self.rect.bottom = 0
     
     def clone(self):
-        new_ball = Ball(self.rect.x, self.rect.y)
+        # Search-only copy: skips __init__ so no trail is allocated and the
+        # random speeds are not drawn (keeps the RNG stream independent of search)
+        new_ball = Ball.__new__(Ball)
+        new_ball.rect = self.rect.copy()
         new_ball.speed_x = self.speed_x
         new_ball.speed_y = self.speed_y
         new_ball.fire_color = self.fire_color
         return new_ball
 
+# ============================================
+# SWEPT BALL PHYSICS
+# ============================================
+
+# Upper bound on collisions resolved inside a single advance_ball segment
+MAX_BOUNCES_PER_STEP = 32
+
+def sweep_box(x, y, vx, vy, width, height, ox, oy, ow, oh):
+    """Time of impact of a moving box against a static one, in frames.
+
+    Returns (time, axis) where axis is 'x' or 'y' for the face that was
+    entered, or 'overlap' if the boxes already intersect. Returns None if
+    the boxes never touch along the current velocity.
+    """
+    if vx > 0:
+        tx_entry = (ox - width - x) / vx
+        tx_exit = (ox + ow - x) / vx
+    elif vx < 0:
+        tx_entry = (ox + ow - x) / vx
+        tx_exit = (ox - width - x) / vx
+    elif ox - width < x < ox + ow:
+        tx_entry, tx_exit = float('-inf'), float('inf')
+    else:
+        return None
+
+    if vy > 0:
+        ty_entry = (oy - height - y) / vy
+        ty_exit = (oy + oh - y) / vy
+    elif vy < 0:
+        ty_entry = (oy + oh - y) / vy
+        ty_exit = (oy - height - y) / vy
+    elif oy - height < y < oy + oh:
+        ty_entry, ty_exit = float('-inf'), float('inf')
+    else:
+        return None
+
+    entry = max(tx_entry, ty_entry)
+    exit_time = min(tx_exit, ty_exit)
+    if entry >= exit_time or exit_time <= 0:
+        return None
+    if entry < 0:
+        return 0.0, 'overlap'
+    return entry, ('x' if tx_entry >= ty_entry else 'y')
+
+def frames_until_center_wrap(center_ball):
+    """Whole frames until move_vertical_center wraps the center ball to the top"""
+    return (SCREEN_HEIGHT - center_ball.rect.top) // abs(center_ball.speed_y) + 1
+
+def advance_ball(ball, left_paddle, right_paddle, center_ball, last_hitter, steps=1):
+    """Move the ball `steps` frames with continuous collision detection.
+
+    Walls, paddles and the center ball are tested by time of impact, so a
+    single call can resolve several bounces and a large `steps` never lets
+    the ball tunnel through a paddle. Paddles are treated as static for the
+    duration of the call; the center ball moves with it. Returns
+    (events, last_hitter) where events is a list of (kind, side) tuples with
+    kind in 'wall', 'hit', 'center' and 'score' (side is the scorer).
+    """
+    events = []
+    remaining = steps
+    while remaining > 0:
+        segment = remaining
+        if center_ball is not None:
+            center_ball.rect.centerx = SCREEN_WIDTH // 2
+            segment = min(segment, frames_until_center_wrap(center_ball))
+        consumed, last_hitter = _sweep_segment(ball, left_paddle, right_paddle, center_ball,
+                                               last_hitter, segment, events)
+        if center_ball is not None:
+            for _ in range(consumed):
+                center_ball.move_vertical_center()
+        remaining -= consumed
+    return events, last_hitter
+
+def _sweep_segment(ball, left_paddle, right_paddle, center_ball, last_hitter, duration, events):
+    x, y = float(ball.rect.x), float(ball.rect.y)
+    width, height = ball.rect.width, ball.rect.height
+    if center_ball is not None:
+        center_x = float(center_ball.rect.x)
+        center_y = float(center_ball.rect.y)
+        center_vy = abs(center_ball.speed_y)
+    t = 0.0
+
+    for _ in range(MAX_BOUNCES_PER_STEP):
+        vx, vy = ball.speed_x, ball.speed_y
+        best_dt = duration - t
+        best = None
+
+        # Top and bottom walls
+        if vy < 0:
+            dt = max(0.0, (HEADER_HEIGHT - y) / vy)
+            if dt < best_dt:
+                best_dt, best = dt, ('wall', None, None)
+        elif vy > 0:
+            dt = max(0.0, (SCREEN_HEIGHT - height - y) / vy)
+            if dt < best_dt:
+                best_dt, best = dt, ('wall', None, None)
+
+        # Paddles; an overlapping paddle only counts while the ball heads into it
+        # along the axis of least penetration, so a reflected ball never hits twice
+        for side, paddle in (('left', left_paddle), ('right', right_paddle)):
+            rect = paddle.rect
+            hit = sweep_box(x, y, vx, vy, width, height, rect.x, rect.y, rect.width, rect.height)
+            if hit is None:
+                continue
+            dt, axis = hit
+            if axis == 'overlap':
+                offset_x = x + width / 2 - rect.centerx
+                offset_y = y + height / 2 - rect.centery
+                if (width + rect.width) / 2 - abs(offset_x) <= (height + rect.height) / 2 - abs(offset_y):
+                    axis, approaching = 'x', offset_x * vx < 0
+                else:
+                    axis, approaching = 'y', offset_y * vy < 0
+                if not approaching:
+                    continue
+            if dt < best_dt:
+                best_dt, best = dt, ('hit', side, axis)
+
+        # Center ball, swept in its own moving frame
+        if center_ball is not None:
+            rel_vy = vy - center_vy
+            hit = sweep_box(x, y, vx, rel_vy, width, height, center_x, center_y + center_vy * t,
+                            center_ball.rect.width, center_ball.rect.height)
+            if hit is not None:
+                dt, axis = hit
+                approaching = True
+                if axis == 'overlap':
+                    dx = center_x - x
+                    dy = center_y + center_vy * t - y
+                    approaching = dx * vx + dy * rel_vy > 0
+                if approaching and dt < best_dt:
+                    best_dt, best = dt, ('center', None, axis)
+
+        # Goal lines
+        if vx < 0:
+            dt = max(0.0, -x / vx)
+            if dt < best_dt:
+                best_dt, best = dt, ('goal', 'right', None)
+        elif vx > 0:
+            dt = max(0.0, (SCREEN_WIDTH - width - x) / vx)
+            if dt < best_dt:
+                best_dt, best = dt, ('goal', 'left', None)
+
+        x += vx * best_dt
+        y += vy * best_dt
+        t += best_dt
+        if best is None:
+            break
+
+        kind, side, axis = best
+        ball.trajectory += 1
+        if kind == 'wall':
+            ball.speed_y *= -1
+            events.append(('wall', None))
+        elif kind == 'hit':
+            # Reflect off the face that was hit: the front face sends the ball
+            # back toward the opponent, the top and bottom faces bounce it vertically
+            if axis == 'x':
+                ball.speed_x = -vx
+            else:
+                ball.speed_y = -vy
+            ball.toggle_fire_color()
+            last_hitter = side
+            events.append(('hit', side))
+        elif kind == 'center':
+            if last_hitter is None:
+                ball.speed_x *= -1
+                ball.speed_y *= -1
+                events.append(('center', None))
+            else:
+                scorer = 'right' if last_hitter == 'left' else 'left'
+                events.append(('score', scorer))
+                ball.reset()
+                return _frames_consumed(t, duration), None
+            last_hitter = None
+        else:
+            events.append(('score', side))
+            ball.reset()
+            return _frames_consumed(t, duration), last_hitter
+    else:
+        # Out of bounce budget: finish the segment in a straight line, still
+        # inside the walls
+        x += ball.speed_x * (duration - t)
+        y += ball.speed_y * (duration - t)
+        if y < HEADER_HEIGHT or y > SCREEN_HEIGHT - height:
+            ball.speed_y = abs(ball.speed_y) if y < HEADER_HEIGHT else -abs(ball.speed_y)
+            y = min(max(y, HEADER_HEIGHT), SCREEN_HEIGHT - height)
+            events.append(('wall', None))
+
+    ball.rect.x = round(x)
+    ball.rect.y = round(y)
+    return duration, last_hitter
+
+def _frames_consumed(t, duration):
+    # Frame-by-frame stepping sees a contact at the end of frame floor(t) + 1,
+    # so coarse steps resume after the reset on exactly the same frame
+    return min(duration, int(t) + 1)
+
 # Fairness functions
 def randomize_ai_roles():
+    first, second = match_ai_types
     if random.choice([True, False]):
-        return "minimax", "hybrid", NEON_PURPLE, NEON_CYAN
+        left, right = first, second
     else:
-        return "hybrid", "minimax", NEON_CYAN, NEON_PURPLE
-
-def auto_balance_difficulty(left_score, right_score):
+        left, right = second, first
+    return (left, right) + ai_colors(left, right)
+
+def ai_colors(left_ai_type, right_ai_type):
+    """Paddle colors for a pairing: by AI type, or the two side colors in a mirror match"""
+    if left_ai_type == right_ai_type:
+        return NEON_PURPLE, NEON_CYAN
+    return AI_COLORS[left_ai_type], AI_COLORS[right_ai_type]
+
+def auto_balance_difficulty(left_score, right_score, left_params=DEFAULT_AI_PARAMS, right_params=DEFAULT_AI_PARAMS):
+    left_reaction = left_params["base_reaction"]
+    right_reaction = right_params["base_reaction"]
     score_diff = abs(left_score - right_score)
     if score_diff > 3:
         if left_score > right_score:
-            return 0.08, 0.05
+            left_reaction = left_params["leader_reaction"]
         else:
-            return 0.05, 0.08
-    return 0.05, 0.05
+            right_reaction = right_params["leader_reaction"]
+    return left_reaction, right_reaction
 
 # Fuzzy logic
 def fuzzy_ball_position(ball, ai_paddle):
@@ -388,36 +1125,37 @@ def simulate_ball_movement(ball_sim, steps=1):
         if ball_sim.rect.top <= 0 or ball_sim.rect.bottom >= SCREEN_HEIGHT:
             ball_sim.speed_y *= -1
 
-def evaluate_state(ball, my_paddle, opponent_paddle, center_ball, is_left_paddle):
+def evaluate_state(ball, my_paddle, opponent_paddle, center_ball, is_left_paddle, params=DEFAULT_AI_PARAMS):
     score = 0
     my_distance = abs(ball.rect.centery - my_paddle.rect.centery)
     opponent_distance = abs(ball.rect.centery - opponent_paddle.rect.centery)
     
-    score -= my_distance * 0.5
-    score += opponent_distance * 0.3
+    score -= my_distance * params["my_distance_weight"]
+    score += opponent_distance * params["opponent_distance_weight"]
     
     if center_ball:
         center_distance = abs(ball.rect.centerx - center_ball.rect.centerx)
         if center_distance < 50:
-            score -= 30
+            score -= params["center_penalty"]
     
     if is_left_paddle:
         if ball.speed_x < 0 and my_distance < 30:
-            score += 20
+            score += params["intercept_bonus"]
     else:
         if ball.speed_x > 0 and my_distance < 30:
-            score += 20
+            score += params["intercept_bonus"]
     
     if my_paddle.rect.top <= 10 or my_paddle.rect.bottom >= SCREEN_HEIGHT - 10:
-        score -= 10
+        score -= params["edge_penalty"]
     
     return score
 
-def minimax_alpha_beta(ball, my_paddle, opponent_paddle, center_ball, depth, alpha, beta, maximizing, is_left_paddle):
+def minimax_alpha_beta(ball, my_paddle, opponent_paddle, center_ball, depth, alpha, beta, maximizing, is_left_paddle,
+                       params=DEFAULT_AI_PARAMS):
     global minimax_decisions
     
     if depth == 0:
-        return evaluate_state(ball, my_paddle, opponent_paddle, center_ball, is_left_paddle), "stay"
+        return evaluate_state(ball, my_paddle, opponent_paddle, center_ball, is_left_paddle, params), "stay"
     
     moves = ["up", "stay", "down"]
     
@@ -439,7 +1177,7 @@ def minimax_alpha_beta(ball, my_paddle, opponent_paddle, center_ball, depth, alp
             simulate_ball_movement(ball_sim, steps=2)
             
             eval_score, _ = minimax_alpha_beta(ball_sim, my_paddle_sim, opponent_paddle_sim, 
-                                               center_ball, depth - 1, alpha, beta, False, is_left_paddle)
+                                               center_ball, depth - 1, alpha, beta, False, is_left_paddle, params)
             
             if eval_score > max_eval:
                 max_eval = eval_score
@@ -472,7 +1210,7 @@ def minimax_alpha_beta(ball, my_paddle, opponent_paddle, center_ball, depth, alp
             simulate_ball_movement(ball_sim, steps=2)
             
             eval_score, _ = minimax_alpha_beta(ball_sim, my_paddle_sim, opponent_paddle_sim,
-                                               center_ball, depth - 1, alpha, beta, True, is_left_paddle)
+                                               center_ball, depth - 1, alpha, beta, True, is_left_paddle, params)
             
             if eval_score < min_eval:
                 min_eval = eval_score
@@ -484,18 +1222,208 @@ def minimax_alpha_beta(ball, my_paddle, opponent_paddle, center_ball, depth, alp
         
         return min_eval, best_move
 
-def ai_move_minimax(ai_paddle, ball, opponent_paddle, center_ball, is_left_paddle, reaction_time=0.05):
-    if random.random() < reaction_time:
-        return
-    
+# ============================================
+# PRECOMPUTED MINIMAX POLICY
+# ============================================
+
+# Table layout: header, then one 2-bit move code per state, four per byte.
+# The depth-4 search only depends on the ball's y path, whether the ball is
+# heading toward us, and our own paddle y: ball x, the opponent paddle and
+# the side shift every leaf score equally, so they are folded out and the
+# table is exact rather than quantized.
+POLICY_MAGIC = b'MMPT'
+POLICY_VERSION = 1
+POLICY_HEADER = struct.Struct('<4sHhHhHH')  # magic, version, ball y min/count, paddle y min/count, ball speed
+POLICY_MOVES = ("stay", "up", "down")
+
+def policy_table_index(approaching, vy_index, ball_y_index, paddle_y_index, ball_y_count, paddle_y_count):
+    return ((approaching * 2 + vy_index) * ball_y_count + ball_y_index) * paddle_y_count + paddle_y_index
+
+class MinimaxPolicyTable:
+    """Precomputed best minimax moves, read through a memory map"""
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.ball_y_min, self.ball_y_count,
+         self.paddle_y_min, self.paddle_y_count, self.ball_speed) = POLICY_HEADER.unpack_from(self._map, 0)
+        if magic != POLICY_MAGIC or version != POLICY_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a minimax policy table")
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, ball, my_paddle, is_left_paddle):
+        """Return the stored move, or None if the state is outside the table"""
+        ball_y_index = ball.rect.y - self.ball_y_min
+        paddle_y_index = my_paddle.rect.y - self.paddle_y_min
+        if (abs(ball.speed_y) != self.ball_speed
+                or not 0 <= ball_y_index < self.ball_y_count
+                or not 0 <= paddle_y_index < self.paddle_y_count):
+            self.misses += 1
+            return None
+        approaching = 1 if (ball.speed_x < 0) == is_left_paddle else 0
+        vy_index = 1 if ball.speed_y > 0 else 0
+        index = policy_table_index(approaching, vy_index, ball_y_index, paddle_y_index,
+                                   self.ball_y_count, self.paddle_y_count)
+        code = (self._map[POLICY_HEADER.size + (index >> 2)] >> ((index & 3) * 2)) & 3
+        self.hits += 1
+        return POLICY_MOVES[code]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+minimax_policy = None
+
+def load_minimax_policy(path):
+    """Use a table written by build_policy_table.py for minimax decisions"""
+    global minimax_policy
+    minimax_policy = MinimaxPolicyTable(path)
+    return minimax_policy
+
+def uses_default_evaluation(params):
+    """The policy table was built with the default evaluate_state weights"""
+    return params is DEFAULT_AI_PARAMS or all(params[k] == DEFAULT_AI_PARAMS[k] for k in EVALUATION_PARAMS)
+
+def table_minimax_move(ball, ai_paddle, is_left_paddle, params):
+    if minimax_policy is None or not uses_default_evaluation(params):
+        return None
+    return minimax_policy.lookup(ball, ai_paddle, is_left_paddle)
+
+def best_minimax_move(ball, ai_paddle, opponent_paddle, center_ball, is_left_paddle, params=DEFAULT_AI_PARAMS):
+    """Table lookup when a policy is loaded, live depth-4 search otherwise"""
+    best_move = table_minimax_move(ball, ai_paddle, is_left_paddle, params)
+    if best_move is not None:
+        return best_move
+    if minimax_eval_mode == "batched":
+        prefetched = _minimax_prefetch.get(id(ai_paddle))
+        search = (ball, ai_paddle, opponent_paddle, center_ball, is_left_paddle, params)
+        if prefetched is not None and prefetched[0] == _search_key(*search):
+            return prefetched[1]
+        return minimax_batch([search])[0]
     _, best_move = minimax_alpha_beta(
         ball, ai_paddle, opponent_paddle, center_ball,
         depth=4,
         alpha=float('-inf'),
         beta=float('inf'),
         maximizing=True,
-        is_left_paddle=is_left_paddle
+        is_left_paddle=is_left_paddle,
+        params=params
     )
+    return best_move
+
+# ============================================
+# BATCHED MINIMAX (NUMPY)
+# ============================================
+
+# "tree" walks minimax_alpha_beta; "batched" scores every leaf of every
+# search in one NumPy pass and gives the same moves
+minimax_eval_mode = "batched" if np is not None else "tree"
+MINIMAX_MOVES = ("up", "stay", "down")
+
+def _search_inputs(ball, my_paddle, opponent_paddle, center_ball, is_left_paddle, params=DEFAULT_AI_PARAMS):
+    """Per-search values the leaf scores depend on, replaying minimax_alpha_beta's tree"""
+    # The ball path is the same on every branch: two steps per ply
+    sim = ball.clone()
+    path = []
+    for _ in range(4):
+        path.append(sim.rect.centery)
+        simulate_ball_movement(sim, steps=2)
+    leaf_ball = sim
+
+    # The opponent's replies do not depend on our moves either
+    opponent_y = opponent_paddle.rect.y
+    max_y = SCREEN_HEIGHT - opponent_paddle.rect.height
+    for ply in (1, 3):
+        if path[ply] > opponent_y + opponent_paddle.rect.height // 2:
+            opponent_y = min(max_y, opponent_y + opponent_paddle.speed)
+        else:
+            opponent_y = max(0, opponent_y - opponent_paddle.speed)
+
+    center_penalty = center_ball is not None and abs(leaf_ball.rect.centerx - center_ball.rect.centerx) < 50
+    approaching = leaf_ball.speed_x < 0 if is_left_paddle else leaf_ball.speed_x > 0
+    return (leaf_ball.rect.centery, my_paddle.rect.y, opponent_y + opponent_paddle.rect.height // 2,
+            center_penalty, approaching, my_paddle.rect.height, my_paddle.speed,
+            *(params[k] for k in EVALUATION_PARAMS))
+
+def minimax_batch(searches):
+    """Best depth-4 moves for several searches at once.
+
+    `searches` holds (ball, my_paddle, opponent_paddle, center_ball,
+    is_left_paddle[, params]) tuples. All 81 leaves of each search are
+    scored as one array, including the edge penalty and center ball term of
+    evaluate_state, then backed up through the min and max plies.
+    """
+    global minimax_decisions
+    inputs = np.array([_search_inputs(*search) for search in searches], dtype=np.float64)
+    ball_y = inputs[:, 0, None, None]
+    opponent_center = inputs[:, 2, None, None]
+    center_penalty = inputs[:, 3, None, None].astype(bool)
+    approaching = inputs[:, 4, None, None].astype(bool)
+    paddle_height = inputs[:, 5]
+    paddle_speed = inputs[:, 6]
+    (my_weight, opponent_weight, center_weight,
+     intercept_bonus, edge_penalty) = (inputs[:, 7 + i, None, None] for i in range(len(EVALUATION_PARAMS)))
+    max_y = SCREEN_HEIGHT - paddle_height
+
+    def apply_moves(y, speed, top):
+        # New last axis in MINIMAX_MOVES order: up, stay, down
+        return np.stack([np.maximum(0, y - speed), y, np.minimum(top, y + speed)], axis=-1)
+
+    # Our paddle after the first and second move: axes are (search, move 1, move 2)
+    first = apply_moves(inputs[:, 1], paddle_speed, max_y)
+    second = apply_moves(first, paddle_speed[:, None], max_y[:, None])
+    paddle_height = paddle_height[:, None, None]
+
+    # Same operations, in the same order, as evaluate_state
+    my_distance = np.abs(ball_y - (second + paddle_height // 2))
+    opponent_distance = np.abs(ball_y - opponent_center)
+    score = 0.0 - my_distance * my_weight
+    score = score + opponent_distance * opponent_weight
+    score = np.where(center_penalty, score - center_weight, score)
+    score = np.where(approaching & (my_distance < 30), score + intercept_bonus, score)
+    at_edge = (second <= 10) | (second + paddle_height >= SCREEN_HEIGHT - 10)
+    score = np.where(at_edge, score - edge_penalty, score)
+
+    # Leaves are (search, move 1, reply 1, move 2, reply 2); the replies do
+    # not change the state, so each min ply sees three equal values
+    leaves = np.broadcast_to(score[:, :, None, :, None], (len(searches), 3, 3, 3, 3))
+    values = leaves.min(axis=4).max(axis=3).min(axis=2)
+    minimax_decisions += len(searches)
+    return [MINIMAX_MOVES[i] for i in values.argmax(axis=1)]
+
+# Moves searched ahead of the AI turns this frame, keyed by paddle
+_minimax_prefetch = {}
+
+def _search_key(ball, ai_paddle, opponent_paddle, center_ball, is_left_paddle, params=DEFAULT_AI_PARAMS):
+    return (ball.rect.x, ball.rect.y, ball.speed_x, ball.speed_y, ai_paddle.rect.y, opponent_paddle.rect.y,
+            None if center_ball is None else center_ball.rect.centerx, is_left_paddle, id(params))
+
+def set_minimax_eval_mode(mode):
+    global minimax_eval_mode
+    if mode == "batched" and np is None:
+        raise SystemExit("--minimax-eval batched needs numpy (pip install numpy)")
+    if mode:
+        minimax_eval_mode = mode
+
+def prefetch_minimax(searches):
+    """Run this frame's searches as one batch; best_minimax_move picks them up"""
+    _minimax_prefetch.clear()
+    if minimax_eval_mode != "batched" or not searches:
+        return
+    searches = [s for s in searches if table_minimax_move(s[0], s[1], s[4], s[5]) is None]
+    if not searches:
+        return
+    for search, move in zip(searches, minimax_batch(searches)):
+        _minimax_prefetch[id(search[1])] = (_search_key(*search), move)
+
+def ai_move_minimax(ai_paddle, ball, opponent_paddle, center_ball, is_left_paddle, reaction_time=0.05,
+                    params=DEFAULT_AI_PARAMS):
+    if random.random() < reaction_time:
+        return
+    
+    best_move = best_minimax_move(ball, ai_paddle, opponent_paddle, center_ball, is_left_paddle, params)
     
     if best_move == "up":
         ai_paddle.move("up")
@@ -509,63 +1437,415 @@ def calculate_score_pressure(left_score, right_score, is_left_paddle):
     else:
         return right_score - left_score
 
-def enhanced_hybrid_decision(ball, ai_paddle, is_left_paddle, left_score, right_score):
+# Distances (px) at which enhanced_hybrid_decision changes its mind
+FUZZY_RANGE = 250
+MINIMAX_RANGE = 300
+URGENCY_RANGE = 400
+URGENCY_THRESHOLD = 0.7
+CENTER_BAND = 100
+
+def score_pressure_bucket(score_pressure):
+    """Bucket of score pressure as seen by enhanced_hybrid_decision"""
+    if score_pressure < -2:
+        return 0
+    elif score_pressure > 1:
+        return 2
+    return 1
+
+def enhanced_hybrid_decision(ball, ai_paddle, is_left_paddle, left_score, right_score, params=DEFAULT_AI_PARAMS):
     ball_approaching = (is_left_paddle and ball.speed_x < 0) or (not is_left_paddle and ball.speed_x > 0)
     distance_to_ball = abs(ball.rect.centerx - ai_paddle.rect.centerx)
     
     score_pressure = calculate_score_pressure(left_score, right_score, is_left_paddle)
-    time_urgency = 1.0 - (min(distance_to_ball, 400) / 400)
+    time_urgency = 1.0 - (min(distance_to_ball, URGENCY_RANGE) / URGENCY_RANGE)
     
     fuzzy_weight = 0
     minimax_weight = 0
     
-    if distance_to_ball < 250 and ball_approaching:
-        fuzzy_weight += 0.6
-    if time_urgency > 0.7:
-        fuzzy_weight += 0.3
+    if distance_to_ball < FUZZY_RANGE and ball_approaching:
+        fuzzy_weight += params["fuzzy_near_weight"]
+    if time_urgency > URGENCY_THRESHOLD:
+        fuzzy_weight += params["fuzzy_urgency_weight"]
     if score_pressure < -2:
-        fuzzy_weight += 0.2
+        fuzzy_weight += params["fuzzy_pressure_weight"]
     
-    if distance_to_ball > 300:
-        minimax_weight += 0.5
+    if distance_to_ball > MINIMAX_RANGE:
+        minimax_weight += params["minimax_far_weight"]
     if score_pressure > 1:
-        minimax_weight += 0.4
-    if abs(ball.rect.centerx - SCREEN_WIDTH//2) < 100:
-        minimax_weight += 0.3
+        minimax_weight += params["minimax_lead_weight"]
+    if abs(ball.rect.centerx - SCREEN_WIDTH//2) < CENTER_BAND:
+        minimax_weight += params["minimax_center_weight"]
     
     return "fuzzy" if fuzzy_weight > minimax_weight else "minimax"
 
-def ai_move_hybrid(ai_paddle, ball, opponent_paddle, center_ball, is_left_paddle, left_score, right_score, reaction_time=0.05):
+def predict_ball_y(ball, target_x):
+    """Ball center y when its center reaches target_x, bouncing off the walls"""
+    if ball.speed_x == 0:
+        return ball.rect.centery
+    frames = (target_x - ball.rect.centerx) / ball.speed_x
+    if frames <= 0:
+        return ball.rect.centery
+    top = HEADER_HEIGHT
+    span = SCREEN_HEIGHT - ball.rect.height - top
+    # Unfold the bounces: the path repeats every two crossings of the court
+    y = (ball.rect.y - top + ball.speed_y * frames) % (2 * span)
+    if y > span:
+        y = 2 * span - y
+    return top + y + ball.rect.height // 2
+
+class HybridPlan:
+    """Hybrid decision reused while the ball stays on one trajectory.
+
+    The plan is dropped when the ball bounces, is hit or resets, when the
+    score pressure changes bucket, or when the ball crosses one of the
+    distances at which enhanced_hybrid_decision would pick differently.
+    """
+    def __init__(self, strategy, target_y, ball, ai_paddle, pressure_bucket):
+        self.strategy = strategy
+        self.target_y = target_y
+        self.trajectory = ball.trajectory
+        self.pressure_bucket = pressure_bucket
+
+        # Ball x interval over which the strategy cannot change
+        paddle_x = ai_paddle.rect.centerx
+        urgency_distance = URGENCY_RANGE * (1 - URGENCY_THRESHOLD)
+        breakpoints = [SCREEN_WIDTH // 2 - CENTER_BAND, SCREEN_WIDTH // 2 + CENTER_BAND]
+        for distance in (urgency_distance, FUZZY_RANGE, MINIMAX_RANGE):
+            breakpoints += [paddle_x - distance, paddle_x + distance]
+        ball_x = ball.rect.centerx
+        if any(abs(b - ball_x) <= 1 for b in breakpoints):
+            # On a breakpoint the decision can differ from both sides of it
+            self.x_low = self.x_high = ball_x
+        else:
+            self.x_low = max((b for b in breakpoints if b < ball_x), default=float('-inf'))
+            self.x_high = min((b for b in breakpoints if b > ball_x), default=float('inf'))
+
+    def covers(self, ball, pressure_bucket):
+        # One pixel of slack keeps float rounding at a breakpoint from mattering
+        return (ball.trajectory == self.trajectory
+                and pressure_bucket == self.pressure_bucket
+                and self.x_low + 1 < ball.rect.centerx < self.x_high - 1)
+
+    def steer(self, ai_paddle):
+        if ai_paddle.rect.centery > self.target_y + ai_paddle.speed:
+            return "up"
+        elif ai_paddle.rect.centery < self.target_y - ai_paddle.speed:
+            return "down"
+        return "stay"
+
+def ai_move_hybrid(ai_paddle, ball, opponent_paddle, center_ball, is_left_paddle, left_score, right_score, reaction_time=0.05,
+                   params=DEFAULT_AI_PARAMS):
     global hybrid_switches
     
     if random.random() < reaction_time:
         return
     
-    strategy = enhanced_hybrid_decision(ball, ai_paddle, is_left_paddle, left_score, right_score)
-    
-    if strategy == "fuzzy":
-        hybrid_switches["fuzzy"] += 1
-        move_direction = fuzzy_logic(ball, ai_paddle)
-        
-        if move_direction == "up":
-            ai_paddle.move("up")
-        elif move_direction == "down":
-            ai_paddle.move("down")
+    pressure_bucket = score_pressure_bucket(calculate_score_pressure(left_score, right_score, is_left_paddle))
+    plan = ai_paddle.hybrid_plan
+    if plan is not None and plan.covers(ball, pressure_bucket):
+        hybrid_plan_stats["hits"] += 1
+        strategy = plan.strategy
+        # Fuzzy stays reactive; minimax follows the trajectory it planned for
+        if strategy == "fuzzy":
+            move_direction = fuzzy_logic(ball, ai_paddle)
+        else:
+            move_direction = plan.steer(ai_paddle)
     else:
-        hybrid_switches["minimax"] += 1
-        _, best_move = minimax_alpha_beta(
-            ball, ai_paddle, opponent_paddle, center_ball,
-            depth=4,
-            alpha=float('-inf'),
-            beta=float('inf'),
-            maximizing=True,
-            is_left_paddle=is_left_paddle
-        )
-        
-        if best_move == "up":
-            ai_paddle.move("up")
-        elif best_move == "down":
-            ai_paddle.move("down")
+        hybrid_plan_stats["misses"] += 1
+        strategy = enhanced_hybrid_decision(ball, ai_paddle, is_left_paddle, left_score, right_score, params)
+        if plan is not None and plan.strategy != strategy:
+            log_event("strategy_switch", "debug", side="left" if is_left_paddle else "right",
+                      old=plan.strategy, new=strategy)
+        if strategy == "fuzzy":
+            move_direction = fuzzy_logic(ball, ai_paddle)
+        else:
+            move_direction = best_minimax_move(ball, ai_paddle, opponent_paddle, center_ball, is_left_paddle,
+                                               params)
+        # Aim for where the ball meets our paddle, or the opponent's if it is leaving
+        ball_approaching = (ball.speed_x < 0) == is_left_paddle
+        target_x = ai_paddle.rect.centerx if ball_approaching else opponent_paddle.rect.centerx
+        ai_paddle.hybrid_plan = HybridPlan(strategy, predict_ball_y(ball, target_x), ball, ai_paddle,
+                                           pressure_bucket)
+    
+    hybrid_switches[strategy] += 1
+    if move_direction == "up":
+        ai_paddle.move("up")
+    elif move_direction == "down":
+        ai_paddle.move("down")
+
+def plan_cache_hit_rate():
+    lookups = hybrid_plan_stats["hits"] + hybrid_plan_stats["misses"]
+    return hybrid_plan_stats["hits"] / lookups if lookups else 0.0
+
+# ============================================
+# MONTE CARLO TREE SEARCH
+# ============================================
+
+# Until the ball reaches our paddle its path does not depend on our moves,
+# so each tree simulates it once with advance_ball (our paddle out of the
+# way, the opponent tracking the ball as in minimax) and every node shares
+# it. A node is then only our paddle's (center, target) some frames ahead,
+# and the rollouts from a batch of leaves move paddles, all in one array.
+MCTS_MOVES = ("up", "stay", "down")
+MCTS_STEPS = (-1, 0, 1)
+MCTS_LEAVES_PER_BATCH = 8
+MCTS_ROLLOUTS_PER_LEAF = 32
+MCTS_HORIZON = 180      # frames simulated ahead when the ball is not coming at us
+MCTS_MIN_HORIZON = 60   # rebuild instead of re-rooting when fewer predicted frames remain
+MCTS_ROLLOUT_EPSILON = 0.3  # rollouts head for the ball, with this share of random moves
+
+mcts_rng = np.random.default_rng() if np is not None else None
+
+class RolloutBall(Ball):
+    """Search copy of a ball: a goal ends the simulation instead of re-serving (no random draws)"""
+    def reset(self):
+        self.trajectory += 1
+
+def _rollout_ball(ball):
+    sim = RolloutBall.__new__(RolloutBall)
+    sim.rect = ball.rect.copy()
+    sim.speed_x = ball.speed_x
+    sim.speed_y = ball.speed_y
+    sim.fire_color = ball.fire_color
+    sim.trajectory = 0
+    return sim
+
+def _mcts_ball_key(ball, center_ball):
+    return (ball.rect.x, ball.rect.y, ball.speed_x, ball.speed_y,
+            None if center_ball is None else center_ball.rect.y)
+
+class MctsNode:
+    __slots__ = ("depth", "center", "target", "children", "visits", "value", "size")
+
+    def __init__(self, depth, center, target):
+        self.depth = depth  # frames after the frame the tree was built on
+        self.center = center
+        self.target = target
+        self.children = [None, None, None]  # indexed like MCTS_MOVES
+        self.visits = 0
+        self.value = 0.0
+        self.size = 1  # nodes in this subtree
+
+class MctsTree:
+    """Search tree for one paddle, re-rooted between frames while the game follows its prediction.
+
+    The ball's path ends in one of four outcomes: "won" or "lost" (someone
+    scores first, whatever we do), "intercept" (the ball reaches our paddle
+    at frame `end`, at height `goal_y`) or "open" (the horizon ran out;
+    `goal_y` is where the ball is headed). Rewards are in [0, 1].
+    """
+    def __init__(self, ball, my_paddle, opponent_paddle, center_ball, is_left_paddle):
+        self.is_left_paddle = is_left_paddle
+        self.speed = my_paddle.speed
+        self.half = my_paddle.rect.height // 2
+        self.reach = (my_paddle.rect.height + ball.rect.height) / 2
+        self._simulate_ball(ball, my_paddle, opponent_paddle, center_ball)
+        self.root = MctsNode(0, my_paddle.rect.centery, my_paddle.target_y)
+
+    def _simulate_ball(self, ball, my_paddle, opponent_paddle, center_ball):
+        sim = _rollout_ball(ball)
+        center = center_ball.clone() if center_ball is not None else None
+        opponent = opponent_paddle.clone()
+        away = my_paddle.clone()
+        away.rect.y = -10 * SCREEN_HEIGHT  # we only want to know where the ball crosses our paddle
+        left, right = (away, opponent) if self.is_left_paddle else (opponent, away)
+        opponent_max_y = SCREEN_HEIGHT - opponent.rect.height
+        # Not passed to the AIs: assume the ball was last hit by the paddle it is leaving
+        last_hitter = 'left' if sim.speed_x > 0 else 'right'
+
+        self.path_index = {_mcts_ball_key(sim, center): 0}
+        self.outcome = "open"
+        frame = 0
+        while frame < MCTS_HORIZON:
+            frame += 1
+            events, last_hitter = advance_ball(sim, left, right, center, last_hitter)
+            scorers = [side for kind, side in events if kind == 'score']
+            if scorers:
+                self.outcome = "won" if (scorers[0] == 'left') == self.is_left_paddle else "lost"
+                break
+            if sim.rect.centery > opponent.rect.centery:
+                opponent.rect.y = min(opponent_max_y, opponent.rect.y + opponent.speed)
+            else:
+                opponent.rect.y = max(0, opponent.rect.y - opponent.speed)
+            self.path_index.setdefault(_mcts_ball_key(sim, center), frame)
+            heading_in = (sim.speed_x < 0) == self.is_left_paddle
+            if heading_in and sim.rect.right > my_paddle.rect.left and sim.rect.left < my_paddle.rect.right:
+                self.outcome = "intercept"
+                break
+        self.end = frame
+        if self.outcome == "open" and (sim.speed_x < 0) == self.is_left_paddle:
+            self.goal_y = predict_ball_y(sim, my_paddle.rect.centerx)
+        else:
+            self.goal_y = sim.rect.centery
+
+    def advance(self, ball, center_ball, paddle):
+        """Re-root on the observed frame; False if the game left the predicted path"""
+        depth = self.path_index.get(_mcts_ball_key(ball, center_ball))
+        if depth is None or depth < self.root.depth:
+            return False
+        if self.outcome == "open" and self.end - depth < MCTS_MIN_HORIZON:
+            return False
+        frontier = [self.root]
+        while frontier and frontier[0].depth < depth:
+            frontier = [child for node in frontier for child in node.children if child is not None]
+        state = (paddle.rect.centery, paddle.target_y)
+        for node in frontier:
+            if (node.center, node.target) == state:
+                self.root = node
+                return True
+        return False
+
+    def _child(self, node, move_index):
+        # One frame of Paddle.move followed by Paddle.update
+        step = MCTS_STEPS[move_index]
+        center, target = node.center, node.target
+        if (step < 0 and center > HEADER_HEIGHT + self.half) or (step > 0 and center < SCREEN_HEIGHT - self.half):
+            target += step * self.speed
+        center += max(-self.speed, min(self.speed, target - center))
+        return MctsNode(node.depth + 1, center, target)
+
+    def _select(self, exploration):
+        """UCT descent to a new leaf; visits are counted now so a batch spreads over the tree"""
+        node = self.root
+        path = [node]
+        while node.depth < self.end:
+            if None in node.children:
+                move_index = node.children.index(None)
+                child = node.children[move_index] = self._child(node, move_index)
+                for parent in path:
+                    parent.size += 1
+                path.append(child)
+                break
+            log_visits = math.log(node.visits)
+            node = max(node.children, key=lambda c: c.value / c.visits + exploration * math.sqrt(log_visits / c.visits))
+            path.append(node)
+        for visited in path:
+            visited.visits += 1
+        return path
+
+    def _rollouts(self, leaves):
+        """Mean reward of MCTS_ROLLOUTS_PER_LEAF noisy playouts from each leaf, in one batch"""
+        if self.outcome in ("won", "lost"):
+            return [1.0 if self.outcome == "won" else 0.0] * len(leaves)
+        repeat = MCTS_ROLLOUTS_PER_LEAF
+        center = np.repeat([leaf.center for leaf in leaves], repeat)
+        target = np.repeat([leaf.target for leaf in leaves], repeat)
+        start = np.repeat([leaf.depth for leaf in leaves], repeat)
+        first = int(start.min())
+        shape = (self.end - first, len(center))
+        random_steps = mcts_rng.integers(-1, 2, size=shape)
+        explore = mcts_rng.random(shape) < MCTS_ROLLOUT_EPSILON
+        top, bottom = HEADER_HEIGHT + self.half, SCREEN_HEIGHT - self.half
+        for frame in range(first, self.end):
+            offset = self.goal_y - target
+            step = np.where(offset > self.speed // 2, 1, np.where(offset < -(self.speed // 2), -1, 0))
+            step = np.where(explore[frame - first], random_steps[frame - first], step)
+            allowed = (start <= frame) & (((step < 0) & (center > top)) | ((step > 0) & (center < bottom)))
+            target = target + np.where(allowed, step * self.speed, 0)
+            center = np.where(start <= frame, center + np.clip(target - center, -self.speed, self.speed), center)
+
+        gap = np.abs(center - self.goal_y)
+        if self.outcome == "intercept":
+            # Centered hits score best; misses keep a little credit for coming close
+            reward = np.where(gap < self.reach, 1.0 - 0.25 * gap / self.reach,
+                              0.5 * np.clip(1 - (gap - self.reach) / SCREEN_HEIGHT, 0, 1))
+        else:
+            reward = 1 - np.minimum(1, gap / SCREEN_HEIGHT)
+        return reward.reshape(len(leaves), repeat).mean(axis=1)
+
+    def search(self, deadline, exploration):
+        """Batches of selections and rollouts until the deadline (at least one); returns the rollouts run"""
+        rollouts = 0
+        while True:
+            paths = [self._select(exploration) for _ in range(MCTS_LEAVES_PER_BATCH)]
+            for path, reward in zip(paths, self._rollouts([path[-1] for path in paths])):
+                for node in path:
+                    node.value += reward
+            rollouts += len(paths) * MCTS_ROLLOUTS_PER_LEAF
+            if time.perf_counter() >= deadline:
+                return rollouts
+
+    def best_move(self):
+        children = [(child.visits, child.value, i) for i, child in enumerate(self.root.children) if child is not None]
+        return MCTS_MOVES[max(children)[2]] if children else "stay"
+
+def best_mcts_move(ball, ai_paddle, opponent_paddle, center_ball, is_left_paddle, params=DEFAULT_AI_PARAMS):
+    """Search within params["mcts_budget"], reusing the paddle's tree when the frame was predicted"""
+    start = time.perf_counter()
+    tree = ai_paddle.mcts_tree
+    if tree is not None and tree.is_left_paddle == is_left_paddle and tree.advance(ball, center_ball, ai_paddle):
+        mcts_stats["reused"] += 1
+    else:
+        tree = ai_paddle.mcts_tree = MctsTree(ball, ai_paddle, opponent_paddle, center_ball, is_left_paddle)
+    rollouts = tree.search(start + params["mcts_budget"], params["mcts_exploration"])
+    mcts_stats["decisions"] += 1
+    mcts_stats["rollouts"] += rollouts
+    mcts_stats["search_time"] += time.perf_counter() - start
+    mcts_stats["tree_nodes"] += tree.root.size
+    return tree.best_move()
+
+def ai_move_mcts(ai_paddle, ball, opponent_paddle, center_ball, is_left_paddle, reaction_time=0.05,
+                 params=DEFAULT_AI_PARAMS):
+    if random.random() < reaction_time:
+        return
+    best_move = best_mcts_move(ball, ai_paddle, opponent_paddle, center_ball, is_left_paddle, params)
+    if best_move != "stay":
+        ai_paddle.move(best_move)
+
+def mcts_summary(since=None):
+    """Rollouts per second of search, mean tree size and re-root rate, optionally since a mcts_stats copy"""
+    since = since or {}
+    stats = {key: value - since.get(key, 0) for key, value in mcts_stats.items()}
+    if not stats["decisions"]:
+        return {}
+    return {
+        "mcts_rollouts_per_second": round(stats["rollouts"] / stats["search_time"]) if stats["search_time"] else 0,
+        "mcts_tree_nodes": round(stats["tree_nodes"] / stats["decisions"]),
+        "mcts_reuse_rate": round(stats["reused"] / stats["decisions"], 3),
+    }
+
+def needs_minimax_search(ai_type, ai_paddle, ball, is_left_paddle, left_score, right_score,
+                         params=DEFAULT_AI_PARAMS):
+    """Whether this AI will ask for a minimax search this frame (before its reaction roll)"""
+    if ai_type == "minimax":
+        return True
+    if ai_type == "mcts":
+        return False
+    pressure_bucket = score_pressure_bucket(calculate_score_pressure(left_score, right_score, is_left_paddle))
+    plan = ai_paddle.hybrid_plan
+    if plan is not None and plan.covers(ball, pressure_bucket):
+        return False
+    return enhanced_hybrid_decision(ball, ai_paddle, is_left_paddle, left_score, right_score, params) == "minimax"
+
+def ai_turn(ai_type, ai_paddle, ball, opponent_paddle, center_ball, is_left_paddle,
+            left_score, right_score, reaction_time, params=DEFAULT_AI_PARAMS):
+    """Let the AI of the given type move its paddle for this frame"""
+    if ai_type == "minimax":
+        ai_move_minimax(ai_paddle, ball, opponent_paddle, center_ball,
+                        is_left_paddle=is_left_paddle, reaction_time=reaction_time, params=params)
+    elif ai_type == "mcts":
+        ai_move_mcts(ai_paddle, ball, opponent_paddle, center_ball,
+                     is_left_paddle=is_left_paddle, reaction_time=reaction_time, params=params)
+    else:
+        ai_move_hybrid(ai_paddle, ball, opponent_paddle, center_ball,
+                       is_left_paddle=is_left_paddle, left_score=left_score, right_score=right_score,
+                       reaction_time=reaction_time, params=params)
+
+def ai_frame(left_ai_type, right_ai_type, left_paddle, right_paddle, ball, center_ball,
+             left_score, right_score, left_reaction, right_reaction,
+             left_params=DEFAULT_AI_PARAMS, right_params=DEFAULT_AI_PARAMS):
+    """Both AI turns for one frame, with their minimax searches batched together"""
+    if minimax_eval_mode == "batched":
+        searches = []
+        if needs_minimax_search(left_ai_type, left_paddle, ball, True, left_score, right_score, left_params):
+            searches.append((ball, left_paddle, right_paddle, center_ball, True, left_params))
+        if needs_minimax_search(right_ai_type, right_paddle, ball, False, left_score, right_score, right_params):
+            searches.append((ball, right_paddle, left_paddle, center_ball, False, right_params))
+        prefetch_minimax(searches)
+    ai_turn(left_ai_type, left_paddle, ball, right_paddle, center_ball, True,
+            left_score, right_score, left_reaction, left_params)
+    ai_turn(right_ai_type, right_paddle, ball, left_paddle, center_ball, False,
+            left_score, right_score, right_reaction, right_params)
 
 # Animated background elements
 background_particles = []
@@ -578,179 +1858,202 @@ for _ in range(30):
         'alpha': random.randint(50, 150)
     })
 
-# Rendering
-def draw_background():
-    screen.fill(DARK_BG)
-    
-    # Animated grid pattern
-    grid_offset = int(time.time() * 20) % 50
-    for x in range(0, SCREEN_WIDTH + 100, 50):
-        pygame.draw.line(screen, GRID_COLOR, (x - grid_offset, 0), (x - grid_offset, SCREEN_HEIGHT), 1)
-    for y in range(0, SCREEN_HEIGHT + 100, 50):
-        pygame.draw.line(screen, GRID_COLOR, (0, y - grid_offset), (SCREEN_WIDTH, y - grid_offset), 1)
-    
-    # Center divider line with glow
-    center_x = SCREEN_WIDTH // 2
-    for i in range(5):
-        alpha = 50 - i * 10
-        divider_surface = pygame.Surface((1, SCREEN_HEIGHT), pygame.SRCALPHA)
-        divider_color = (*GRID_COLOR, alpha)
-        pygame.draw.line(divider_surface, divider_color, (0, 0), (0, SCREEN_HEIGHT), 1)
-        screen.blit(divider_surface, (center_x - i, 0))
-        screen.blit(divider_surface, (center_x + i, 0))
-    
-    # Animated background particles
+def update_background_particles():
     for particle in background_particles:
         particle['y'] += particle['speed']
         if particle['y'] > SCREEN_HEIGHT:
             particle['y'] = 0
             particle['x'] = random.randint(0, SCREEN_WIDTH)
-        base_color = NEON_PURPLE if random.random() > 0.5 else NEON_CYAN
-        particle_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-        particle_color = (*base_color, particle['alpha'])
-        pygame.draw.circle(particle_surface, particle_color, (particle['size'], particle['size']), particle['size'])
-        screen.blit(particle_surface, (particle['x'], particle['y']))
-
-def draw_scores(left_score, right_score):
-    # Left score with glow
-    left_str = str(left_score)
-    left_text = score_font.render(left_str, True, left_ai_color)
-    left_width = left_text.get_width()
-    for i in range(3):
-        glow_intensity = 100 - i * 30
-        glow_color = tuple(min(255, c + glow_intensity) for c in left_ai_color)
-        left_glow = score_font.render(left_str, True, glow_color)
-        screen.blit(left_glow, (SCREEN_WIDTH // 4 - left_width // 2 + i, 30 + i))
-    screen.blit(left_text, (SCREEN_WIDTH // 4 - left_width // 2, 30))
+
+# Rendering
+def draw_background(view=None, animate=True):
+    """Grid, divider and drifting particles; `animate` moves the particles a frame"""
+    view = view or main_view
+    surface = view.surface
+    width, height = view.surface.get_size()
+    surface.fill(DARK_BG)
+    
+    if view.detail >= DETAIL_MEDIUM and render_quality["grid"]:
+        # Animated grid pattern
+        spacing = view.size(50)
+        grid_offset = view.px(int(time.time() * 20) % 50)
+        for x in range(0, width + 2 * spacing, spacing):
+            pygame.draw.line(surface, GRID_COLOR, (x - grid_offset, 0), (x - grid_offset, height), 1)
+        for y in range(0, height + 2 * spacing, spacing):
+            pygame.draw.line(surface, GRID_COLOR, (0, y - grid_offset), (width, y - grid_offset), 1)
     
-    # Right score with glow
-    right_str = str(right_score)
-    right_text = score_font.render(right_str, True, right_ai_color)
-    right_width = right_text.get_width()
-    for i in range(3):
-        glow_intensity = 100 - i * 30
-        glow_color = tuple(min(255, c + glow_intensity) for c in right_ai_color)
-        right_glow = score_font.render(right_str, True, glow_color)
-        screen.blit(right_glow, (3 * SCREEN_WIDTH // 4 - right_width // 2 + i, 30 + i))
-    screen.blit(right_text, (3 * SCREEN_WIDTH // 4 - right_width // 2, 30))
-
-def log_event(event):
-    game_logs.append(event)
-    print(event)
-
-def draw_game_header(left_score, right_score, elapsed_time, total_time):
+    # Center divider line with glow
+    center_x = view.px(SCREEN_WIDTH // 2)
+    divider_layers = min(5 if view.detail >= DETAIL_MEDIUM else 1, render_quality["glow_layers"])
+    for i in range(divider_layers):
+        alpha = 50 - i * 10
+        divider_surface = get_rounded_rect_sprite(GRID_COLOR, alpha, (1, height), (0, 0, 1, height), 0)
+        surface.blit(divider_surface, (center_x - i, 0))
+        surface.blit(divider_surface, (center_x + i, 0))
+    
+    # Animated background particles
+    if animate:
+        update_background_particles()
+    if view.detail == DETAIL_FULL:
+        for particle in background_particles[:render_quality["background_particles"]]:
+            base_color = NEON_PURPLE if random.random() > 0.5 else NEON_CYAN
+            size = view.size(particle['size'])
+            particle_surface = get_circle_sprite(base_color, particle['alpha'], size)
+            surface.blit(particle_surface, view.point(particle['x'], particle['y']))
+
+def draw_center_ball(center_ball, view=None):
+    view = view or main_view
+    rect = view.rect(center_ball.rect)
+    if view.detail >= DETAIL_MEDIUM:
+        glow_size = view.size(20)
+        glow_surface = get_circle_sprite(center_ball.fire_color, 80, glow_size)
+        view.surface.blit(glow_surface, (rect.centerx - glow_size, rect.centery - glow_size))
+    pygame.draw.circle(view.surface, center_ball.fire_color, rect.center, rect.width // 2)
+    pygame.draw.circle(view.surface, WHITE, rect.center, max(1, rect.width // 4))
+
+def log_event(event, level="info", **fields):
+    if LOG_LEVELS[level] >= event_log.threshold:
+        event_log.log(event, level, **fields)
+
+def get_gradient_bar(width, height, left_color, right_color):
+    """Cached progress bar fill blending left_color into right_color"""
+    key = ('gradient', width, height, left_color, right_color)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((width, height))
+        for i in range(width):
+            ratio = i / width
+            r = int(left_color[0] * (1 - ratio) + right_color[0] * ratio)
+            g = int(left_color[1] * (1 - ratio) + right_color[1] * ratio)
+            b = int(left_color[2] * (1 - ratio) + right_color[2] * ratio)
+            pygame.draw.line(sprite, (r, g, b), (i, 0), (i, height))
+        _sprite_cache[key] = sprite
+    return sprite
+
+def draw_game_header(left_score, right_score, elapsed_time, total_time, view=None):
     """Draw fixed header with robots and progress bar"""
+    view = view or main_view
+    surface = view.surface
     header_height = 120
     
     # Semi-transparent header background
-    header_surface = pygame.Surface((SCREEN_WIDTH, header_height), pygame.SRCALPHA)
-    header_surface.fill((*DARK_BG, 200))
-    screen.blit(header_surface, (0, 0))
+    header_surface = get_rounded_rect_sprite(DARK_BG, 200, (view.size(SCREEN_WIDTH), view.size(header_height)),
+                                             (0, 0, view.size(SCREEN_WIDTH), view.size(header_height)), 0)
+    surface.blit(header_surface, (0, 0))
     
     # Bot icon size
     bot_size = 80
     
     # Draw scores at the top
-    left_score_text = small_score_font.render(str(left_score), True, bot1_color)
-    right_score_text = small_score_font.render(str(right_score), True, bot2_color)
+    score_font_scaled = get_font(view.size(48))
+    left_score_text = score_font_scaled.render(str(left_score), True, bot1_color)
+    right_score_text = score_font_scaled.render(str(right_score), True, bot2_color)
     
     # Position scores at the very top (centered above bot icons)
-    left_bot_center_x = 20 + bot_size // 2
-    right_bot_center_x = SCREEN_WIDTH - 100 + bot_size // 2
+    left_bot_center_x = view.px(20 + bot_size // 2)
+    right_bot_center_x = view.px(SCREEN_WIDTH - 100 + bot_size // 2)
     score_y = 5
     
-    screen.blit(left_score_text, (left_bot_center_x - left_score_text.get_width() // 2, score_y))
-    screen.blit(right_score_text, (right_bot_center_x - right_score_text.get_width() // 2, score_y))
+    surface.blit(left_score_text, (left_bot_center_x - left_score_text.get_width() // 2, view.px(score_y)))
+    surface.blit(right_score_text, (right_bot_center_x - right_score_text.get_width() // 2, view.px(score_y)))
     
     # Time remaining (centered at top)
     time_left = max(0, int(total_time - elapsed_time))
-    time_text = font.render(f"{time_left}s", True, WHITE)
-    time_y = 10
-    screen.blit(time_text, (SCREEN_WIDTH // 2 - time_text.get_width() // 2, time_y))
+    time_text = get_font(view.size(96)).render(f"{time_left}s", True, WHITE)
+    time_y = view.px(10)
+    surface.blit(time_text, (view.px(SCREEN_WIDTH // 2) - time_text.get_width() // 2, time_y))
     
     # Progress bar - smaller and centered, positioned below timer
     progress = elapsed_time / total_time
-    bar_width = 300  # Smaller width
-    bar_height = 8
-    bar_x = (SCREEN_WIDTH - bar_width) // 2  # Centered
-    bar_y = time_y + time_text.get_height() + 15  # Below the timer
+    bar_width = view.size(300)  # Smaller width
+    bar_height = view.size(8)
+    bar_x = (view.size(SCREEN_WIDTH) - bar_width) // 2  # Centered
+    bar_y = time_y + time_text.get_height() + view.px(15)  # Below the timer
     
     # Background bar
-    pygame.draw.rect(screen, (50, 50, 70), (bar_x, bar_y, bar_width, bar_height), border_radius=4)
+    pygame.draw.rect(surface, (50, 50, 70), (bar_x, bar_y, bar_width, bar_height), border_radius=view.size(4))
     
-    # Progress fill with gradient effect
+    # Progress fill with gradient effect (purple to cyan)
     fill_width = int(bar_width * progress)
     if fill_width > 0:
-        for i in range(fill_width):
-            # Gradient from purple to cyan
-            ratio = i / bar_width
-            r = int(bot1_color[0] * (1 - ratio) + bot2_color[0] * ratio)
-            g = int(bot1_color[1] * (1 - ratio) + bot2_color[1] * ratio)
-            b = int(bot1_color[2] * (1 - ratio) + bot2_color[2] * ratio)
-            pygame.draw.line(screen, (r, g, b), (bar_x + i, bar_y), (bar_x + i, bar_y + bar_height))
+        gradient = get_gradient_bar(bar_width, bar_height + 1, bot1_color, bot2_color)
+        surface.blit(gradient, (bar_x, bar_y), (0, 0, fill_width, bar_height + 1))
         
         # Glow on progress
-        pygame.draw.rect(screen, (*WHITE, 50), (bar_x, bar_y, fill_width, bar_height), border_radius=4)
+        pygame.draw.rect(surface, (*WHITE, 50), (bar_x, bar_y, fill_width, bar_height), border_radius=view.size(4))
+    
+    # Current render quality tier under the bar
+    quality_text = get_font(view.size(22)).render(f"quality: {render_quality['name']}", True,
+                                                  render_quality["color"])
+    surface.blit(quality_text, (view.px(SCREEN_WIDTH // 2) - quality_text.get_width() // 2,
+                                bar_y + bar_height + view.px(6)))
     
     # Bot images positioned below the scores
     bot_y = score_y + small_score_font.get_height() + 10  # Below the score
-    draw_bot_image(20, bot_y, bot_size, bot1_color, "bot1")
-    draw_bot_image(SCREEN_WIDTH - 100, bot_y, bot_size, bot2_color, "bot2")
+    draw_bot_image(20, bot_y, bot_size, bot1_color, "bot1", view)
+    draw_bot_image(SCREEN_WIDTH - 100, bot_y, bot_size, bot2_color, "bot2", view)
 
-def draw_bot_image(x, y, size, color, bot_type="bot1"):
+def draw_bot_image(x, y, size, color, bot_type="bot1", view=None):
     """Draw bot image - projet.png for bot1, bot2.png for bot2"""
+    view = view or main_view
     # Select appropriate image based on bot type
     selected_image = bot1_image if bot_type == "bot1" else bot2_image
     
     if selected_image:
+        x, y = view.point(x, y)
+        size = view.size(size)
+        pad = view.size(5)
         # Scale the image to the desired size
-        scaled_image = pygame.transform.scale(selected_image, (size, size))
-        # Draw a subtle glow behind the image
-        glow_surface = pygame.Surface((size + 10, size + 10), pygame.SRCALPHA)
-        glow_color = (*color, 20)
-        pygame.draw.circle(glow_surface, glow_color, (size // 2 + 5, size // 2 + 5), size // 2 + 3)
-        screen.blit(glow_surface, (x - 5, y - 5))
+        scaled_image = get_scaled_image(selected_image, size)
+        if view.detail >= DETAIL_MEDIUM:
+            # Draw a subtle glow behind the image
+            glow_surface = get_circle_sprite(color, 20, size // 2 + view.size(3))
+            view.surface.blit(glow_surface, (x + size // 2 - glow_surface.get_width() // 2,
+                                             y + size // 2 - glow_surface.get_height() // 2))
         # Draw the bot image
-        screen.blit(scaled_image, (x, y))
+        view.surface.blit(scaled_image, (x, y))
     else:
         # Fallback to emoji bot if image fails to load
-        draw_emoji_bot(x, y, size, color, bot_type)
+        draw_emoji_bot(x, y, size, color, bot_type, view)
 
-def draw_emoji_bot(x, y, size, color, bot_type="bot1"):
+def draw_emoji_bot(x, y, size, color, bot_type="bot1", view=None):
     """Draw a simple emoji-style bot face"""
+    view = view or main_view
+    surface = view.surface
+    x, y = view.point(x, y)
+    size = view.size(size)
     center_x = x + size // 2
     center_y = y + size // 2
-    radius = size // 2 - 2
+    radius = size // 2 - view.px(2)
     
-    # Subtle glow behind bot
-    glow_surface = pygame.Surface((size + 10, size + 10), pygame.SRCALPHA)
-    glow_color = (*color, 20)
-    pygame.draw.circle(glow_surface, glow_color, (size // 2 + 5, size // 2 + 5), radius + 3)
-    screen.blit(glow_surface, (x - 5, y - 5))
+    if view.detail >= DETAIL_MEDIUM:
+        # Subtle glow behind bot
+        glow_surface = get_circle_sprite(color, 20, radius + view.size(3))
+        surface.blit(glow_surface, (center_x - glow_surface.get_width() // 2, center_y - glow_surface.get_height() // 2))
     
     # Main bot head circle (colored)
-    pygame.draw.circle(screen, color, (center_x, center_y), radius)
+    pygame.draw.circle(surface, color, (center_x, center_y), radius)
     
     # Inner highlight circle
-    highlight_radius = radius - 4
+    highlight_radius = radius - view.px(4)
     highlight_color = tuple(min(255, c + 50) for c in color)
-    pygame.draw.circle(screen, highlight_color, (center_x, center_y), highlight_radius)
+    pygame.draw.circle(surface, highlight_color, (center_x, center_y), highlight_radius)
     
     # Eyes - two circles
-    eye_size = max(6, size // 8)
+    eye_size = max(view.size(6), size // 8)
     eye_spacing = size // 3
     left_eye_x = center_x - eye_spacing // 2
     right_eye_x = center_x + eye_spacing // 2
     eye_y = center_y - size // 8
     
     # Eye whites
-    pygame.draw.circle(screen, WHITE, (left_eye_x, eye_y), eye_size)
-    pygame.draw.circle(screen, WHITE, (right_eye_x, eye_y), eye_size)
+    pygame.draw.circle(surface, WHITE, (left_eye_x, eye_y), eye_size)
+    pygame.draw.circle(surface, WHITE, (right_eye_x, eye_y), eye_size)
     
     # Eye pupils
-    pupil_size = eye_size - 2
-    pygame.draw.circle(screen, (0, 0, 0), (left_eye_x, eye_y), pupil_size)
-    pygame.draw.circle(screen, (0, 0, 0), (right_eye_x, eye_y), pupil_size)
+    pupil_size = eye_size - view.px(2)
+    pygame.draw.circle(surface, (0, 0, 0), (left_eye_x, eye_y), pupil_size)
+    pygame.draw.circle(surface, (0, 0, 0), (right_eye_x, eye_y), pupil_size)
     
     # Mouth - happy smile (curved upward)
     mouth_y = center_y + size // 6
@@ -760,11 +2063,11 @@ def draw_emoji_bot(x, y, size, color, bot_type="bot1"):
     # Position rect so the arc follows the top edge (creating upward curve)
     mouth_rect = pygame.Rect(center_x - mouth_width // 2, mouth_y - mouth_height // 2, mouth_width, mouth_height)
     # Arc from right (0) to left (π) along the top half of the ellipse = upward smile
-    pygame.draw.arc(screen, (0, 0, 0), mouth_rect, 0, 3.14159, 3)
+    pygame.draw.arc(surface, (0, 0, 0), mouth_rect, 0, 3.14159, view.size(3))
     
     # Optional: small antenna/top decoration
     if bot_type == "bot1":
-        pygame.draw.circle(screen, color, (center_x, y + size // 8), 4)
+        pygame.draw.circle(surface, color, (center_x, y + size // 8), view.size(4))
 
 def splash_screen():
     """Show aesthetic robot splash screen"""
@@ -783,7 +2086,7 @@ def splash_screen():
         elapsed = time.time() - start_time
         
         # Background with particles
-        draw_background()
+        draw_background(window_view)
         
         # Fade in animation
         alpha = min(255, int(255 * (elapsed / fade_duration)))
@@ -791,7 +2094,7 @@ def splash_screen():
         # Draw robot
         center_x = SCREEN_WIDTH // 2 - 60
         center_y = SCREEN_HEIGHT // 2 - 50
-        draw_bot_image(center_x, center_y, 120, NEON_CYAN, "bot2")
+        draw_bot_image(center_x, center_y, 120, NEON_CYAN, "bot2", window_view)
         
         # Title with fade
         title_text = menu_font.render("AI ARENA", True, WHITE)
@@ -807,37 +2110,89 @@ def splash_screen():
         pygame.display.flip()
         clock.tick(60)
 
-def start_screen():
-    showing = True
-    pulse_time = 0
-    
-    while showing:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    showing = False
-                elif event.key == pygame.K_r:
-                    match_stats.reset_stats()
-                    match_stats.save_stats()
-                elif event.key == pygame.K_q:
-                    pygame.quit()
-                    quit()
+# Idle screens (start, pause, result) wait on input instead of spinning at
+# 60 FPS: the still parts are composed once, and only the pulsing text is
+# redrawn, IDLE_FPS times a second, in its own dirty rects.
+IDLE_FPS = 12
+PULSE_LEVELS = 32
+
+def get_glow_text(text, text_font, color, glow_base, layers, strength, pulse):
+    """Text over `layers` offset copies brightened by up to `strength`, cached per pulse level"""
+    level = round(pulse * PULSE_LEVELS)
+    key = ('glow_text', text, id(text_font), color, glow_base, layers, strength, level)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        main_text = text_font.render(text, True, color)
+        # Padded on both sides so the text stays centered on the sprite
+        sprite = pygame.Surface((main_text.get_width() + 2 * layers, main_text.get_height() + layers),
+                                pygame.SRCALPHA)
+        for i in range(layers):
+            glow_intensity = int(strength * (1 - i / layers) * level / PULSE_LEVELS)
+            glow_color = tuple(min(255, c + glow_intensity) for c in glow_base)
+            sprite.blit(text_font.render(text, True, glow_color), (layers + i, i))
+        sprite.blit(main_text, (layers, 0))
+        _sprite_cache[key] = sprite
+    return sprite
+
+def get_pulse_prompt(text, pulse):
+    """White prompt text whose brightness follows the pulse"""
+    level = round(pulse * PULSE_LEVELS)
+    key = ('prompt', text, level)
+    sprite = _sprite_cache.get(key)
+    if sprite is None:
+        intensity = min(255, int(150 + 105 * level / PULSE_LEVELS))
+        sprite = _sprite_cache[key] = font.render(text, True, (intensity, intensity, intensity))
+    return sprite
+
+def run_idle_screen(name, compose, pulse_layers, handle_event, pulse_speed):
+    """Show a mostly still screen until handle_event returns something other than None.
+
+    compose() draws the still parts once; pulse_layers(pulse) returns
+    (surface, center x, top y) tuples for the animated parts. CPU and wall
+    time spent here are logged and exported as metrics.
+    """
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    compose()
+    base = screen.copy()
+    present_frame()
+
+    dirty = []
+    result = None
+    while result is None:
+        event = pygame.event.wait(1000 // IDLE_FPS)
+        while event.type != pygame.NOEVENT and result is None:
+            result = handle_event(event)
+            event = pygame.event.poll()
+        if result is not None:
+            break
+
+        pulse = abs(math.sin((time.perf_counter() - wall_start) * pulse_speed))
+        for rect in dirty:
+            screen.blit(base, rect, rect)
+        drawn = [screen.blit(surface, (center_x - surface.get_width() // 2, y))
+                 for surface, center_x, y in pulse_layers(pulse)]
+        present_frame(dirty + drawn)
+        dirty = drawn
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    idle_wall_metric.inc(wall, name)
+    idle_cpu_metric.inc(cpu, name)
+    log_event("idle_screen", screen=name, seconds=round(wall, 2), cpu_seconds=round(cpu, 3),
+              cpu_percent=round(100 * cpu / wall, 1) if wall else 0.0)
+    return result
+
+def present_frame(rects=None):
+    """Show the frame: the whole window, or only `rects` when given"""
+    if rects is None:
+        pygame.display.flip()
+    else:
+        pygame.display.update(rects)
 
-        draw_background()
-        pulse_time += 0.1
-        pulse = abs(math.sin(pulse_time))
-        
-        # Title with glow
-        title_text = menu_font.render("BOT BATTLE", True, WHITE)
-        for i in range(5):
-            glow_intensity = int(100 * (1 - i/5) * pulse)
-            glow_color = tuple(min(255, c + glow_intensity) for c in NEON_CYAN)
-            title_glow = menu_font.render("BOT BATTLE", True, glow_color)
-            screen.blit(title_glow, (SCREEN_WIDTH // 2 - title_text.get_width() // 2 + i, 120 + i))
-        screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 120))
+def start_screen():
+    def compose():
+        draw_background(window_view)
         
         # Bot names with animated colors - better spacing to avoid overlap
         bot1_text = font.render("BOT 1", True, bot1_color)
@@ -859,17 +2214,30 @@ def start_screen():
         # Draw emoji bots above each bot name
         bot1_robot_x = center_x - (bot1_width + spacing + vs_width // 2) + bot1_width // 2 - 40
         bot2_robot_x = center_x + (vs_width // 2 + spacing) + bot2_width // 2 - 40
-        draw_bot_image(bot1_robot_x, 180, 80, bot1_color, "bot1")
-        draw_bot_image(bot2_robot_x, 180, 80, bot2_color, "bot2")
-        
-        # Start instruction with pulse
-        start_intensity = int(150 + 105 * pulse)
-        start_color = tuple(min(255, start_intensity) for _ in range(3))
-        start_text = font.render("PRESS ENTER", True, start_color)
-        screen.blit(start_text, (SCREEN_WIDTH // 2 - start_text.get_width() // 2, 450))
+        draw_bot_image(bot1_robot_x, 180, 80, bot1_color, "bot1", window_view)
+        draw_bot_image(bot2_robot_x, 180, 80, bot2_color, "bot2", window_view)
 
-        pygame.display.flip()
-        clock.tick(60)
+    def pulse_layers(pulse):
+        # Title with glow, start instruction with pulse
+        return [(get_glow_text("BOT BATTLE", menu_font, WHITE, NEON_CYAN, 5, 100, pulse), SCREEN_WIDTH // 2, 120),
+                (get_pulse_prompt("PRESS ENTER", pulse), SCREEN_WIDTH // 2, 450)]
+
+    def handle_event(event):
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            quit()
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_RETURN:
+                return True
+            elif event.key == pygame.K_r:
+                match_stats.reset_stats()
+                match_stats.save_stats()
+            elif event.key == pygame.K_q:
+                pygame.quit()
+                quit()
+        return None
+
+    run_idle_screen("start", compose, pulse_layers, handle_event, pulse_speed=6.0)
 
 def countdown_screen():
     """Show countdown before match starts"""
@@ -889,7 +2257,7 @@ def countdown_screen():
         display_count = countdown[countdown_index]
         
         # Background
-        draw_background()
+        draw_background(window_view)
         
         # Pulse animation
         pulse = abs(math.sin(elapsed * 6))
@@ -926,7 +2294,7 @@ def countdown_screen():
     # Final "GO!" flash
     go_time = time.time()
     while time.time() - go_time < 0.5:
-        draw_background()
+        draw_background(window_view)
         go_text = menu_font.render("GO!", True, GOLD)
         text_rect = go_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
         screen.blit(go_text, text_rect)
@@ -938,58 +2306,40 @@ def pause_game():
     paused = True
     if pause_sound:
         pause_sound.play()
-    
-    pulse_time = 0
-    while paused:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+
+    def pulse_layers(pulse):
+        # Pause text with glow
+        return [(get_glow_text("PAUSED", menu_font, WHITE, ORANGE, 5, 120, pulse),
+                 SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100),
+                (get_pulse_prompt("P - RESUME", pulse), SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50)]
+
+    def handle_event(event):
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            quit()
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_p:
+                if pause_sound:
+                    pause_sound.play()
+                return True
+            elif event.key == pygame.K_q:
                 pygame.quit()
                 quit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_p:
-                    paused = False
-                    if pause_sound:
-                        pause_sound.play()
-                elif event.key == pygame.K_q:
-                    pygame.quit()
-                    quit()
-        
-        draw_background()
-        pulse_time += 0.15
-        pulse = abs(math.sin(pulse_time))
-        
-        # Pause text with glow
-        pause_text = menu_font.render("PAUSED", True, WHITE)
-        for i in range(5):
-            glow_intensity = int(120 * (1 - i/5) * pulse)
-            glow_color = tuple(min(255, c + glow_intensity) for c in ORANGE)
-            pause_glow = menu_font.render("PAUSED", True, glow_color)
-            screen.blit(pause_glow, (SCREEN_WIDTH // 2 - pause_text.get_width() // 2 + i, 
-                                     SCREEN_HEIGHT // 2 - 100 + i))
-        screen.blit(pause_text, (SCREEN_WIDTH // 2 - pause_text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
-        
-        resume_intensity = int(150 + 105 * pulse)
-        resume_color = tuple(min(255, resume_intensity) for _ in range(3))
-        resume_text = font.render("P - RESUME", True, resume_color)
-        screen.blit(resume_text, (SCREEN_WIDTH // 2 - resume_text.get_width() // 2, SCREEN_HEIGHT // 2 + 50))
-        
-        pygame.display.flip()
-        clock.tick(60)
+        return None
+
+    run_idle_screen("pause", lambda: draw_background(window_view), pulse_layers, handle_event, pulse_speed=9.0)
+    paused = False
 
 def reset_game_state():
     global left_ai_paddle, right_ai_paddle, ball, left_score, right_score
-    global game_logs, ball_trail, last_hitter
-    global minimax_decisions, fuzzy_decisions, hybrid_switches
+    global last_hitter
+    global minimax_decisions, fuzzy_decisions, hybrid_switches, hybrid_plan_stats, mcts_stats
     global left_ai_type, right_ai_type, left_ai_color, right_ai_color
     global left_ai_reaction, right_ai_reaction
     
     left_ai_type, right_ai_type, left_ai_color, right_ai_color = randomize_ai_roles()
     
-    # Debug: Print which AI is on which side
-    print(f"\n=== NEW MATCH ===")
-    print(f"BOT 1 (Left): {left_ai_type.upper()}")
-    print(f"BOT 2 (Right): {right_ai_type.upper()}")
-    print("=" * 20)
+    log_event("reset", bot1=left_ai_type, bot2=right_ai_type)
     
     left_ai_paddle = Paddle(40, HEADER_HEIGHT + 20 + (SCREEN_HEIGHT - HEADER_HEIGHT) // 2 - 60, left_ai_color)
     right_ai_paddle = Paddle(SCREEN_WIDTH - 64, HEADER_HEIGHT + 20 + (SCREEN_HEIGHT - HEADER_HEIGHT) // 2 - 60, right_ai_color)
@@ -997,90 +2347,667 @@ def reset_game_state():
     
     left_score = 0
     right_score = 0
-    game_logs = []
-    ball_trail = []
     last_hitter = None
     minimax_decisions = 0
     fuzzy_decisions = 0
     hybrid_switches = {"fuzzy": 0, "minimax": 0}
+    hybrid_plan_stats = {"hits": 0, "misses": 0}
+    mcts_stats = {"decisions": 0, "rollouts": 0, "search_time": 0.0, "tree_nodes": 0, "reused": 0}
     left_ai_reaction = 0.05
     right_ai_reaction = 0.05
 
+def match_winner(left_score, right_score):
+    """Winner key used by MatchStatistics: 'bot1' (left), 'bot2' (right) or 'draw'"""
+    if left_score > right_score:
+        return "bot1"
+    elif right_score > left_score:
+        return "bot2"
+    return "draw"
+
 def show_result_screen(left_score, right_score):
-    showing = True
-    
     # Determine winner
-    if left_score > right_score:
+    winner_algorithm = match_winner(left_score, right_score)
+    if winner_algorithm == "bot1":
         winner = "BOT 1"
         winner_color = bot1_color
-        winner_algorithm = "bot1"
-    elif right_score > left_score:
+    elif winner_algorithm == "bot2":
         winner = "BOT 2"
         winner_color = bot2_color
-        winner_algorithm = "bot2"
     else:
         winner = 'DRAW'
         winner_color = GOLD
-        winner_algorithm = "draw"
     
     # Record match
     match_stats.record_match(winner_algorithm)
 
-    pulse_time = 0
-    while showing:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                quit()
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    return 'restart'
-                elif event.key == pygame.K_q:
-                    return 'quit'
+    # Winner with pulsing glow (or draw message)
+    if winner == 'DRAW':
+        display_text = "IT'S A DRAW!"
+    else:
+        display_text = f"{winner} WINS!"
 
-        draw_background()
-        pulse_time += 0.12
-        pulse = abs(math.sin(pulse_time))
+    def compose():
+        draw_background(window_view)
         
         # Title
         title = menu_font.render('MATCH COMPLETE', True, WHITE)
         screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 100))
         
-        # Final scores with glow
-        left_str = str(left_score)
-        right_str = str(right_score)
-        left_score_text = score_font.render(left_str, True, bot1_color)
-        right_score_text = score_font.render(right_str, True, bot2_color)
+        # Final scores
+        left_score_text = score_font.render(str(left_score), True, bot1_color)
+        right_score_text = score_font.render(str(right_score), True, bot2_color)
         screen.blit(left_score_text, (SCREEN_WIDTH // 4 - left_score_text.get_width() // 2, 250))
         screen.blit(right_score_text, (3 * SCREEN_WIDTH // 4 - right_score_text.get_width() // 2, 250))
         
         # Robot avatars above scores
-        draw_bot_image(SCREEN_WIDTH // 4 - 50, 180, 60, bot1_color, "bot1")
-        draw_bot_image(3 * SCREEN_WIDTH // 4 - 50, 180, 60, bot2_color, "bot2")
-        
-        # Winner with pulsing glow (or draw message)
-        if winner == 'DRAW':
-            display_text = "IT'S A DRAW!"
+        draw_bot_image(SCREEN_WIDTH // 4 - 50, 180, 60, bot1_color, "bot1", window_view)
+        draw_bot_image(3 * SCREEN_WIDTH // 4 - 50, 180, 60, bot2_color, "bot2", window_view)
+
+    def pulse_layers(pulse):
+        # Winner glow and continue instruction
+        return [(get_glow_text(display_text, menu_font, winner_color, winner_color, 8, 150, pulse),
+                 SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2),
+                (get_pulse_prompt("ENTER - RESTART", pulse), SCREEN_WIDTH // 2, SCREEN_HEIGHT - 150)]
+
+    def handle_event(event):
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            quit()
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_RETURN:
+                return 'restart'
+            elif event.key == pygame.K_q:
+                return 'quit'
+        return None
+
+    return run_idle_screen("result", compose, pulse_layers, handle_event, pulse_speed=7.2)
+
+# ============================================
+# FRAME CAPTURE
+# ============================================
+
+CAPTURE_FORMATS = ("raw", "png", "ffmpeg")
+
+class FrameCapture:
+    """Streams frames to disk from a writer thread.
+
+    The game thread only copies the screen's pixel buffer (one memcpy) and
+    drops it into a bounded queue; encoding and file I/O happen on the
+    writer thread. When the writer falls behind, new frames are dropped
+    instead of blocking the game loop. A writer that fails keeps draining
+    the queue, so nothing blocks on it, and close() raises its error.
+    """
+    def __init__(self, directory, fmt="raw", queue_size=120, fps=60):
+        if fmt not in CAPTURE_FORMATS:
+            raise ValueError(f"Unknown capture format: {fmt}")
+        self.directory = directory
+        self.format = fmt
+        self.fps = fps
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.captured = 0
+        self.dropped = 0
+        self.written = 0
+        self.max_queued = 0
+        self.size = None
+        self.encoder = None
+        self.raw_file = None
+        self.error = None
+        self.error_reported = False
+        os.makedirs(directory, exist_ok=True)
+        self.writer = threading.Thread(target=self._write_frames, name="frame-writer", daemon=True)
+        self.writer.start()
+
+    @staticmethod
+    def pixel_layout(surface):
+        """ffmpeg pix_fmt naming the byte order of a 32-bit surface buffer"""
+        if surface.get_bytesize() == 4 and surface.get_pitch() == surface.get_width() * 4:
+            shifts = surface.get_shifts()[:3]
+            if shifts == (16, 8, 0):
+                return "bgr0"
+            if shifts == (0, 8, 16):
+                return "rgb0"
+        return None
+
+    def capture(self, surface):
+        if self.size is None:
+            self.size = surface.get_size()
+            self.masks = surface.get_masks()
+            self.pix_fmt = self.pixel_layout(surface)
+            self.direct = self.pix_fmt is not None
+        if self.direct:
+            data = surface.get_buffer().raw
         else:
-            display_text = f"{winner} WINS!"
-        
-        winner_text = menu_font.render(display_text, True, winner_color)
-        for i in range(8):
-            glow_intensity = int(150 * (1 - i/8) * pulse)
-            glow_color = tuple(min(255, c + glow_intensity) for c in winner_color)
-            winner_glow = menu_font.render(display_text, True, glow_color)
-            screen.blit(winner_glow, (SCREEN_WIDTH // 2 - winner_text.get_width() // 2 + i, 
-                                     SCREEN_HEIGHT // 2 + i))
-        screen.blit(winner_text, (SCREEN_WIDTH // 2 - winner_text.get_width() // 2, SCREEN_HEIGHT // 2))
-        
-        # Continue instruction
-        cont_intensity = int(150 + 105 * pulse)
-        cont_color = tuple(min(255, cont_intensity) for _ in range(3))
-        cont_text = font.render("ENTER - RESTART", True, cont_color)
-        screen.blit(cont_text, (SCREEN_WIDTH // 2 - cont_text.get_width() // 2, SCREEN_HEIGHT - 150))
+            data = pygame.image.tobytes(surface, "RGBX")
+            self.pix_fmt = "rgb0"
+        self.captured += 1
+        if self.error is not None or not self.writer.is_alive():
+            self.dropped += 1
+            if not self.error_reported:
+                self.error_reported = True
+                log_event("capture_failed", level="warning", error=repr(self.error))
+            return
+        try:
+            self.frames.put_nowait(data)
+        except queue.Full:
+            self.dropped += 1
+            return
+        self.max_queued = max(self.max_queued, self.frames.qsize())
+
+    def _open_output(self):
+        if self.format == "ffmpeg":
+            encoder = shutil.which("ffmpeg")
+            if encoder is None:
+                raise RuntimeError("ffmpeg not found on PATH")
+            width, height = self.size
+            self.encoder = subprocess.Popen(
+                [encoder, "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", self.pix_fmt,
+                 "-s", f"{width}x{height}", "-r", str(self.fps), "-i", "-",
+                 "-pix_fmt", "yuv420p", os.path.join(self.directory, "capture.mp4")],
+                stdin=subprocess.PIPE)
+        elif self.format == "raw":
+            self.raw_file = open(os.path.join(self.directory, "frames.raw"), "wb")
+
+    def _write_frames(self):
+        while True:
+            data = self.frames.get()
+            if data is None:
+                break
+            if self.error is not None:
+                continue  # discard until close() so the game thread never blocks
+            try:
+                self._write_frame(data)
+            except Exception as error:
+                self.error = error
+
+    def _write_frame(self, data):
+        if self.written == 0:
+            self._open_output()
+        if self.format == "png":
+            if self.direct:
+                frame = pygame.Surface(self.size, 0, 32, self.masks)
+                frame.get_buffer().write(data)
+            else:
+                frame = pygame.image.frombuffer(data, self.size, "RGBX")
+            pygame.image.save(frame, os.path.join(self.directory, f"frame_{self.written:06d}.png"))
+        elif self.format == "raw":
+            self.raw_file.write(data)
+        else:
+            self.encoder.stdin.write(data)
+        self.written += 1
+
+    def close(self):
+        """Flush queued frames, finish the output and return the frame counts"""
+        if self.writer.is_alive():
+            self.frames.put(None)
+            self.writer.join()
+        if self.raw_file:
+            self.raw_file.close()
+            width, height = self.size or (0, 0)
+            with open(os.path.join(self.directory, "frames.json"), "w") as f:
+                json.dump({"width": width, "height": height, "pixel_format": self.pix_fmt,
+                           "fps": self.fps, "frames": self.written}, f, indent=2)
+        if self.encoder:
+            try:
+                self.encoder.stdin.close()
+            except BrokenPipeError:
+                pass  # ffmpeg already exited; its status is the error below
+            self.encoder.wait()
+        if self.error is not None:
+            raise RuntimeError(f"frame capture failed after {self.written} frames: {self.error}") from self.error
+        return self.report()
 
-        pygame.display.flip()
-        clock.tick(60)
+    def report(self):
+        return (f"capture: {self.captured} frames, {self.written} written, {self.dropped} dropped, "
+                f"{self.frames.qsize()} queued (max {self.max_queued})")
+
+frame_capture = None
+
+# ============================================
+# PROFILING
+# ============================================
+
+# Function qualnames that mark each subsystem. A sample belongs to the
+# outermost subsystem on its stack, so the ball physics the AIs run for
+# look-ahead counts as AI search, except for the leaf subsystems, which
+# are charged wherever they run (evaluate_state inside the search tree,
+# particles inside Ball.draw).
+PROFILE_SUBSYSTEMS = {
+    "ai_search": ("ai_frame", "ai_turn", "prefetch_minimax", "HeadlessMatch.decide"),
+    "evaluate_state": ("evaluate_state",),
+    "physics": ("advance_ball", "Ball.move_vertical_center", "Paddle.update", "Paddle.advance"),
+    "particles": ("Particle.__init__", "Particle.update", "Particle.draw", "Ball.update_effects"),
+    "draw_background": ("draw_background", "update_background_particles"),
+    "arena": ("draw_center_ball", "Paddle.draw", "Ball.draw"),
+    "header": ("draw_game_header",),
+    "display_flip": ("present_scene", "present_frame"),
+}
+PROFILE_LEAF_SUBSYSTEMS = ("evaluate_state", "particles")
+_profile_lookup = {name: subsystem for subsystem, names in PROFILE_SUBSYSTEMS.items() for name in names}
+
+def profile_subsystem(qualnames):
+    """Subsystem for a stack given root first; "other" when none matches"""
+    outermost = None
+    for name in qualnames:
+        subsystem = _profile_lookup.get(name)
+        if subsystem in PROFILE_LEAF_SUBSYSTEMS:
+            return subsystem
+        if subsystem and outermost is None:
+            outermost = subsystem
+    return outermost or "other"
+
+class SamplingProfiler:
+    """Samples the game thread's Python stack from a background thread.
+
+    Every `interval` seconds the sampler reads the game thread's current
+    frame and folds its stack into a `subsystem;root;...;leaf` line, the
+    collapsed format flamegraph.pl and speedscope read. Nothing is hooked
+    into the game code, so the cost is one stack walk per sample. The loop
+    calls mark_tick() after each frame so the slowest ticks can be broken
+    down by subsystem as well.
+    """
+    def __init__(self, interval=0.001, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = {}
+        self.subsystems = {}
+        self.functions = {}
+        self.tick_subsystems = {}
+        self.tick_times = []
+        self.samples = 0
+        self.ticks = 0
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self.sampler = None
+
+    def start(self):
+        # The sampler only gets to run when the game thread drops the GIL
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self.started = self._tick_start = time.perf_counter()
+        self.sampler = threading.Thread(target=self._sample_loop, name="profiler", daemon=True)
+        self.sampler.start()
+
+    def mark_tick(self):
+        now = time.perf_counter()
+        self.tick_times.append(now - self._tick_start)
+        self._tick_start = now
+        self.ticks += 1
+
+    def stop(self):
+        self._stop.set()
+        self.sampler.join()
+        sys.setswitchinterval(self._switch_interval)
+        self.elapsed = time.perf_counter() - self.started
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.record(frame)
+
+    def record(self, frame):
+        qualnames, labels = [], []
+        while frame is not None:
+            code = frame.f_code
+            name = getattr(code, "co_qualname", code.co_name)
+            qualnames.append(name)
+            labels.append(f"{os.path.basename(code.co_filename)}:{name}")
+            frame = frame.f_back
+        qualnames.reverse()
+        labels.reverse()
+        subsystem = profile_subsystem(qualnames)
+        stack = ";".join([subsystem] + labels)
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.subsystems[subsystem] = self.subsystems.get(subsystem, 0) + 1
+        self.functions[labels[-1]] = self.functions.get(labels[-1], 0) + 1
+        per_tick = self.tick_subsystems.setdefault(self.ticks, {})
+        per_tick[subsystem] = per_tick.get(subsystem, 0) + 1
+        self.samples += 1
+
+    def report(self, top=15):
+        samples = max(1, self.samples)
+        ticks = max(1, self.ticks)
+        ms_per_sample = self.elapsed * 1000 / samples
+        slowest = max(self.tick_times, default=0.0)
+        lines = [f"profile: {self.ticks} ticks in {self.elapsed:.2f}s ({self.elapsed * 1000 / ticks:.2f} ms/tick, "
+                 f"slowest {slowest * 1000:.2f} ms), {self.samples:,} samples every {self.interval * 1000:g} ms",
+                 f"{'subsystem':<18}{'samples':>9}{'share':>8}{'ms/tick':>9}"]
+        for subsystem, count in sorted(self.subsystems.items(), key=lambda item: -item[1]):
+            lines.append(f"{subsystem:<18}{count:>9,}{count / samples:>8.1%}{count * ms_per_sample / ticks:>9.3f}")
+        lines.append(f"top {top} functions by self samples:")
+        for label, count in sorted(self.functions.items(), key=lambda item: -item[1])[:top]:
+            lines.append(f"  {count:>7,} {count / samples:>6.1%}  {label}")
+        lines.append("slowest ticks:")
+        spikes = sorted(range(len(self.tick_times)), key=lambda tick: -self.tick_times[tick])[:5]
+        for tick in spikes:
+            breakdown = sorted(self.tick_subsystems.get(tick, {}).items(), key=lambda item: -item[1])
+            parts = ", ".join(f"{subsystem} {count}" for subsystem, count in breakdown) or "no samples"
+            lines.append(f"  tick {tick}: {self.tick_times[tick] * 1000:.2f} ms ({parts})")
+        return "\n".join(lines)
+
+    def write(self, prefix):
+        """Write PREFIX.folded (collapsed stacks) and PREFIX.txt (the report); returns both paths"""
+        folded, summary = prefix + ".folded", prefix + ".txt"
+        with open(folded, "w") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+        with open(summary, "w") as f:
+            f.write(self.report() + "\n")
+        return folded, summary
+
+# ============================================
+# SNAPSHOTS
+# ============================================
+
+# Match state as fixed-layout structs: no pickling, a few kilobytes (most
+# of it the Mersenne Twister's 625 words) and a few microseconds either
+# way. Everything that decides the next frame is kept: positions, speeds,
+# trajectories, scores, both RNGs and the hybrid plan caches. Left out:
+# trails and particles (cosmetic, rebuilt within a few frames), the AI
+# params (configuration; restore into a match built with the same ones)
+# and MCTS trees, whose search is bounded by wall-clock time and so never
+# replays exactly anyway; they are rebuilt on the next decision.
+SNAPSHOT_MAGIC = b"PGS1"
+SNAPSHOT_HEADER = struct.Struct("<4sB")        # magic, 1 if the numpy RNG state follows the random one
+BALL_STATE = struct.Struct("<iiiiBI")          # x, y, speed_x, speed_y, fire color index, trajectory
+PADDLE_STATE = struct.Struct("<iiiiB")         # y, target_y, speed, glow_intensity, plan (0 none, else strategy + 1)
+PLAN_STATE = struct.Struct("<dIBdd")           # target_y, trajectory, pressure bucket, x_low, x_high
+RANDOM_STATE = struct.Struct("<625I?d")        # Mersenne Twister words and position, cached gauss (if any)
+PCG_STATE = struct.Struct("<16s16sIQ")         # PCG64 state, increment, has_uint32, uinteger
+COUNTER_STATE = struct.Struct("<IIQQQQQQQQd")  # minimax/fuzzy decisions, hybrid switches, plan hits/misses, mcts stats
+GAME_STATE = struct.Struct("<iiBBBddd")        # scores, last hitter, AI types, reaction times, match clock
+PLAN_STRATEGIES = ("fuzzy", "minimax")
+HITTERS = (None, "left", "right")
+
+def pack_rng_state():
+    version, words, gauss = random.getstate()
+    parts = [RANDOM_STATE.pack(*words, gauss is not None, gauss or 0.0)]
+    if mcts_rng is not None:
+        state = mcts_rng.bit_generator.state
+        parts.append(PCG_STATE.pack(state["state"]["state"].to_bytes(16, "little"),
+                                    state["state"]["inc"].to_bytes(16, "little"),
+                                    state["has_uint32"], state["uinteger"]))
+    return b"".join(parts)
+
+def unpack_rng_state(data, offset, has_pcg):
+    values = RANDOM_STATE.unpack_from(data, offset)
+    random.setstate((3, values[:625], values[626] if values[625] else None))
+    offset += RANDOM_STATE.size
+    if has_pcg:
+        state, inc, has_uint32, uinteger = PCG_STATE.unpack_from(data, offset)
+        if mcts_rng is not None:
+            mcts_rng.bit_generator.state = {
+                "bit_generator": "PCG64",
+                "state": {"state": int.from_bytes(state, "little"), "inc": int.from_bytes(inc, "little")},
+                "has_uint32": has_uint32, "uinteger": uinteger}
+        offset += PCG_STATE.size
+    return offset
+
+def pack_ball(ball):
+    return BALL_STATE.pack(ball.rect.x, ball.rect.y, ball.speed_x, ball.speed_y,
+                           FIRE_COLORS.index(ball.fire_color), ball.trajectory)
+
+def unpack_ball(ball, data, offset):
+    ball.rect.x, ball.rect.y, ball.speed_x, ball.speed_y, color, ball.trajectory = BALL_STATE.unpack_from(data, offset)
+    ball.fire_color = FIRE_COLORS[color]
+    ball.trail.clear()
+    ball.particles = []
+    return offset + BALL_STATE.size
+
+def pack_paddle(paddle):
+    plan = paddle.hybrid_plan
+    strategy = PLAN_STRATEGIES.index(plan.strategy) + 1 if plan else 0
+    data = PADDLE_STATE.pack(paddle.rect.y, paddle.target_y, paddle.speed, paddle.glow_intensity, strategy)
+    if plan:
+        data += PLAN_STATE.pack(plan.target_y, plan.trajectory, plan.pressure_bucket, plan.x_low, plan.x_high)
+    return data
+
+def unpack_paddle(paddle, data, offset):
+    paddle.rect.y, paddle.target_y, paddle.speed, paddle.glow_intensity, strategy = \
+        PADDLE_STATE.unpack_from(data, offset)
+    offset += PADDLE_STATE.size
+    paddle.hybrid_plan = None
+    paddle.mcts_tree = None
+    paddle.movement_trail.clear()
+    if strategy:
+        plan = paddle.hybrid_plan = HybridPlan.__new__(HybridPlan)
+        plan.strategy = PLAN_STRATEGIES[strategy - 1]
+        plan.target_y, plan.trajectory, plan.pressure_bucket, plan.x_low, plan.x_high = \
+            PLAN_STATE.unpack_from(data, offset)
+        offset += PLAN_STATE.size
+    return offset
+
+def pack_counters(switches, plan_stats, mcts, minimax=0, fuzzy=0):
+    return COUNTER_STATE.pack(minimax, fuzzy, switches["fuzzy"], switches["minimax"],
+                              plan_stats["hits"], plan_stats["misses"], mcts["decisions"], mcts["rollouts"],
+                              mcts["tree_nodes"], mcts["reused"], mcts["search_time"])
+
+def unpack_counters(data, offset):
+    """(minimax, fuzzy, hybrid switches, plan stats, mcts stats) and the new offset"""
+    values = COUNTER_STATE.unpack_from(data, offset)
+    minimax, fuzzy, switch_fuzzy, switch_minimax, hits, misses, decisions, rollouts, nodes, reused, search_time = values
+    return (minimax, fuzzy, {"fuzzy": switch_fuzzy, "minimax": switch_minimax}, {"hits": hits, "misses": misses},
+            {"decisions": decisions, "rollouts": rollouts, "search_time": search_time, "tree_nodes": nodes,
+             "reused": reused}), offset + COUNTER_STATE.size
+
+def snapshot_header():
+    return SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, mcts_rng is not None)
+
+def read_snapshot_header(data):
+    """Whether a PCG state follows the random one, and the offset after the header"""
+    magic, has_pcg = SNAPSHOT_HEADER.unpack_from(data, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Not a match snapshot")
+    return has_pcg, SNAPSHOT_HEADER.size
+
+def snapshot_game(elapsed=0.0):
+    """The running game's globals as bytes; `elapsed` is the match clock in seconds"""
+    return b"".join((
+        snapshot_header(),
+        GAME_STATE.pack(left_score, right_score, HITTERS.index(last_hitter), AI_TYPES.index(left_ai_type),
+                        AI_TYPES.index(right_ai_type), left_ai_reaction, right_ai_reaction, elapsed),
+        pack_counters(hybrid_switches, hybrid_plan_stats, mcts_stats, minimax_decisions, fuzzy_decisions),
+        pack_ball(ball),
+        pack_ball(center_ball),
+        pack_paddle(left_ai_paddle),
+        pack_paddle(right_ai_paddle),
+        pack_rng_state(),
+    ))
+
+def restore_game(data):
+    """Load a snapshot_game() blob into the globals; returns the match clock it was taken at"""
+    global left_ai_paddle, right_ai_paddle, ball, center_ball, left_score, right_score, last_hitter
+    global minimax_decisions, fuzzy_decisions, hybrid_switches, hybrid_plan_stats, mcts_stats
+    global left_ai_type, right_ai_type, left_ai_color, right_ai_color, left_ai_reaction, right_ai_reaction
+    has_pcg, offset = read_snapshot_header(data)
+    left_score, right_score, hitter, left_type, right_type, left_ai_reaction, right_ai_reaction, elapsed = \
+        GAME_STATE.unpack_from(data, offset)
+    offset += GAME_STATE.size
+    last_hitter = HITTERS[hitter]
+    left_ai_type, right_ai_type = AI_TYPES[left_type], AI_TYPES[right_type]
+    left_ai_color, right_ai_color = ai_colors(left_ai_type, right_ai_type)
+    counters, offset = unpack_counters(data, offset)
+    minimax_decisions, fuzzy_decisions, hybrid_switches, hybrid_plan_stats, mcts_stats = counters
+
+    arena_center_y = HEADER_HEIGHT + 20 + (SCREEN_HEIGHT - HEADER_HEIGHT) // 2
+    ball = Ball(SCREEN_WIDTH // 2, arena_center_y)
+    center_ball = Ball(SCREEN_WIDTH // 2, arena_center_y)
+    left_ai_paddle = Paddle(40, arena_center_y - 60, left_ai_color)
+    right_ai_paddle = Paddle(SCREEN_WIDTH - 64, arena_center_y - 60, right_ai_color)
+    offset = unpack_ball(ball, data, offset)
+    offset = unpack_ball(center_ball, data, offset)
+    offset = unpack_paddle(left_ai_paddle, data, offset)
+    offset = unpack_paddle(right_ai_paddle, data, offset)
+    # Last, since the fresh balls above drew their random speeds
+    unpack_rng_state(data, offset, has_pcg)
+    return elapsed
+
+# ============================================
+# ALLOCATION TRACING
+# ============================================
+
+def current_rss():
+    """Resident set size in bytes, where /proc is available"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def peak_rss():
+    """Peak resident set size of the process in bytes, if the platform reports it"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+class AllocationTracer:
+    """Allocations per frame and game phase, GC pauses and RSS over a match.
+
+    The loop names the phase it is entering with phase() and closes the
+    frame with end_frame(). tracemalloc's traces are cleared as each phase
+    starts, so when it ends they hold exactly the blocks the phase
+    allocated and kept ("kept"), and the traced peak is the most it had
+    allocated at once, which is what its short-lived garbage (rects,
+    tuples, clones, surfaces) costs ("transient"). Only memory that goes
+    through Python's allocators is seen: a Surface object is, its SDL
+    pixel buffer is not; RSS covers that. GC pauses come from gc.callbacks
+    and are charged to the phase that triggered the collection.
+    """
+    def __init__(self):
+        self.phases = {}  # name -> [frames, kept blocks, kept bytes, transient bytes, max transient bytes]
+        self.sites = {}   # (phase, "file:line") -> [kept blocks, kept bytes]
+        self.frame_totals = []  # (kept blocks, kept bytes, transient bytes, gc seconds) per frame
+        self.gc_pauses = []  # (seconds, generation, phase)
+        self.current = None
+        self._frame = [0, 0, 0, 0.0]
+        self._gc_start = None
+
+    def start(self):
+        tracemalloc.start()
+        gc.callbacks.append(self._on_gc)
+        self.started = time.perf_counter()
+        self.start_rss = current_rss()
+
+    def stop(self):
+        if self.current:
+            self.end_frame()
+        gc.callbacks.remove(self._on_gc)
+        tracemalloc.stop()
+
+    def _on_gc(self, stage, info):
+        if stage == "start":
+            self._gc_start = time.perf_counter()
+        elif self._gc_start is not None:
+            pause = time.perf_counter() - self._gc_start
+            self.gc_pauses.append((pause, info["generation"], self.current or "between frames"))
+            self._frame[3] += pause
+            self._gc_start = None
+
+    def phase(self, name):
+        self._close_phase()
+        self.current = name
+        tracemalloc.clear_traces()
+
+    def end_frame(self):
+        self._close_phase()
+        self.current = None
+        self.frame_totals.append(tuple(self._frame))
+        self._frame = [0, 0, 0, 0.0]
+
+    def _close_phase(self):
+        if self.current is None:
+            return
+        kept, transient = tracemalloc.get_traced_memory()
+        traces = tracemalloc.take_snapshot().traces
+        stats = self.phases.setdefault(self.current, [0, 0, 0, 0, 0])
+        stats[0] += 1
+        stats[1] += len(traces)
+        stats[2] += kept
+        stats[3] += transient
+        stats[4] = max(stats[4], transient)
+        for trace in traces:
+            frame = trace.traceback[0]
+            site = self.sites.setdefault((self.current, f"{os.path.basename(frame.filename)}:{frame.lineno}"), [0, 0])
+            site[0] += 1
+            site[1] += trace.size
+        self._frame[0] += len(traces)
+        self._frame[1] += kept
+        self._frame[2] = max(self._frame[2], transient)
+
+    def summary(self):
+        """The headline numbers, for the match_end log line"""
+        frames = max(1, len(self.frame_totals))
+        pauses = [pause for pause, _, _ in self.gc_pauses]
+        rss = peak_rss()
+        return {
+            "frames": len(self.frame_totals),
+            "kept_blocks_per_frame": round(sum(f[0] for f in self.frame_totals) / frames, 1),
+            "kept_kb_per_frame": round(sum(f[1] for f in self.frame_totals) / frames / 1024, 2),
+            "gc_pauses": len(pauses),
+            "gc_ms": round(sum(pauses) * 1000, 2),
+            "gc_max_ms": round(max(pauses, default=0.0) * 1000, 3),
+            "peak_rss_mb": round(rss / 2**20, 1) if rss else None,
+        }
+
+    def report(self, top=10):
+        frames = max(1, len(self.frame_totals))
+        elapsed = time.perf_counter() - self.started
+        lines = [f"allocation trace: {len(self.frame_totals)} frames in {elapsed:.1f}s",
+                 f"{'phase':<16}{'kept blocks/fr':>15}{'kept KB/fr':>11}{'transient KB/fr':>16}"
+                 f"{'max transient KB':>17}{'gc pauses':>10}{'gc ms':>9}"]
+        for name, (seen, blocks, kept, transient, max_transient) in self.phases.items():
+            pauses = [pause for pause, _, phase in self.gc_pauses if phase == name]
+            lines.append(f"{name:<16}{blocks / frames:>15.1f}{kept / frames / 1024:>11.2f}"
+                         f"{transient / max(1, seen) / 1024:>16.2f}{max_transient / 1024:>17.1f}"
+                         f"{len(pauses):>10}{sum(pauses) * 1000:>9.2f}")
+
+        pauses = sorted(self.gc_pauses, reverse=True)
+        by_generation = [sum(1 for _, generation, _ in pauses if generation == g) for g in range(3)]
+        lines.append(f"gc: {len(pauses)} collections (gen0 {by_generation[0]}, gen1 {by_generation[1]}, "
+                     f"gen2 {by_generation[2]}), {sum(p for p, _, _ in pauses) * 1000:.2f} ms in total")
+        for pause, generation, phase in pauses[:5]:
+            lines.append(f"  {pause * 1000:.3f} ms gen{generation} collection in {phase}")
+        worst = max(range(len(self.frame_totals)), key=lambda i: self.frame_totals[i][2], default=None)
+        if worst is not None:
+            blocks, kept, transient, gc_seconds = self.frame_totals[worst]
+            lines.append(f"worst frame {worst}: {transient / 1024:.1f} KB transient, {blocks} blocks "
+                         f"({kept / 1024:.1f} KB) kept, {gc_seconds * 1000:.2f} ms in gc")
+
+        rss, peak = current_rss(), peak_rss()
+        memory = [f"peak RSS {peak / 2**20:.1f} MB" if peak else "peak RSS n/a"]
+        if rss and self.start_rss:
+            memory.append(f"RSS {self.start_rss / 2**20:.1f} -> {rss / 2**20:.1f} MB over the match")
+        memory.append(f"{sys.getallocatedblocks():,} Python blocks, {len(gc.get_objects()):,} gc-tracked objects")
+        lines.append("memory: " + ", ".join(memory))
+
+        lines.append(f"top {top} allocation sites by kept blocks:")
+        for (phase, site), (blocks, size) in sorted(self.sites.items(), key=lambda item: -item[1][0])[:top]:
+            lines.append(f"  {blocks / frames:>8.1f} blocks/frame {size / frames / 1024:>8.2f} KB/frame  "
+                         f"{phase:<16}{site}")
+        return "\n".join(lines)
+
+alloc_tracer = None
+
+def trace_phase(name):
+    """Tell the allocation tracer (if any) which part of the frame runs next"""
+    if alloc_tracer:
+        alloc_tracer.phase(name)
+
+def start_alloc_trace():
+    global alloc_tracer
+    alloc_tracer = AllocationTracer()
+    alloc_tracer.start()
+
+def finish_alloc_trace(path, left_score, right_score):
+    """Stop tracing, log the headline numbers and append the full report to `path`"""
+    global alloc_tracer
+    alloc_tracer.stop()
+    log_event("alloc_trace", **alloc_tracer.summary())
+    with open(path, "a") as f:
+        f.write(f"=== match ended {time.strftime('%Y-%m-%d %H:%M:%S')}, {left_score}-{right_score}\n"
+                f"{alloc_tracer.report()}\n\n")
+    alloc_tracer = None
 
 # Initialize clock early
 clock = pygame.time.Clock()
@@ -1094,139 +3021,216 @@ left_score = 0
 right_score = 0
 last_hitter = None
 
-running = True
-
 MATCH_DURATION = 60
+TICKS_PER_SECOND = 60
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="AI Battle Arena")
+    parser.add_argument("--policy-table", help="minimax policy table from build_policy_table.py")
+    parser.add_argument("--minimax-eval", choices=["tree", "batched"], help="minimax leaf evaluation mode")
+    parser.add_argument("--capture", metavar="DIR", help="record gameplay frames into DIR")
+    parser.add_argument("--capture-format", choices=CAPTURE_FORMATS, default="raw",
+                        help="raw frame stream, PNG sequence or an ffmpeg-encoded capture.mp4")
+    parser.add_argument("--log-level", choices=list(LOG_LEVELS), default="info",
+                        help="lowest event level to record (debug adds hits and strategy switches)")
+    parser.add_argument("--log-file", help="append events to this file as JSON lines")
+    parser.add_argument("--quality", choices=("auto",) + QUALITY_NAMES, default="auto",
+                        help="render quality tier, or auto to follow the measured frame time")
+    parser.add_argument("--metrics-file", help="write Prometheus metrics to this file at the end of each match")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on localhost:PORT/metrics")
+    parser.add_argument("--ai", nargs=2, choices=AI_TYPES, default=list(match_ai_types), metavar="TYPE",
+                        help=f"the two bots to pit against each other, sides drawn at random ({', '.join(AI_TYPES)})")
+    parser.add_argument("--render-scale", type=float, default=1.0,
+                        help="internal render resolution as a fraction of the window, e.g. 0.5 or 0.75")
+    parser.add_argument("--profile", type=int, metavar="TICKS",
+                        help="skip the menus, run TICKS uncapped frames under the sampling profiler and exit")
+    parser.add_argument("--profile-out", default="profile", metavar="PREFIX",
+                        help="write PREFIX.folded (collapsed stacks) and PREFIX.txt (summary)")
+    parser.add_argument("--profile-interval", type=float, default=1.0, help="sampling interval in ms")
+    parser.add_argument("--trace-alloc", metavar="FILE",
+                        help="trace allocations per frame phase, GC pauses and RSS; append a report to FILE "
+                             "at the end of each match")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    global left_ai_paddle, right_ai_paddle, ball, center_ball, left_score, right_score, last_hitter
+    global left_ai_reaction, right_ai_reaction, frame_capture, quality_governor, match_ai_types
+
+    args = parse_args(argv)
+    if args.policy_table:
+        load_minimax_policy(args.policy_table)
+    set_minimax_eval_mode(args.minimax_eval)
+    if "mcts" in args.ai and np is None:
+        raise SystemExit("--ai mcts needs numpy (pip install numpy)")
+    match_ai_types = tuple(args.ai)
+    configure_event_log(args.log_level, args.log_file, console=True)
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+    if args.quality == "auto":
+        quality_governor = QualityGovernor()
+    else:
+        set_render_quality(args.quality)
+    if not 0.1 <= args.render_scale <= 1.0:
+        raise SystemExit("--render-scale must be between 0.1 and 1.0")
+    set_render_scale(args.render_scale)
+    if args.capture:
+        if args.capture_format == "ffmpeg" and shutil.which("ffmpeg") is None:
+            raise SystemExit("--capture-format ffmpeg needs ffmpeg on PATH")
+        frame_capture = FrameCapture(args.capture, args.capture_format)
+
+    running = True
+    profiler = None
+
+    if args.profile:
+        # Straight into a match: no menus to wait on and no frame cap
+        reset_game_state()
+        profiler = SamplingProfiler(args.profile_interval / 1000)
+        profiler.start()
+    else:
+        # Show splash screen
+        splash_screen()
 
-# Show splash screen
-splash_screen()
+        # Show start screen
+        start_screen()
 
-# Show start screen
-start_screen()
+        # Show countdown
+        reset_game_state()
+        countdown_screen()
 
-# Show countdown
-reset_game_state()
-countdown_screen()
+    if args.trace_alloc:
+        start_alloc_trace()
+    start_time = time.time()
 
-start_time = time.time()
+    center_ball = Ball(SCREEN_WIDTH // 2, HEADER_HEIGHT + 20 + (SCREEN_HEIGHT - HEADER_HEIGHT) // 2)
+    center_ball.speed_x = 0
+    center_ball.speed_y = 5
 
-center_ball = Ball(SCREEN_WIDTH // 2, HEADER_HEIGHT + 20 + (SCREEN_HEIGHT - HEADER_HEIGHT) // 2)
-center_ball.speed_x = 0
-center_ball.speed_y = 5
+    rally_hits = 0
 
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_p:
-                pause_game()
-    
-    ball.move()
-    if ball.rect.top <= HEADER_HEIGHT or ball.rect.bottom >= SCREEN_HEIGHT:
-        ball.speed_y *= -1
-
-    if ball.rect.colliderect(left_ai_paddle.rect):
-        ball.speed_x *= -1
-        ball.toggle_fire_color()
-        if hit_sound:
-            hit_sound.play()
-        last_hitter = 'left'
-
-    if ball.rect.colliderect(right_ai_paddle.rect):
-        ball.speed_x *= -1
-        ball.toggle_fire_color()
-        if hit_sound:
-            hit_sound.play()
-        last_hitter = 'right'
-
-    if ball.rect.colliderect(center_ball.rect):
-        if last_hitter == 'left':
-            right_score += 1
-            if score_sound:
-                score_sound.play()
-            ball.reset()
-        elif last_hitter == 'right':
-            left_score += 1
-            if score_sound:
-                score_sound.play()
-            ball.reset()
-        else:
-            ball.speed_x *= -1
-            ball.speed_y *= -1
-        last_hitter = None
-
-    if ball.rect.left <= 0:
-        right_score += 1
-        if score_sound:
-            score_sound.play()
-        ball.reset()
-    elif ball.rect.right >= SCREEN_WIDTH:
-        left_score += 1
-        if score_sound:
-            score_sound.play()
-        ball.reset()
-    
-    left_ai_reaction, right_ai_reaction = auto_balance_difficulty(left_score, right_score)
-    
-    if left_ai_type == "minimax":
-        ai_move_minimax(left_ai_paddle, ball, right_ai_paddle, center_ball, 
-                       is_left_paddle=True, reaction_time=left_ai_reaction)
-    else:
-        ai_move_hybrid(left_ai_paddle, ball, right_ai_paddle, center_ball, 
-                      is_left_paddle=True, left_score=left_score, right_score=right_score,
-                      reaction_time=left_ai_reaction)
-    
-    if right_ai_type == "minimax":
-        ai_move_minimax(right_ai_paddle, ball, left_ai_paddle, center_ball, 
-                       is_left_paddle=False, reaction_time=right_ai_reaction)
-    else:
-        ai_move_hybrid(right_ai_paddle, ball, left_ai_paddle, center_ball, 
-                      is_left_paddle=False, left_score=left_score, right_score=right_score,
-                      reaction_time=right_ai_reaction)
-    
-    left_ai_paddle.update()
-    right_ai_paddle.update()
-    
-    draw_background()
-    
-    # Draw center ball with glow
-    center_ball.move_vertical_center()
-    glow_size = 20
-    glow_surface = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
-    glow_color = (*center_ball.fire_color, 80)
-    pygame.draw.circle(glow_surface, glow_color, (glow_size, glow_size), glow_size)
-    screen.blit(glow_surface, (center_ball.rect.centerx - glow_size, center_ball.rect.centery - glow_size))
-    pygame.draw.circle(screen, center_ball.fire_color, center_ball.rect.center, center_ball.rect.width // 2)
-    pygame.draw.circle(screen, WHITE, center_ball.rect.center, center_ball.rect.width // 4)
-    
-    # Draw paddles and ball
-    left_ai_paddle.draw()
-    right_ai_paddle.draw()
-    ball.draw()
-    
-    # Draw header with robots and progress bar  
-    elapsed = time.time() - start_time
-    draw_game_header(left_score, right_score, elapsed, MATCH_DURATION)
-    
-    pygame.display.flip()
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_p:
+                    pause_game()
+
+        frame_start = time.perf_counter()
+        trace_phase("physics")
+        events, last_hitter = advance_ball(ball, left_ai_paddle, right_ai_paddle, center_ball, last_hitter)
+        trace_phase("particles")
+        ball.update_effects()
+        trace_phase("events")
+        rally_hits = record_ball_metrics(events, rally_hits)
+        for kind, side in events:
+            if kind == 'hit':
+                log_event("hit", "debug", side=side)
+                if hit_sound:
+                    hit_sound.play()
+            elif kind == 'score':
+                if side == 'left':
+                    left_score += 1
+                else:
+                    right_score += 1
+                log_event("score", scorer=side, left=left_score, right=right_score)
+                if score_sound:
+                    score_sound.play()
+
+        left_ai_reaction, right_ai_reaction = auto_balance_difficulty(left_score, right_score)
+
+        trace_phase("ai_search")
+        ai_start = time.perf_counter()
+        ai_frame(left_ai_type, right_ai_type, left_ai_paddle, right_ai_paddle, ball, center_ball,
+                 left_score, right_score, left_ai_reaction, right_ai_reaction)
+        ai_latency_metric.observe(time.perf_counter() - ai_start)
+
+        trace_phase("physics")
+        left_ai_paddle.update()
+        right_ai_paddle.update()
+
+        trace_phase("draw_background")
+        draw_background()
 
-    clock.tick(60)
+        # Draw center ball with glow
+        trace_phase("arena")
+        draw_center_ball(center_ball)
 
-    if elapsed >= MATCH_DURATION:
-        choice = show_result_screen(left_score, right_score)
-        if choice == 'restart':
-            start_screen()
-            reset_game_state()
-            countdown_screen()
-            start_time = time.time()
-            continue
+        # Draw paddles and ball
+        left_ai_paddle.draw()
+        right_ai_paddle.draw()
+        ball.draw()
+
+        # Draw header with robots and progress bar  
+        trace_phase("header")
+        elapsed = time.time() - start_time
+        draw_game_header(left_score, right_score, elapsed, MATCH_DURATION)
+
+        trace_phase("display_flip")
+        present_scene()
+        if alloc_tracer:
+            alloc_tracer.end_frame()
+        if frame_capture:
+            frame_capture.capture(screen)
+        frame_time = time.perf_counter() - frame_start
+        frame_time_metric.observe(frame_time)
+        if quality_governor:
+            quality_governor.record(frame_time)
+
+        if profiler:
+            profiler.mark_tick()
+            if profiler.ticks >= args.profile:
+                running = False
         else:
-            running = False
+            clock.tick(60)
+
+        if elapsed >= MATCH_DURATION:
+            log_event("match_end", left=left_score, right=right_score,
+                      winner=match_winner(left_score, right_score), hybrid_switches=hybrid_switches,
+                      plan_cache_hit_rate=round(plan_cache_hit_rate(), 3), **mcts_summary())
+            matches_metric.inc(1, match_winner(left_score, right_score))
+            if args.metrics_file:
+                metrics.write(args.metrics_file)
+            if frame_capture:
+                log_event("capture", report=frame_capture.report())
+            if alloc_tracer:
+                finish_alloc_trace(args.trace_alloc, left_score, right_score)
+            if profiler:
+                reset_game_state()
+                if args.trace_alloc:
+                    start_alloc_trace()
+                start_time = time.time()
+                rally_hits = 0
+                continue
+            choice = show_result_screen(left_score, right_score)
+            if choice == 'restart':
+                start_screen()
+                reset_game_state()
+                countdown_screen()
+                if args.trace_alloc:
+                    start_alloc_trace()
+                start_time = time.time()
+                rally_hits = 0
+                continue
+            else:
+                running = False
+
+    if frame_capture:
+        log_event("capture", report=frame_capture.close())
+    if alloc_tracer:
+        finish_alloc_trace(args.trace_alloc, left_score, right_score)
+    if profiler:
+        profiler.stop()
+        print(profiler.report())
+        print("wrote {} and {}".format(*profiler.write(args.profile_out)))
+    event_log.close()
+    pygame.quit()
+    if profiler:
+        return
 
-pygame.quit()
+    try:
+        _ = show_result_screen(left_score, right_score)
+    except Exception:
+        pass
 
-try:
-    _ = show_result_screen(left_score, right_score)
-except Exception:
-    pass
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,304 @@
+"""Multi-ball stress mode: hundreds of balls, both paddles and the center ball.
+
+Balls bounce off the walls, the paddles, the center ball and each other.
+Candidate pairs come from a uniform-grid spatial hash (each body is listed
+in every cell its rect overlaps) instead of testing all pairs. Each AI
+plays the ball that threatens its goal first. The report compares the
+narrow-phase checks per tick with what all-pairs testing would need.
+
+Usage:
+    python multiball.py --balls 200                         # windowed, with the quality governor
+    python multiball.py --balls 500 --headless --ticks 1800 --broadphase naive
+"""
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+
+if "--headless" in sys.argv:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import main as game
+import headless
+
+TARGET_FPS = 60
+CELL_SIZE = 48  # two ball widths
+
+class SpatialHash:
+    """Uniform grid of cells `cell_size` pixels wide, rebuilt every tick"""
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.first_cells = {}
+
+    def rebuild(self, bodies):
+        self.cells = {}
+        self.first_cells = {}
+        size = self.cell_size
+        for body in bodies:
+            rect = body.rect
+            left, top = rect.left // size, rect.top // size
+            self.first_cells[id(body)] = (left, top)
+            for cx in range(left, (rect.right - 1) // size + 1):
+                for cy in range(top, (rect.bottom - 1) // size + 1):
+                    self.cells.setdefault((cx, cy), []).append(body)
+
+    def candidate_pairs(self):
+        """Each pair of bodies sharing a cell, once, as a list.
+
+        Bodies that share several cells are reported by the top-left cell of
+        their common cell range. That is worked out from the cell ranges
+        recorded by rebuild, not from the rects, which the collision pass
+        moves while it works through the pairs.
+        """
+        first_cells = self.first_cells
+        pairs = []
+        for (cx, cy), bodies in self.cells.items():
+            for i, a in enumerate(bodies):
+                a_x, a_y = first_cells[id(a)]
+                for b in bodies[i + 1:]:
+                    b_x, b_y = first_cells[id(b)]
+                    if max(a_x, b_x) == cx and max(a_y, b_y) == cy:
+                        pairs.append((a, b))
+        return pairs
+
+class AllPairs:
+    """The naive broadphase, for comparison"""
+    def rebuild(self, bodies):
+        self.bodies = list(bodies)
+
+    def candidate_pairs(self):
+        return list(itertools.combinations(self.bodies, 2))
+
+def random_ball():
+    ball = game.Ball(random.randint(80, game.SCREEN_WIDTH - 104),
+                     random.randint(game.HEADER_HEIGHT, game.SCREEN_HEIGHT - 24))
+    ball.speed_x = random.choice((-1, 1)) * random.randint(4, 8)
+    ball.speed_y = random.choice((-1, 1)) * random.randint(2, 8)
+    ball.last_hitter = None
+    return ball
+
+def most_threatening(balls, paddle, is_left_paddle):
+    """The approaching ball that reaches the paddle first, else the nearest one"""
+    face = paddle.rect.right if is_left_paddle else paddle.rect.left
+    best, best_frames = None, float('inf')
+    for ball in balls:
+        if ball.speed_x == 0 or (ball.speed_x < 0) != is_left_paddle:
+            continue
+        frames = abs(ball.rect.centerx - face) / abs(ball.speed_x)
+        if frames < best_frames:
+            best, best_frames = ball, frames
+    if best is None:
+        best = min(balls, key=lambda ball: abs(ball.rect.centerx - face))
+    return best
+
+class MultiBallMatch(headless.HeadlessMatch):
+    """HeadlessMatch with `count` balls and its own broadphase collision pass"""
+    def __init__(self, count, left_ai_type="minimax", right_ai_type="hybrid", duration=game.MATCH_DURATION,
+                 seed=None, broadphase="grid", cell_size=CELL_SIZE):
+        super().__init__(left_ai_type, right_ai_type, duration=duration, seed=seed)
+        self.balls = [random_ball() for _ in range(count)]
+        self.broadphase = SpatialHash(cell_size) if broadphase == "grid" else AllPairs()
+        self.targets = {}
+        self.checks = 0
+        self.collisions = 0
+        self.ticks = 0
+
+    def naive_checks(self):
+        # Every ball against every other ball, both paddles and the center ball
+        count = len(self.balls)
+        return count * (count - 1) // 2 + count * 3
+
+    def score(self, ball, scorer):
+        if scorer == 'left':
+            self.left_score += 1
+        else:
+            self.right_score += 1
+        game.goals_metric.inc(1, scorer)
+        ball.reset()
+        ball.last_hitter = None
+
+    def move_balls(self):
+        top, bottom = game.HEADER_HEIGHT, game.SCREEN_HEIGHT
+        for ball in self.balls:
+            rect = ball.rect
+            rect.x += ball.speed_x
+            rect.y += ball.speed_y
+            if rect.top <= top or rect.bottom >= bottom:
+                ball.speed_y = abs(ball.speed_y) if rect.top <= top else -abs(ball.speed_y)
+                rect.top = max(rect.top, top)
+                rect.bottom = min(rect.bottom, bottom)
+            if rect.left <= 0:
+                self.score(ball, 'right')
+            elif rect.right >= game.SCREEN_WIDTH:
+                self.score(ball, 'left')
+
+    def collide(self):
+        paddles = {id(self.left_paddle): 'left', id(self.right_paddle): 'right'}
+        self.broadphase.rebuild(itertools.chain(self.balls, (self.left_paddle, self.right_paddle, self.center_ball)))
+        # The pairs are all collected before any contact below moves a rect
+        for a, b in self.broadphase.candidate_pairs():
+            side_a, side_b = paddles.get(id(a)), paddles.get(id(b))
+            if (side_a or a is self.center_ball) and (side_b or b is self.center_ball):
+                continue  # paddles and the center ball never touch; count only pairs naive_checks counts
+            self.checks += 1
+            if not a.rect.colliderect(b.rect):
+                continue
+            self.collisions += 1
+            if side_a or side_b:
+                self.hit_paddle(b if side_a else a, side_a or side_b)
+            elif a is self.center_ball or b is self.center_ball:
+                self.hit_center(b if a is self.center_ball else a)
+            else:
+                self.hit_ball(a, b)
+
+    def hit_paddle(self, ball, side):
+        # Any contact sends the ball back toward the opponent, from in front of the paddle
+        paddle = self.left_paddle if side == 'left' else self.right_paddle
+        if side == 'left':
+            ball.speed_x = abs(ball.speed_x)
+            ball.rect.left = paddle.rect.right
+        else:
+            ball.speed_x = -abs(ball.speed_x)
+            ball.rect.right = paddle.rect.left
+        if ball.last_hitter != side:
+            ball.toggle_fire_color()
+            game.paddle_hits_metric.inc(1, side)
+        ball.last_hitter = side
+
+    def hit_center(self, ball):
+        if ball.last_hitter is None:
+            ball.speed_x *= -1
+            ball.speed_y *= -1
+        else:
+            self.score(ball, 'right' if ball.last_hitter == 'left' else 'left')
+
+    def hit_ball(self, a, b):
+        """Equal masses: swap the velocity component along the axis of least overlap, then separate"""
+        dx = b.rect.centerx - a.rect.centerx
+        dy = b.rect.centery - a.rect.centery
+        if abs(dx) >= abs(dy):
+            if (b.speed_x - a.speed_x) * dx < 0:
+                a.speed_x, b.speed_x = b.speed_x, a.speed_x
+            push = (a.rect.width - abs(dx) + 1) // 2
+            a.rect.x -= push if dx >= 0 else -push
+            b.rect.x += push if dx >= 0 else -push
+        else:
+            if (b.speed_y - a.speed_y) * dy < 0:
+                a.speed_y, b.speed_y = b.speed_y, a.speed_y
+            push = (a.rect.height - abs(dy) + 1) // 2
+            a.rect.y -= push if dy >= 0 else -push
+            b.rect.y += push if dy >= 0 else -push
+
+    def decide(self):
+        left_reaction, right_reaction = game.auto_balance_difficulty(self.left_score, self.right_score)
+        turns = []
+        for ai_type, paddle, opponent, is_left, reaction in (
+                (self.left_ai_type, self.left_paddle, self.right_paddle, True, left_reaction),
+                (self.right_ai_type, self.right_paddle, self.left_paddle, False, right_reaction)):
+            target = most_threatening(self.balls, paddle, is_left)
+            if self.targets.get(is_left) is not target:
+                # Plans and trees were made for another ball
+                paddle.hybrid_plan = None
+                paddle.mcts_tree = None
+                self.targets[is_left] = target
+            turns.append((ai_type, paddle, target, opponent, is_left, reaction))
+
+        start = time.perf_counter()
+        if game.minimax_eval_mode == "batched":
+            game.prefetch_minimax([(target, paddle, opponent, self.center_ball, is_left, game.DEFAULT_AI_PARAMS)
+                                   for ai_type, paddle, target, opponent, is_left, _ in turns
+                                   if game.needs_minimax_search(ai_type, paddle, target, is_left,
+                                                                self.left_score, self.right_score)])
+        for ai_type, paddle, target, opponent, is_left, reaction in turns:
+            game.ai_turn(ai_type, paddle, target, opponent, self.center_ball, is_left,
+                         self.left_score, self.right_score, reaction)
+        game.ai_latency_metric.observe(time.perf_counter() - start)
+        self.decisions += 1
+
+    def step(self, effects=False):
+        self.move_balls()
+        self.collide()
+        self.center_ball.move_vertical_center()
+        self.decide()
+        if effects:
+            for ball in self.balls:
+                ball.update_effects()
+            self.left_paddle.update()
+            self.right_paddle.update()
+        else:
+            self.left_paddle.advance()
+            self.right_paddle.advance()
+        self.tick += 1
+        self.ticks += 1
+
+    def draw(self, view):
+        game.draw_background(view, animate=False)
+        game.draw_center_ball(self.center_ball, view)
+        self.left_paddle.draw(view)
+        self.right_paddle.draw(view)
+        for ball in self.balls:
+            ball.draw(view)
+        game.draw_game_header(self.left_score, self.right_score, self.tick / game.TICKS_PER_SECOND,
+                              self.total_ticks / game.TICKS_PER_SECOND, view)
+
+    def report(self, elapsed):
+        ticks = max(1, self.ticks)
+        checks = self.checks / ticks
+        naive = self.naive_checks()
+        return (f"{len(self.balls)} balls, {self.ticks} ticks in {elapsed:.2f}s ({self.ticks / elapsed:.0f} ticks/s) | "
+                f"{checks:,.0f} checks/tick vs {naive:,} all-pairs ({checks / naive:.1%}) | "
+                f"{self.collisions / ticks:.1f} contacts/tick | score {self.left_score}-{self.right_score}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress the AIs, physics and renderer with many balls")
+    parser.add_argument("--balls", type=int, default=100)
+    parser.add_argument("--broadphase", choices=["grid", "naive"], default="grid")
+    parser.add_argument("--cell-size", type=int, default=CELL_SIZE, help="spatial hash cell size in pixels")
+    parser.add_argument("--left", choices=game.AI_TYPES, default="minimax", help="left AI type")
+    parser.add_argument("--right", choices=game.AI_TYPES, default="hybrid", help="right AI type")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duration", type=float, default=game.MATCH_DURATION, help="match length in seconds")
+    parser.add_argument("--headless", action="store_true", help="no window; run as fast as possible")
+    parser.add_argument("--ticks", type=int, help="stop after this many ticks (headless)")
+    args = parser.parse_args()
+
+    match = MultiBallMatch(args.balls, args.left, args.right, duration=args.duration, seed=args.seed,
+                           broadphase=args.broadphase, cell_size=args.cell_size)
+    start = time.perf_counter()
+    if args.headless:
+        limit = args.ticks or match.total_ticks
+        while match.ticks < limit and not match.finished():
+            match.step()
+        print(match.report(time.perf_counter() - start))
+        return
+
+    pygame.display.set_caption("AI Battle Arena - Multi-ball")
+    governor = game.QualityGovernor(TARGET_FPS)
+    clock = pygame.time.Clock()
+    running = True
+    while running and not match.finished():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+        frame_start = time.perf_counter()
+        match.step(effects=True)
+        game.update_background_particles()
+        match.draw(game.main_view)
+        game.present_scene()
+        governor.record(time.perf_counter() - frame_start)
+        if match.ticks % TARGET_FPS == 0:
+            pygame.display.set_caption(f"AI Battle Arena - Multi-ball | {clock.get_fps():.0f} FPS | "
+                                       f"{match.checks / match.ticks:,.0f} checks/tick vs "
+                                       f"{match.naive_checks():,} all-pairs | quality {game.render_quality['name']}")
+        clock.tick(TARGET_FPS)
+    print(match.report(time.perf_counter() - start))
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
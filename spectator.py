@@ -0,0 +1,118 @@
+"""Spectator wall: many live AI matches in one window.
+
+Each arena is a HeadlessMatch stepped like the main loop and drawn into
+its own tile of the window through a Viewport, so all arenas share the
+cached sprites and fonts. Effect detail follows the tile size, and the
+game's QualityGovernor steps the render quality tier down (and back up)
+to keep the wall at 60 FPS.
+
+Usage:
+    python spectator.py --arenas 9 --size 1920x1080
+"""
+import argparse
+import math
+import time
+
+import pygame
+
+import main as game
+import headless
+
+TARGET_FPS = 60
+
+class Arena(headless.HeadlessMatch):
+    """A match stepped frame by frame with the effects the window shows"""
+    def __init__(self, view, duration):
+        left_ai_type, right_ai_type, _, _ = game.randomize_ai_roles()
+        super().__init__(left_ai_type, right_ai_type, duration=duration)
+        self.view = view
+        self.duration = duration
+
+    def step(self):
+        self.move_ball()
+        self.ball.update_effects(particles=self.view.detail == game.DETAIL_FULL)
+        self.decide()
+        self.left_paddle.update()
+        self.right_paddle.update()
+        self.tick += 1
+        self.iterations += 1
+
+    def draw(self):
+        view = self.view
+        game.draw_background(view, animate=False)
+        game.draw_center_ball(self.center_ball, view)
+        self.left_paddle.draw(view)
+        self.right_paddle.draw(view)
+        self.ball.draw(view)
+        game.draw_game_header(self.left_score, self.right_score, self.tick / game.TICKS_PER_SECOND,
+                              self.duration, view)
+
+def grid_views(window, count):
+    """One Viewport per arena, laid out in a near-square grid at the arena's aspect ratio"""
+    width, height = window.get_size()
+    cols = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / cols)
+    cell_w, cell_h = width // cols, height // rows
+    scale = min(cell_w / game.SCREEN_WIDTH, cell_h / game.SCREEN_HEIGHT)
+    tile_w, tile_h = int(game.SCREEN_WIDTH * scale), int(game.SCREEN_HEIGHT * scale)
+    views = []
+    for n in range(count):
+        col, row = n % cols, n // cols
+        x = col * cell_w + (cell_w - tile_w) // 2
+        y = row * cell_h + (cell_h - tile_h) // 2
+        views.append(game.Viewport(window.subsurface((x, y, tile_w, tile_h)), scale))
+    return views
+
+def main():
+    parser = argparse.ArgumentParser(description="Show several AI matches at once")
+    parser.add_argument("--arenas", type=int, default=4, choices=range(4, 17), metavar="4-16")
+    parser.add_argument("--size", default="1600x900", help="window size, WIDTHxHEIGHT")
+    parser.add_argument("--fullscreen", action="store_true")
+    parser.add_argument("--duration", type=float, default=game.MATCH_DURATION, help="match length in seconds")
+    parser.add_argument("--policy-table", help="minimax policy table from build_policy_table.py")
+    args = parser.parse_args()
+    if args.policy_table:
+        game.load_minimax_policy(args.policy_table)
+
+    if args.fullscreen:
+        window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    else:
+        width, height = (int(v) for v in args.size.lower().split("x"))
+        window = pygame.display.set_mode((width, height))
+    pygame.display.set_caption("AI Battle Arena - Spectator")
+
+    views = grid_views(window, args.arenas)
+    arenas = [Arena(view, args.duration) for view in views]
+    governor = game.QualityGovernor(TARGET_FPS)
+    clock = pygame.time.Clock()
+    frames = 0
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+
+        start = time.perf_counter()
+        window.fill(game.DARK_BG)
+        game.update_background_particles()
+        for n, arena in enumerate(arenas):
+            if arena.finished():
+                game.log_event("match_end", arena=n, left=arena.left_score, right=arena.right_score,
+                               winner=game.match_winner(arena.left_score, arena.right_score))
+                arena = arenas[n] = Arena(arena.view, args.duration)
+            arena.step()
+            arena.draw()
+        pygame.display.flip()
+        governor.record(time.perf_counter() - start)
+
+        frames += 1
+        if frames % TARGET_FPS == 0:
+            pygame.display.set_caption(f"AI Battle Arena - Spectator | {clock.get_fps():.0f} FPS | "
+                                       f"quality {game.render_quality['name']}")
+        clock.tick(TARGET_FPS)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""Simulation and rendering in separate processes, over shared memory.
+
+The simulation process owns the match and both AIs. It publishes every
+tick into a ring of fixed-layout slots in a shared-memory block. Renderer
+processes attach to the block by name, read the newest complete tick and
+draw it. The AIs and the drawing each get a core of their own, and any
+number of renderers can watch one simulation.
+
+Each slot is guarded by a sequence counter (a seqlock). The writer makes
+the counter odd, writes the payload, then makes it even again. A reader
+accepts a slot only if it saw the same even counter before and after
+copying the payload. The writer never waits for readers.
+
+Usage:
+    python split.py run --renderers 2 --ai mcts hybrid    # one simulation, two windows
+    python split.py --name arena sim                      # or start the pieces yourself
+    python split.py --name arena render --size 800x560
+"""
+import argparse
+import os
+import signal
+import struct
+import subprocess
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+def subcommand(argv):
+    """The subcommand main() will parse from argv, before main's module is imported"""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--name")
+    parser.add_argument("command", nargs="?")
+    return parser.parse_known_args(argv)[0].command
+
+# The simulation never opens a window
+if subcommand(sys.argv[1:]) == "sim":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import main as game
+import headless
+from spectator import grid_views
+
+RING_NAME = "pong_arena"
+RING_SLOTS = 8
+RING_MAGIC = b'PGRB'
+RING_VERSION = 1
+TARGET_FPS = 60
+
+# magic, version, slot count, slot size, then the sequence number of the
+# newest complete tick on its own 8-byte boundary
+RING_HEADER = struct.Struct('<4sHHI4xQ')
+LATEST_OFFSET = 16
+SEQUENCE = struct.Struct('<Q')
+STATE_FIELDS = ("match", "tick", "total_ticks", "left_ai", "right_ai", "left_score", "right_score",
+                "ball_x", "ball_y", "ball_speed_x", "ball_speed_y", "fire_color",
+                "left_y", "right_y", "left_target", "right_target", "left_glow", "right_glow", "center_y")
+STATE = struct.Struct('<IIIBBHH hhhhB hhhhBB h')
+# Sequence counter, payload, padded so every counter stays 8-byte aligned
+SLOT_SIZE = (SEQUENCE.size + STATE.size + 7) // 8 * 8
+
+class StateRing:
+    """Shared-memory ring of published ticks; create=True for the writer"""
+    def __init__(self, name=RING_NAME, create=False, slots=RING_SLOTS):
+        if create:
+            size = RING_HEADER.size + slots * SLOT_SIZE
+            try:
+                self.memory = shared_memory.SharedMemory(name, create=True, size=size)
+            except FileExistsError:
+                # Left behind by a simulation that did not exit cleanly
+                stale = shared_memory.SharedMemory(name)
+                stale.close()
+                stale.unlink()
+                self.memory = shared_memory.SharedMemory(name, create=True, size=size)
+            RING_HEADER.pack_into(self.memory.buf, 0, RING_MAGIC, RING_VERSION, slots, SLOT_SIZE, 0)
+        else:
+            self.memory = shared_memory.SharedMemory(name)
+            # Readers must not unlink the block when they exit; only its creator does
+            resource_tracker.unregister(self.memory._name, "shared_memory")
+            magic, version, slots, slot_size, _ = RING_HEADER.unpack_from(self.memory.buf, 0)
+            if magic != RING_MAGIC or version != RING_VERSION or slot_size != SLOT_SIZE:
+                self.memory.close()
+                raise ValueError(f"{name} is not a state ring from this version")
+        self.owner = create
+        self.slots = slots
+        self.buf = self.memory.buf
+        self.sequence = 0
+
+    def _slot_offset(self, sequence):
+        return RING_HEADER.size + (sequence % self.slots) * SLOT_SIZE
+
+    def publish(self, values):
+        """Write one tick (a tuple in STATE_FIELDS order) and make it the newest"""
+        self.sequence += 1
+        offset = self._slot_offset(self.sequence)
+        SEQUENCE.pack_into(self.buf, offset, 2 * self.sequence - 1)  # odd: being written
+        STATE.pack_into(self.buf, offset + SEQUENCE.size, *values)
+        SEQUENCE.pack_into(self.buf, offset, 2 * self.sequence)
+        SEQUENCE.pack_into(self.buf, LATEST_OFFSET, self.sequence)
+
+    def latest(self, retries=4):
+        """(sequence, state dict) of the newest complete tick, or None before the first one"""
+        for _ in range(retries):
+            sequence, = SEQUENCE.unpack_from(self.buf, LATEST_OFFSET)
+            if sequence == 0:
+                return None
+            offset = self._slot_offset(sequence)
+            before, = SEQUENCE.unpack_from(self.buf, offset)
+            values = STATE.unpack_from(self.buf, offset + SEQUENCE.size)
+            after, = SEQUENCE.unpack_from(self.buf, offset)
+            if before == after == 2 * sequence:
+                return sequence, dict(zip(STATE_FIELDS, values))
+        return None  # lapped by the writer every time; the caller keeps its last frame
+
+    def close(self):
+        self.buf = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+def match_state(match, number):
+    ball = match.ball
+    left, right = match.left_paddle, match.right_paddle
+    return (number, match.tick, match.total_ticks,
+            game.AI_TYPES.index(match.left_ai_type), game.AI_TYPES.index(match.right_ai_type),
+            match.left_score, match.right_score,
+            ball.rect.x, ball.rect.y, ball.speed_x, ball.speed_y, game.FIRE_COLORS.index(ball.fire_color),
+            left.rect.y, right.rect.y, left.target_y, right.target_y, left.glow_intensity, right.glow_intensity,
+            match.center_ball.rect.y)
+
+def simulate(ring, duration):
+    """Play matches in real time, publishing every tick, until interrupted"""
+    number = 0
+    while True:
+        left_ai_type, right_ai_type, _, _ = game.randomize_ai_roles()
+        match = headless.HeadlessMatch(left_ai_type, right_ai_type, duration=duration)
+        mcts_start = dict(game.mcts_stats)
+        busy = 0.0
+        start = next_tick = time.perf_counter()
+        while not match.finished():
+            tick_start = time.perf_counter()
+            match.step()
+            ring.publish(match_state(match, number))
+            busy += time.perf_counter() - tick_start
+            next_tick += 1 / game.TICKS_PER_SECOND
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -0.25:
+                next_tick = time.perf_counter()  # fell behind; carry on instead of racing to catch up
+        game.log_event("match_end", match=number, left=match.left_score, right=match.right_score,
+                       winner=game.match_winner(match.left_score, match.right_score),
+                       sim_load=round(busy / (time.perf_counter() - start), 3), **game.mcts_summary(mcts_start))
+        number += 1
+
+class MirrorArena:
+    """Game objects following the published ticks, drawn like the main loop"""
+    def __init__(self, view):
+        self.view = view
+        self.left_paddle = game.Paddle(40, 0, game.NEON_PURPLE)
+        self.right_paddle = game.Paddle(game.SCREEN_WIDTH - 64, 0, game.NEON_CYAN)
+        self.ball = game.Ball(game.SCREEN_WIDTH // 2, headless.ARENA_CENTER_Y)
+        self.center_ball = game.Ball(game.SCREEN_WIDTH // 2, headless.ARENA_CENTER_Y)
+        self.match = None
+        self.state = None
+
+    def apply(self, state):
+        previous = self.state
+        self.state = state
+        ball = self.ball
+        if state["match"] != self.match:
+            self.match = state["match"]
+            previous = None
+            left_color, right_color = game.ai_colors(game.AI_TYPES[state["left_ai"]],
+                                                     game.AI_TYPES[state["right_ai"]])
+            self.left_paddle.color, self.right_paddle.color = left_color, right_color
+            self.left_paddle.movement_trail.clear()
+            self.right_paddle.movement_trail.clear()
+            ball.trail.clear()
+
+        scored = previous is not None and ((previous["left_score"], previous["right_score"])
+                                           != (state["left_score"], state["right_score"]))
+        if scored:
+            # The ball was served again; do not draw a trail across the court
+            ball.trail.clear()
+            ball.particles.clear()
+            if game.score_sound:
+                game.score_sound.play()
+        elif previous is not None and previous["fire_color"] != state["fire_color"] and game.hit_sound:
+            game.hit_sound.play()
+
+        ball.rect.x, ball.rect.y = state["ball_x"], state["ball_y"]
+        ball.speed_x, ball.speed_y = state["ball_speed_x"], state["ball_speed_y"]
+        ball.fire_color = game.FIRE_COLORS[state["fire_color"]]
+        self.center_ball.rect.y = state["center_y"]
+        for paddle, side in ((self.left_paddle, "left"), (self.right_paddle, "right")):
+            paddle.rect.y = state[f"{side}_y"]
+            paddle.target_y = state[f"{side}_target"]
+            paddle.glow_intensity = state[f"{side}_glow"]
+            paddle.movement_trail.push(paddle.rect.x, paddle.rect.centery, paddle.glow_intensity)
+        ball.update_effects(particles=self.view.detail == game.DETAIL_FULL)
+
+    def draw(self):
+        view = self.view
+        state = self.state
+        game.draw_background(view, animate=False)
+        game.draw_center_ball(self.center_ball, view)
+        self.left_paddle.draw(view)
+        self.right_paddle.draw(view)
+        self.ball.draw(view)
+        game.draw_game_header(state["left_score"], state["right_score"], state["tick"] / game.TICKS_PER_SECOND,
+                              state["total_ticks"] / game.TICKS_PER_SECOND, view)
+
+def render(ring, window):
+    """Draw the newest tick whenever one arrives, until the window is closed"""
+    arena = MirrorArena(grid_views(window, 1)[0])
+    governor = game.QualityGovernor(TARGET_FPS)
+    clock = pygame.time.Clock()
+    shown = 0
+    frames = 0
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+
+        latest = ring.latest()
+        if latest is not None and latest[0] != shown:
+            skipped = latest[0] - shown - 1 if shown else 0
+            shown = latest[0]
+            start = time.perf_counter()
+            arena.apply(latest[1])
+            window.fill(game.DARK_BG)
+            game.update_background_particles()
+            arena.draw()
+            pygame.display.flip()
+            governor.record(time.perf_counter() - start)
+            frames += 1
+            if frames % TARGET_FPS == 0:
+                pygame.display.set_caption(f"AI Battle Arena - Renderer | {clock.get_fps():.0f} FPS | "
+                                           f"tick {latest[1]['tick']} | {skipped} skipped | "
+                                           f"quality {game.render_quality['name']}")
+        clock.tick(TARGET_FPS)
+
+def open_window(size, fullscreen):
+    if fullscreen:
+        return pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    width, height = (int(v) for v in size.lower().split("x"))
+    return pygame.display.set_mode((width, height))
+
+def attach(name, timeout=10.0):
+    """Wait for the simulation to create the ring, then attach to it"""
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            return StateRing(name)
+        except FileNotFoundError:
+            if time.perf_counter() > deadline:
+                raise SystemExit(f"No simulation is publishing to {name}")
+            time.sleep(0.1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the simulation and the renderers as separate processes")
+    parser.add_argument("--name", default=RING_NAME, help="shared-memory block name")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sim = commands.add_parser("sim", help="simulate matches and publish every tick")
+    renderer = commands.add_parser("render", help="draw the ticks a simulation publishes")
+    run = commands.add_parser("run", help="start a simulation and renderers for it")
+    for command in (sim, run):
+        command.add_argument("--ai", nargs=2, choices=game.AI_TYPES, default=list(game.match_ai_types),
+                             metavar="TYPE", help=f"the two bots ({', '.join(game.AI_TYPES)})")
+        command.add_argument("--duration", type=float, default=game.MATCH_DURATION, help="match length in seconds")
+        command.add_argument("--policy-table", help="minimax policy table from build_policy_table.py")
+        command.add_argument("--minimax-eval", choices=["tree", "batched"], help="minimax leaf evaluation mode")
+    for command in (renderer, run):
+        command.add_argument("--size", default=f"{game.SCREEN_WIDTH}x{game.SCREEN_HEIGHT}",
+                             help="window size, WIDTHxHEIGHT")
+        command.add_argument("--fullscreen", action="store_true")
+    run.add_argument("--renderers", type=int, default=1, help="renderer processes (windows) to start")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        script = os.path.abspath(__file__)
+        sim_command = [sys.executable, script, "--name", args.name, "sim", "--ai", *args.ai,
+                       "--duration", str(args.duration)]
+        if args.policy_table:
+            sim_command += ["--policy-table", args.policy_table]
+        if args.minimax_eval:
+            sim_command += ["--minimax-eval", args.minimax_eval]
+        render_command = [sys.executable, script, "--name", args.name, "render", "--size", args.size]
+        if args.fullscreen:
+            render_command.append("--fullscreen")
+        simulation = subprocess.Popen(sim_command, env={**os.environ, "SDL_VIDEODRIVER": "dummy",
+                                                        "SDL_AUDIODRIVER": "dummy"})
+        renderers = [subprocess.Popen(render_command) for _ in range(args.renderers)]
+        try:
+            for process in renderers:
+                process.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            # SIGINT lets the simulation unlink the shared memory on its way out
+            simulation.send_signal(signal.SIGINT)
+            try:
+                simulation.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                simulation.terminate()
+                simulation.wait()
+        return
+
+    if args.command == "sim":
+        if "mcts" in args.ai and game.np is None:
+            raise SystemExit("--ai mcts needs numpy (pip install numpy)")
+        game.match_ai_types = tuple(args.ai)
+        if args.policy_table:
+            game.load_minimax_policy(args.policy_table)
+        game.set_minimax_eval_mode(args.minimax_eval)
+        game.configure_event_log(console=True)
+        ring = StateRing(args.name, create=True)
+        print(f"Publishing to shared memory {args.name!r} ({ring.slots} slots of {SLOT_SIZE} bytes)")
+        try:
+            simulate(ring, args.duration)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            ring.close()
+    else:
+        window = open_window(args.size, args.fullscreen)
+        pygame.display.set_caption("AI Battle Arena - Renderer")
+        ring = attach(args.name)
+        try:
+            render(ring, window)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            ring.close()
+            pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Parallel parameter sweep over the AI's tunable constants.
+
+Every candidate configuration overrides some of main.DEFAULT_AI_PARAMS and
+plays a batch of headless matches against the default bot. Each seed is
+played twice with the sides swapped, and every configuration uses the same
+seeds, so differences between rows come from the parameters rather than
+from luck of the draw. Matches are spread over worker processes and the
+results are written to a CSV with a 95% confidence interval on the win rate.
+
+Usage:
+    python sweep.py --grid center_penalty=10,30,50 --grid base_reaction=0.02,0.05 --workers 8
+    python sweep.py --random 40 --range my_distance_weight=0.2:1.0 --range intercept_bonus=0:40
+"""
+import argparse
+import csv
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import main as game
+import headless
+
+Z_95 = 1.96
+
+def wilson_interval(successes, trials, z=Z_95):
+    """Wilson score interval for a proportion"""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    spread = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - spread), min(1.0, center + spread)
+
+def parse_value(text):
+    value = float(text)
+    return int(value) if value.is_integer() and "." not in text else value
+
+def parse_assignment(text):
+    key, sep, values = text.partition("=")
+    if not sep or key not in game.DEFAULT_AI_PARAMS:
+        raise argparse.ArgumentTypeError(
+            f"expected KEY=VALUES with KEY one of: {', '.join(game.DEFAULT_AI_PARAMS)}")
+    return key, values
+
+def grid_configs(grid):
+    """Cartesian product of --grid key=v1,v2,... options"""
+    keys = [key for key, _ in grid]
+    choices = [[parse_value(v) for v in values.split(",")] for _, values in grid]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*choices)]
+
+def random_configs(count, ranges, seed):
+    """`count` uniform samples from the --range key=lo:hi boxes"""
+    rng = random.Random(seed)
+    bounds = [(key, *map(float, values.split(":"))) for key, values in ranges]
+    return [{key: round(rng.uniform(low, high), 4) for key, low, high in bounds} for _ in range(count)]
+
+def run_pairing(job):
+    """Play one seed from both sides; returns (config index, candidate points, [W, D, L])"""
+    index, overrides, seed, options = job
+    candidate = game.ai_params(**overrides)
+    record = [0, 0, 0]
+    points = 0
+    for candidate_left in (True, False):
+        left, right = (candidate, None) if candidate_left else (None, candidate)
+        result = headless.play_match(options["candidate_ai"] if candidate_left else options["opponent_ai"],
+                                     options["opponent_ai"] if candidate_left else options["candidate_ai"],
+                                     seed=seed, duration=options["duration"],
+                                     decision_interval=options["decision_interval"],
+                                     left_params=left, right_params=right)
+        own, other = ((result["left_score"], result["right_score"]) if candidate_left
+                      else (result["right_score"], result["left_score"]))
+        points += own
+        record[0 if own > other else 1 if own == other else 2] += 1
+    return index, points, record
+
+def summarize(overrides, points, record):
+    wins, draws, losses = record
+    matches = wins + draws + losses
+    win_rate = (wins + 0.5 * draws) / matches if matches else 0.0
+    low, high = wilson_interval(wins + 0.5 * draws, matches)
+    row = {key: overrides.get(key, "") for key in game.DEFAULT_AI_PARAMS}
+    row.update({
+        "matches": matches,
+        "wins": wins,
+        "draws": draws,
+        "losses": losses,
+        "win_rate": round(win_rate, 4),
+        "ci_low": round(low, 4),
+        "ci_high": round(high, 4),
+        "points_per_match": round(points / matches, 3) if matches else 0.0,
+    })
+    return row
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep AI parameters against the default bot")
+    parser.add_argument("--grid", action="append", type=parse_assignment, default=[],
+                        metavar="KEY=V1,V2", help="values to try for one parameter (repeatable)")
+    parser.add_argument("--random", type=int, metavar="N", help="sample N configurations from --range boxes")
+    parser.add_argument("--range", action="append", type=parse_assignment, default=[],
+                        metavar="KEY=LO:HI", help="sampling range for --random (repeatable)")
+    parser.add_argument("--matches-per-config", type=int, default=10,
+                        help="matches per configuration, rounded up to an even number")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--duration", type=float, default=game.MATCH_DURATION, help="match length in seconds")
+    parser.add_argument("--decision-interval", type=int, default=1,
+                        help="frames between AI decisions; above 1 is faster but no longer the 60 Hz game")
+    parser.add_argument("--candidate-ai", choices=game.AI_TYPES, default="hybrid")
+    parser.add_argument("--opponent-ai", choices=game.AI_TYPES, default="hybrid")
+    parser.add_argument("--output", default="sweep_results.csv")
+    args = parser.parse_args()
+
+    if args.random:
+        if not args.range:
+            parser.error("--random needs at least one --range")
+        configs = random_configs(args.random, args.range, args.seed)
+    elif args.grid:
+        configs = grid_configs(args.grid)
+    else:
+        parser.error("give --grid or --random")
+    configs.insert(0, {})  # the baseline against itself, as a sanity row
+
+    options = {
+        "candidate_ai": args.candidate_ai,
+        "opponent_ai": args.opponent_ai,
+        "duration": args.duration,
+        "decision_interval": args.decision_interval,
+    }
+    pairings = max(1, (args.matches_per_config + 1) // 2)
+    jobs = [(index, overrides, args.seed + n, options)
+            for index, overrides in enumerate(configs)
+            for n in range(pairings)]
+
+    points = [0] * len(configs)
+    records = [[0, 0, 0] for _ in configs]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers) as pool:
+        futures = [pool.submit(run_pairing, job) for job in jobs]
+        for done, future in enumerate(as_completed(futures), 1):
+            index, config_points, record = future.result()
+            points[index] += config_points
+            records[index] = [a + b for a, b in zip(records[index], record)]
+            print(f"\r{done}/{len(jobs)} pairings", end="", flush=True)
+    print()
+
+    rows = [summarize(overrides, points[i], records[i]) for i, overrides in enumerate(configs)]
+    with open(args.output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(configs)} configurations, {len(jobs) * 2} matches in {elapsed:.1f}s -> {args.output}")
+    best = max(rows[1:], key=lambda row: row["ci_low"])
+    tuned = {key: best[key] for key in game.DEFAULT_AI_PARAMS if best[key] != ""}
+    print(f"Best lower bound: {tuned} win rate {best['win_rate']:.1%} "
+          f"[{best['ci_low']:.1%}, {best['ci_high']:.1%}]")
+
+if __name__ == "__main__":
+    main()
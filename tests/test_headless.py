@@ -0,0 +1,10 @@
+import pytest
+
+import headless
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("left, right", [("minimax", "hybrid"), ("hybrid", "minimax")])
+def test_event_engine_matches_fixed_engine_at_interval_one(left, right, seed):
+    fixed = headless.play_match(left, right, seed=seed, duration=90, engine="fixed")
+    event = headless.play_match(left, right, seed=seed, duration=90, engine="event", decision_interval=1)
+    assert event == fixed
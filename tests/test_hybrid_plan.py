@@ -0,0 +1,28 @@
+import pytest
+
+import main as game
+import headless
+
+@pytest.mark.parametrize("seed", range(3))
+def test_plan_hits_pick_the_strategy_a_fresh_decision_would(seed, monkeypatch):
+    ai_move_hybrid = game.ai_move_hybrid
+    checked = []
+
+    def checked_move(ai_paddle, ball, opponent_paddle, center_ball, is_left_paddle, left_score, right_score,
+                     reaction_time=0.05, params=game.DEFAULT_AI_PARAMS):
+        plan = ai_paddle.hybrid_plan
+        bucket = game.score_pressure_bucket(game.calculate_score_pressure(left_score, right_score, is_left_paddle))
+        if plan is not None and plan.covers(ball, bucket):
+            assert plan.strategy == game.enhanced_hybrid_decision(ball, ai_paddle, is_left_paddle,
+                                                                  left_score, right_score, params)
+            # Same trajectory, so the same crossing point as when the plan was made
+            ball_approaching = (ball.speed_x < 0) == is_left_paddle
+            target_x = ai_paddle.rect.centerx if ball_approaching else opponent_paddle.rect.centerx
+            assert abs(plan.target_y - game.predict_ball_y(ball, target_x)) <= 1
+            checked.append(plan)
+        ai_move_hybrid(ai_paddle, ball, opponent_paddle, center_ball, is_left_paddle, left_score, right_score,
+                       reaction_time, params)
+
+    monkeypatch.setattr(game, "ai_move_hybrid", checked_move)
+    headless.HeadlessMatch("hybrid", "hybrid", duration=60, seed=seed).run()
+    assert len(checked) > 1000
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+import main as game
+
+pytestmark = pytest.mark.skipif(game.np is None, reason="minimax_batch needs numpy")
+
+def random_search(rng):
+    is_left_paddle = rng.random() < 0.5
+    ball = game.Ball(rng.randint(0, game.SCREEN_WIDTH - 24), rng.randint(game.HEADER_HEIGHT, game.SCREEN_HEIGHT - 24))
+    ball.speed_x = rng.choice((-1, 1)) * rng.randint(3, 12)
+    ball.speed_y = rng.choice((-1, 1)) * rng.randint(1, 12)
+    paddle = game.Paddle(40 if is_left_paddle else game.SCREEN_WIDTH - 64, rng.randint(0, game.SCREEN_HEIGHT - 120),
+                         game.WHITE)
+    opponent = game.Paddle(game.SCREEN_WIDTH - 64 if is_left_paddle else 40, rng.randint(0, game.SCREEN_HEIGHT - 120),
+                           game.WHITE)
+    center_ball = None
+    if rng.random() < 0.8:
+        center_ball = game.Ball(game.SCREEN_WIDTH // 2, rng.randint(game.HEADER_HEIGHT, game.SCREEN_HEIGHT - 24))
+    params = game.DEFAULT_AI_PARAMS
+    if rng.random() < 0.3:
+        params = dict(params, center_penalty=rng.choice((0, 10, 60)), edge_penalty=rng.choice((0, 20, 80)))
+    return ball, paddle, opponent, center_ball, is_left_paddle, params
+
+def tree_move(ball, paddle, opponent, center_ball, is_left_paddle, params):
+    _, move = game.minimax_alpha_beta(ball, paddle, opponent, center_ball, depth=4, alpha=float('-inf'),
+                                      beta=float('inf'), maximizing=True, is_left_paddle=is_left_paddle, params=params)
+    return move
+
+@pytest.mark.parametrize("seed", range(4))
+def test_batch_matches_tree_search(seed):
+    rng = random.Random(seed)
+    searches = [random_search(rng) for _ in range(500)]
+    assert game.minimax_batch(searches) == [tree_move(*search) for search in searches]
+
+def test_batch_of_one_matches_tree_search_at_the_walls():
+    rng = random.Random(7)
+    for paddle_y in (0, 1, 5, 10, 11, game.SCREEN_HEIGHT - 131, game.SCREEN_HEIGHT - 120):
+        ball, paddle, opponent, center_ball, is_left_paddle, params = random_search(rng)
+        paddle.rect.y = paddle_y
+        search = (ball, paddle, opponent, center_ball, is_left_paddle, params)
+        assert game.minimax_batch([search]) == [tree_move(*search)], paddle_y
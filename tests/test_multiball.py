@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+import main as game
+from multiball import AllPairs, MultiBallMatch, SpatialHash, random_ball
+
+def overlapping_pairs(broadphase, bodies):
+    broadphase.rebuild(bodies)
+    pairs = [(id(a), id(b)) for a, b in broadphase.candidate_pairs() if a.rect.colliderect(b.rect)]
+    return pairs, {frozenset(pair) for pair in pairs}
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("cell_size", [16, 48, 100])
+def test_grid_finds_the_same_pairs_as_all_pairs(seed, cell_size):
+    random.seed(seed)
+    bodies = [random_ball() for _ in range(150)]
+    bodies += [game.Paddle(40, 300, game.left_ai_color), game.Paddle(game.SCREEN_WIDTH - 64, 300, game.right_ai_color)]
+    grid_pairs, grid_set = overlapping_pairs(SpatialHash(cell_size), bodies)
+    _, naive_set = overlapping_pairs(AllPairs(), bodies)
+    assert grid_set == naive_set
+    assert len(grid_pairs) == len(grid_set)
+
+def test_pairs_survive_rects_moving_during_the_collision_pass():
+    random.seed(3)
+    bodies = [random_ball() for _ in range(150)]
+    grid = SpatialHash()
+    grid.rebuild(bodies)
+    expected = {frozenset((id(a), id(b))) for a, b in grid.candidate_pairs()}
+    for ball in bodies:
+        ball.rect.x += 37
+        ball.rect.y -= 29
+    pairs = [frozenset((id(a), id(b))) for a, b in grid.candidate_pairs()]
+    assert set(pairs) == expected
+    assert len(pairs) == len(expected)
+
+def test_naive_broadphase_checks_every_counted_pair():
+    match = MultiBallMatch(40, seed=1, broadphase="naive")
+    match.collide()
+    assert match.checks == match.naive_checks()
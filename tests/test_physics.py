@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+import main as game
+
+LEFT_X = 40
+RIGHT_X = game.SCREEN_WIDTH - 64
+PADDLE_Y = 300
+
+def paddles():
+    return (game.Paddle(LEFT_X, PADDLE_Y, game.left_ai_color),
+            game.Paddle(RIGHT_X, PADDLE_Y, game.right_ai_color))
+
+def make_ball(x, y, speed_x, speed_y):
+    ball = game.Ball(x, y)
+    ball.speed_x, ball.speed_y = speed_x, speed_y
+    return ball
+
+def advance(x, y, speed_x, speed_y, steps, single):
+    random.seed(0)  # a goal resets the ball in a random direction
+    left, right = paddles()
+    ball = make_ball(x, y, speed_x, speed_y)
+    if single:
+        events, last_hitter = [], None
+        for _ in range(steps):
+            step_events, last_hitter = game.advance_ball(ball, left, right, None, last_hitter)
+            events += step_events
+    else:
+        events, last_hitter = game.advance_ball(ball, left, right, None, None, steps=steps)
+    return ball.rect.topleft, (ball.speed_x, ball.speed_y), events, last_hitter
+
+# (x, y, speed_x, speed_y): front faces, top and bottom faces and corners of the left paddle
+CASES = [
+    (150, 340, -7, 0),   # front face head on
+    (150, 330, -7, 3),   # front face at an angle
+    (52, 200, 0, 7),     # top face from above
+    (52, 500, 0, -7),    # bottom face from below
+    (100, 230, -6, 6),   # top front corner
+    (100, 470, -6, -6),  # bottom front corner
+    (10, 230, 3, 6),     # top back corner
+    (0, 340, 5, 0),      # back face
+]
+
+@pytest.mark.parametrize("x, y, speed_x, speed_y", CASES)
+@pytest.mark.parametrize("steps", [4, 10, 25])
+def test_coarse_steps_match_single_steps(x, y, speed_x, speed_y, steps):
+    assert advance(x, y, speed_x, speed_y, steps, single=False) == advance(x, y, speed_x, speed_y, steps, single=True)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_coarse_steps_match_single_steps_near_paddles(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        x = rng.choice((rng.randint(0, 120), rng.randint(RIGHT_X - 60, game.SCREEN_WIDTH - 24)))
+        y = rng.randint(game.HEADER_HEIGHT, game.SCREEN_HEIGHT - 24)
+        speed_x = rng.choice((-1, 1)) * rng.randint(1, 12)
+        speed_y = rng.choice((-1, 1)) * rng.randint(0, 12)
+        steps = rng.randint(2, 30)
+        assert (advance(x, y, speed_x, speed_y, steps, single=False) ==
+                advance(x, y, speed_x, speed_y, steps, single=True)), (x, y, speed_x, speed_y, steps)
+
+@pytest.mark.parametrize("x, y, speed_x, speed_y", CASES + [(45, 290, 4, 5), (30, 310, -3, 2)])
+def test_one_contact_per_paddle_face(x, y, speed_x, speed_y):
+    left, right = paddles()
+    ball = make_ball(x, y, speed_x, speed_y)
+    events, _ = game.advance_ball(ball, left, right, None, None, steps=1)
+    assert sum(kind == 'hit' for kind, _ in events) <= 1
+
+def test_top_face_reflects_vertical_speed():
+    left, right = paddles()
+    ball = make_ball(52, PADDLE_Y - 26, 0, 7)
+    events, last_hitter = game.advance_ball(ball, left, right, None, None)
+    assert events == [('hit', 'left')] and last_hitter == 'left'
+    assert (ball.speed_x, ball.speed_y) == (0, -7)
+    assert ball.rect.bottom <= PADDLE_Y
+
+def test_ball_stays_inside_walls_out_of_bounce_budget():
+    left, right = paddles()
+    # Bounces between the walls faster than the budget allows in one call
+    ball = make_ball(400, game.HEADER_HEIGHT + 10, 0, 400)
+    game.advance_ball(ball, left, right, None, None, steps=100)
+    assert game.HEADER_HEIGHT <= ball.rect.top and ball.rect.bottom <= game.SCREEN_HEIGHT
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+import main as game
+import build_policy_table
+
+# A slice of the full table is enough to check the folded-out dimensions
+BALL_Y_MIN, BALL_Y_COUNT = 300, 16
+PADDLE_Y_MIN, PADDLE_Y_COUNT = 260, 48
+
+@pytest.fixture(scope="module")
+def policy(tmp_path_factory):
+    patch = pytest.MonkeyPatch()
+    for name, value in (("BALL_Y_MIN", BALL_Y_MIN), ("BALL_Y_COUNT", BALL_Y_COUNT),
+                        ("PADDLE_Y_MIN", PADDLE_Y_MIN), ("PADDLE_Y_COUNT", PADDLE_Y_COUNT)):
+        patch.setattr(build_policy_table, name, value)
+    path = str(tmp_path_factory.mktemp("policy") / "policy.bin")
+    build_policy_table.build_table(path, workers=1)
+    patch.undo()
+    table = game.MinimaxPolicyTable(path)
+    yield table
+    table.close()
+
+def live_move(ball, paddle, opponent, center_ball, is_left_paddle):
+    _, move = game.minimax_alpha_beta(ball, paddle, opponent, center_ball, depth=4, alpha=float('-inf'),
+                                      beta=float('inf'), maximizing=True, is_left_paddle=is_left_paddle)
+    return move
+
+def test_lookup_matches_live_search(policy):
+    rng = random.Random(0)
+    center_ball = game.Ball(game.SCREEN_WIDTH // 2, 300)
+    for _ in range(1000):
+        is_left_paddle = rng.random() < 0.5
+        ball = game.Ball(rng.randint(100, game.SCREEN_WIDTH - 124),
+                         rng.randrange(BALL_Y_MIN, BALL_Y_MIN + BALL_Y_COUNT))
+        ball.speed_x = rng.choice((-1, 1)) * rng.randint(4, 12)
+        ball.speed_y = rng.choice((-1, 1)) * build_policy_table.BALL_SPEED
+        paddle_y = rng.randrange(PADDLE_Y_MIN, PADDLE_Y_MIN + PADDLE_Y_COUNT)
+        paddle = game.Paddle(40 if is_left_paddle else game.SCREEN_WIDTH - 64, paddle_y, game.WHITE)
+        opponent = game.Paddle(game.SCREEN_WIDTH - 64 if is_left_paddle else 40,
+                               rng.randint(game.HEADER_HEIGHT, game.SCREEN_HEIGHT - 120), game.WHITE)
+        center_ball.rect.y = rng.randint(game.HEADER_HEIGHT, game.SCREEN_HEIGHT - 24)
+        state = (ball.rect.topleft, ball.speed_x, ball.speed_y, paddle_y, is_left_paddle)
+        assert policy.lookup(ball, paddle, is_left_paddle) == live_move(
+            ball, paddle, opponent, center_ball, is_left_paddle), state
+
+def test_states_outside_the_table_miss(policy):
+    ball = game.Ball(400, BALL_Y_MIN + BALL_Y_COUNT)
+    ball.speed_y = build_policy_table.BALL_SPEED
+    paddle = game.Paddle(40, PADDLE_Y_MIN, game.WHITE)
+    assert policy.lookup(ball, paddle, True) is None
+    ball.rect.y = BALL_Y_MIN
+    ball.speed_y = 5
+    assert policy.lookup(ball, paddle, True) is None
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+import main as game
+import headless
+
+def play_from_snapshot(match_class, ticks, **kwargs):
+    match = match_class("minimax", "hybrid", duration=60, seed=3, **kwargs)
+    while match.tick < ticks:
+        match.step()
+    data = match.snapshot()
+    expected = match.run()
+
+    # A fresh process would start from other RNG and counter states
+    random.seed(99)
+    game.hybrid_plan_stats["hits"] += 1000
+    resumed = match_class("minimax", "hybrid", duration=60, seed=5, **kwargs)
+    resumed.restore(data)
+    return expected, resumed.run()
+
+@pytest.mark.parametrize("ticks", [1, 600, 2500])
+def test_restored_match_plays_out_identically(ticks):
+    expected, resumed = play_from_snapshot(headless.HeadlessMatch, ticks)
+    expected.pop('seed')
+    resumed.pop('seed')
+    assert resumed == expected
+
+def test_restored_event_driven_match_plays_out_identically():
+    expected, resumed = play_from_snapshot(headless.EventDrivenMatch, 900, decision_interval=4)
+    expected.pop('seed')
+    resumed.pop('seed')
+    assert resumed == expected
+
+def test_game_globals_round_trip(monkeypatch):
+    match = headless.HeadlessMatch("hybrid", "minimax", duration=60, seed=1)
+    for _ in range(300):
+        match.step()
+    for name, value in (("ball", match.ball), ("center_ball", match.center_ball),
+                        ("left_ai_paddle", match.left_paddle), ("right_ai_paddle", match.right_paddle),
+                        ("left_score", 2), ("right_score", 1), ("last_hitter", "left"),
+                        ("left_ai_type", "hybrid"), ("right_ai_type", "minimax"),
+                        ("left_ai_reaction", 0.04), ("right_ai_reaction", 0.06)):
+        monkeypatch.setattr(game, name, value, raising=False)
+    data = game.snapshot_game(12.5)
+    state = random.getstate()
+
+    random.seed(1)
+    assert game.restore_game(data) == 12.5
+    assert random.getstate() == state
+    assert game.ball is not match.ball
+    assert (game.ball.rect, game.ball.speed_x, game.ball.speed_y, game.ball.trajectory) == \
+        (match.ball.rect, match.ball.speed_x, match.ball.speed_y, match.ball.trajectory)
+    assert (game.left_score, game.right_score, game.last_hitter) == (2, 1, "left")
+    assert game.snapshot_game(12.5) == data
+
+def test_snapshot_from_another_format_is_rejected():
+    match = headless.HeadlessMatch("minimax", "minimax", duration=1, seed=0)
+    data = bytearray(match.snapshot())
+    data[:4] = b'XXXX'
+    with pytest.raises(ValueError):
+        match.restore(bytes(data))
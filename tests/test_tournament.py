@@ -0,0 +1,50 @@
+import math
+import random
+
+import pytest
+
+from tournament import ConfidenceStop, Sprt, normal_quantile
+
+def test_normal_quantile():
+    assert normal_quantile(0.5) == pytest.approx(0.0, abs=1e-9)
+    assert normal_quantile(0.975) == pytest.approx(1.959964, abs=1e-6)
+    assert normal_quantile(0.995) == pytest.approx(2.575829, abs=1e-6)
+
+def test_sprt_thresholds():
+    test = Sprt(confidence=0.95, delta=0.1)
+    # Each decisive result moves the LLR by log(0.6 / 0.4); the bounds are +-log(19)
+    needed = math.ceil(math.log(19) / math.log(1.5))
+    assert test.decide(needed, 0, 0) == "a"
+    assert test.decide(needed - 1, 0, 0) is None
+    assert test.decide(0, 0, needed) == "b"
+    assert test.decide(needed + 5, 100, 5) == "a"  # draws carry no information
+    assert test.decide(30, 0, 30) is None
+
+def test_confidence_stop_needs_a_clear_majority():
+    test = ConfidenceStop(confidence=0.95)
+    assert test.decide(0, 0, 0) is None
+    assert test.decide(6, 0, 4) is None
+    assert test.decide(70, 20, 30) == "a"
+    assert test.decide(30, 20, 70) == "b"
+
+def run_sequential(test, p_win, rng, max_matches=2000):
+    wins = losses = 0
+    for _ in range(max_matches):
+        if rng.random() < p_win:
+            wins += 1
+        else:
+            losses += 1
+        verdict = test.decide(wins, 0, losses)
+        if verdict:
+            return verdict
+    return None
+
+def test_sprt_error_rates():
+    rng = random.Random(0)
+    test = Sprt(confidence=0.95, delta=0.1)
+    runs = 400
+    # Strongest null: A wins at the lower hypothesis rate; a verdict for A is a false positive
+    false_a = sum(run_sequential(test, 0.4, rng) == "a" for _ in range(runs))
+    found_a = sum(run_sequential(test, 0.6, rng) == "a" for _ in range(runs))
+    assert false_a / runs <= 0.05
+    assert found_a / runs >= 0.9
@@ -0,0 +1,72 @@
+import os
+import time
+
+import workqueue
+from workqueue import SpoolQueue, merge
+
+def make_queue(tmp_path, matches=6, batch_size=2):
+    queue = SpoolQueue(str(tmp_path / "spool"))
+    queue.submit("minimax", "hybrid", matches, batch_size, duration=1)
+    return queue
+
+def age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+def test_submit_is_idempotent(tmp_path):
+    queue = make_queue(tmp_path)
+    assert queue.status() == {'pending': 3, 'claimed': 0, 'done': 0}
+    assert queue.submit("minimax", "hybrid", 6, 2, duration=1) == 0
+
+def test_each_batch_is_claimed_once(tmp_path):
+    queue = make_queue(tmp_path)
+    claims = [queue.claim(f"worker-{n}") for n in range(4)]
+    assert claims[3] is None
+    seeds = [seed for descriptor, _ in claims[:3] for seed in descriptor['seeds']]
+    assert sorted(seeds) == list(range(6))
+    assert queue.status() == {'pending': 0, 'claimed': 3, 'done': 0}
+
+def test_claim_of_a_long_queued_batch_is_not_expired(tmp_path):
+    queue = make_queue(tmp_path, matches=2)
+    for name in os.listdir(queue.pending_dir):
+        age(os.path.join(queue.pending_dir, name), 3600)
+    descriptor, claimed_path = queue.claim("worker")
+    assert queue.requeue_expired(lease=60) == 0
+    assert os.path.exists(claimed_path)
+
+def test_requeue_racing_a_claim_leaves_it_claimed(tmp_path, monkeypatch):
+    queue = make_queue(tmp_path, matches=2)
+    for name in os.listdir(queue.pending_dir):
+        age(os.path.join(queue.pending_dir, name), 3600)
+    rename = os.rename
+
+    def rename_then_requeue(source, target):
+        rename(source, target)
+        queue.requeue_expired(lease=60)  # a coordinator scanning right after the rename
+
+    monkeypatch.setattr(workqueue.os, "rename", rename_then_requeue)
+    descriptor, claimed_path = queue.claim("worker")
+    assert descriptor['seeds'] == [0, 1]
+    assert queue.status() == {'pending': 0, 'claimed': 1, 'done': 0}
+
+def test_expired_claims_return_to_pending(tmp_path):
+    queue = make_queue(tmp_path, matches=4)
+    _, stale_path = queue.claim("dead")
+    _, live_path = queue.claim("alive")
+    age(stale_path, 3600)
+    assert queue.requeue_expired(lease=60) == 1
+    assert queue.status() == {'pending': 1, 'claimed': 1, 'done': 0}
+    descriptor, _ = queue.claim("next")
+    assert descriptor['seeds'] == [0, 1]
+
+def test_completing_a_requeued_claim_keeps_one_result(tmp_path):
+    queue = make_queue(tmp_path, matches=2)
+    descriptor, claimed_path = queue.claim("slow")
+    age(claimed_path, 3600)
+    queue.requeue_expired(lease=60)
+    queue.complete(descriptor, {'0': "bot1", '1': "draw"}, claimed_path, "slow", 1.0)
+    again, again_path = queue.claim("fast")
+    queue.complete(again, {'0': "bot1", '1': "draw"}, again_path, "fast", 1.0)
+    assert queue.status() == {'pending': 0, 'claimed': 0, 'done': 1}
+    stats = merge(queue, str(tmp_path / "stats.json"))
+    assert (stats.bot1_wins, stats.bot2_wins, stats.draws, stats.total_matches) == (1, 0, 1, 2)
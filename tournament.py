@@ -0,0 +1,298 @@
+"""Head-to-head tournaments that stop once the winner is decided.
+
+Bot A plays bot B over consecutive seeds, A taking the left side on even
+seeds, and every result is recorded through MatchStatistics (bot1 is A,
+bot2 is B). After each result a sequential test looks at A's wins and
+losses so far (draws say nothing about which bot is stronger) and halts
+scheduling as soon as it reaches a verdict at the configured confidence:
+
+- sprt: Wald's sequential probability ratio test between "A wins a
+  decisive match with probability 1/2 + delta" and "with 1/2 - delta".
+  Error rates hold however often it looks, but bots closer than delta
+  can take up to --max-matches to separate.
+- ci: stop when the Wilson interval on A's share of decisive matches
+  excludes 1/2. Looking after every match makes the real error rate
+  higher than the nominal one, so keep --min-matches reasonably high.
+
+Matches already running when the verdict arrives are still recorded.
+With --checkpoint the run can be interrupted and started again with the
+same command line; it carries on where the checkpoint left off.
+
+Usage:
+    python tournament.py minimax hybrid --max-matches 400 --workers 4
+    python tournament.py minimax mcts --stop ci --confidence 0.99 --stats mcts_stats.json
+    python tournament.py minimax hybrid --max-matches 2000 --checkpoint run.json   # rerun to resume
+"""
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import main as game
+import headless
+from sweep import wilson_interval
+
+STATS_FILE = "tournament_stats.json"
+
+class Sprt:
+    """Wald's SPRT on decisive matches; decide() returns "a", "b" or None"""
+    def __init__(self, confidence=0.95, delta=0.1):
+        alpha = beta = 1 - confidence
+        self.upper = math.log((1 - beta) / alpha)
+        self.lower = math.log(beta / (1 - alpha))
+        # Each win adds this much log-likelihood ratio in favour of A, each loss takes it away
+        self.step = math.log((0.5 + delta) / (0.5 - delta))
+
+    def llr(self, wins, losses):
+        return (wins - losses) * self.step
+
+    def decide(self, wins, draws, losses):
+        llr = self.llr(wins, losses)
+        if llr >= self.upper:
+            return "a"
+        if llr <= self.lower:
+            return "b"
+        return None
+
+    def status(self, wins, draws, losses):
+        return f"LLR {self.llr(wins, losses):+.2f} in [{self.lower:.2f}, {self.upper:.2f}]"
+
+class ConfidenceStop:
+    """Stops when the Wilson interval on A's share of decisive matches excludes 1/2"""
+    def __init__(self, confidence=0.95):
+        self.z = normal_quantile(0.5 + confidence / 2)
+
+    def decide(self, wins, draws, losses):
+        low, high = wilson_interval(wins, wins + losses, self.z)
+        if low > 0.5:
+            return "a"
+        if high < 0.5:
+            return "b"
+        return None
+
+    def status(self, wins, draws, losses):
+        low, high = wilson_interval(wins, wins + losses, self.z)
+        return f"A share [{low:.1%}, {high:.1%}]"
+
+def normal_quantile(p):
+    """Inverse standard normal CDF, by bisection on math.erf"""
+    low, high = -10.0, 10.0
+    for _ in range(80):
+        mid = (low + high) / 2
+        if 0.5 * (1 + math.erf(mid / math.sqrt(2))) < p:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+class Checkpoint:
+    """Tournament progress in a JSON file, plus snapshots of the matches that were in flight.
+
+    Saved every few results and at the end. On start an existing
+    checkpoint of the same tournament is picked up: finished seeds are not
+    played again, interrupted matches continue from their last snapshot
+    and the stats file is put back to the counts of the checkpoint, so
+    results recorded after it are not counted twice.
+    """
+    def __init__(self, path, config):
+        self.path = path
+        self.snapshot_dir = path + ".matches" if path else None
+        self.config = config
+        self.record = [0, 0, 0]
+        self.completed = set()
+        self.next_seed = config['seed']
+        self.verdict = None
+        self.decided_at = None
+        self.stats = None
+        if path and os.path.exists(path):
+            self.load()
+        if self.snapshot_dir:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+
+    def load(self):
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        if data['config'] != self.config:
+            raise SystemExit(f"{self.path} is the checkpoint of a different tournament: {data['config']}")
+        self.record = data['record']
+        self.completed = set(data['completed'])
+        self.next_seed = data['next_seed']
+        self.verdict = data['verdict']
+        self.decided_at = data['decided_at']
+        self.stats = data['stats']
+
+    def save(self, stats):
+        if not self.path:
+            return
+        data = {'config': self.config, 'record': self.record, 'completed': sorted(self.completed),
+                'next_seed': self.next_seed, 'verdict': self.verdict, 'decided_at': self.decided_at,
+                'stats': {'bot1_wins': stats.bot1_wins, 'bot2_wins': stats.bot2_wins, 'draws': stats.draws,
+                          'total_matches': stats.total_matches}}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def snapshot_path(self, seed):
+        return os.path.join(self.snapshot_dir, f"{seed}.snap") if self.snapshot_dir else None
+
+    def unfinished(self):
+        """Seeds handed out before the interruption that never reported back"""
+        return [seed for seed in range(self.config['seed'], self.next_seed) if seed not in self.completed]
+
+def play_tournament_match(job):
+    """Worker side: one match with A on the given side; returns (seed, winner from A's point of view).
+
+    With a snapshot path the match state is saved there every
+    `snapshot_every` ticks, and a match that finds one carries on from it.
+    """
+    ai_a, ai_b, a_left, seed, duration, decision_interval, snapshot_path, snapshot_every = job
+    left, right = (ai_a, ai_b) if a_left else (ai_b, ai_a)
+    match = headless.EventDrivenMatch(left, right, duration=duration, seed=seed,
+                                      decision_interval=decision_interval)
+    if snapshot_path:
+        try:
+            with open(snapshot_path, 'rb') as f:
+                match.restore(f.read())
+        except FileNotFoundError:
+            pass  # nothing saved yet, or another worker finished this seed meanwhile
+    next_snapshot = match.tick + snapshot_every
+    while not match.finished():
+        match.step()
+        if snapshot_path and match.tick >= next_snapshot:
+            # Per-process temporary name: a requeued batch may briefly be played by two workers
+            tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(match.snapshot())
+            os.replace(tmp_path, snapshot_path)
+            next_snapshot = match.tick + snapshot_every
+    if snapshot_path:
+        try:
+            os.remove(snapshot_path)
+        except FileNotFoundError:
+            pass
+    winner = match.run()['winner']
+    if not a_left and winner != "draw":
+        winner = "bot2" if winner == "bot1" else "bot1"
+    return seed, winner
+
+def run_tournament(ai_a, ai_b, test, stats, checkpoint, max_matches, min_matches=0, workers=None,
+                   duration=game.MATCH_DURATION, decision_interval=1, checkpoint_every=10, snapshot_every=600):
+    """Play until `test` decides or max_matches are done; returns (verdict, decided_at, [W, D, L])"""
+    workers = workers or os.cpu_count() or 1
+    record = checkpoint.record
+    first_seed = checkpoint.config['seed']
+    retry = checkpoint.unfinished()
+    pending = set()
+    unsaved = 0
+    with ProcessPoolExecutor(workers) as pool:
+        while True:
+            while checkpoint.verdict is None and len(pending) < workers * 2:
+                if retry:
+                    seed = retry.pop(0)
+                elif checkpoint.next_seed - first_seed < max_matches:
+                    seed = checkpoint.next_seed
+                    checkpoint.next_seed += 1
+                else:
+                    break
+                job = (ai_a, ai_b, seed % 2 == 0, seed, duration, decision_interval,
+                       checkpoint.snapshot_path(seed), snapshot_every)
+                pending.add(pool.submit(play_tournament_match, job))
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                seed, winner = future.result()
+                stats.record_match(winner)
+                checkpoint.completed.add(seed)
+                record[0 if winner == "bot1" else 2 if winner == "bot2" else 1] += 1
+                unsaved += 1
+                played = sum(record)
+                if checkpoint.verdict is None and played >= min_matches:
+                    checkpoint.verdict = test.decide(*record)
+                    if checkpoint.verdict:
+                        checkpoint.decided_at = played
+                        # Queued matches are dropped; running ones finish and still count
+                        for queued in pending:
+                            queued.cancel()
+            if unsaved >= checkpoint_every:
+                checkpoint.save(stats)
+                unsaved = 0
+            print(f"\r{sum(record)}/{max_matches} matches, A {record[0]}-{record[1]}-{record[2]} "
+                  f"| {test.status(*record)}", end="", flush=True)
+    checkpoint.save(stats)
+    print()
+    return checkpoint.verdict, checkpoint.decided_at, record
+
+def main():
+    parser = argparse.ArgumentParser(description="Play bot A against bot B until one is decidedly stronger")
+    parser.add_argument("ai_a", choices=game.AI_TYPES)
+    parser.add_argument("ai_b", choices=game.AI_TYPES)
+    parser.add_argument("--stop", choices=["sprt", "ci", "none"], default="sprt", help="sequential stopping rule")
+    parser.add_argument("--confidence", type=float, default=0.95, help="1 - error rate of the verdict")
+    parser.add_argument("--delta", type=float, default=0.1,
+                        help="sprt: win probability margin over 1/2 that counts as stronger")
+    parser.add_argument("--max-matches", type=int, default=400)
+    parser.add_argument("--min-matches", type=int, default=10, help="matches before the test may stop")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--duration", type=float, default=game.MATCH_DURATION, help="match length in seconds")
+    parser.add_argument("--decision-interval", type=int, default=1, help="frames between AI decisions")
+    parser.add_argument("--stats", default=STATS_FILE, help="MatchStatistics file to record results into")
+    parser.add_argument("--checkpoint", metavar="FILE",
+                        help="save progress here and resume from it if it exists (in-flight matches "
+                             "are snapshotted under FILE.matches/)")
+    parser.add_argument("--checkpoint-every", type=int, default=10, help="results between checkpoint writes")
+    parser.add_argument("--snapshot-every", type=int, default=600, help="ticks between in-flight match snapshots")
+    args = parser.parse_args()
+    if not 0.5 < args.confidence < 1:
+        parser.error("--confidence must be between 0.5 and 1")
+    if not 0 < args.delta < 0.5:
+        parser.error("--delta must be between 0 and 0.5")
+
+    if args.stop == "sprt":
+        test = Sprt(args.confidence, args.delta)
+    elif args.stop == "ci":
+        test = ConfidenceStop(args.confidence)
+    else:
+        test = ConfidenceStop(args.confidence)
+        args.min_matches = args.max_matches
+    stats = game.MatchStatistics(args.stats)
+    config = {'ai_a': args.ai_a, 'ai_b': args.ai_b, 'seed': args.seed, 'stop': args.stop,
+              'confidence': args.confidence, 'delta': args.delta, 'min_matches': args.min_matches,
+              'duration': args.duration, 'decision_interval': args.decision_interval}
+    checkpoint = Checkpoint(args.checkpoint, config)
+    if checkpoint.stats:
+        print(f"Resuming from {args.checkpoint}: {sum(checkpoint.record)} matches done, "
+              f"{len(checkpoint.unfinished())} to replay or continue")
+        stats.bot1_wins, stats.bot2_wins = checkpoint.stats['bot1_wins'], checkpoint.stats['bot2_wins']
+        stats.draws, stats.total_matches = checkpoint.stats['draws'], checkpoint.stats['total_matches']
+        stats.save_stats()
+
+    start = time.perf_counter()
+    verdict, decided_at, record = run_tournament(args.ai_a, args.ai_b, test, stats, checkpoint,
+                                                 args.max_matches, args.min_matches, args.workers,
+                                                 args.duration, args.decision_interval,
+                                                 args.checkpoint_every, args.snapshot_every)
+    played = sum(record)
+    elapsed = time.perf_counter() - start
+    print(f"A={args.ai_a} vs B={args.ai_b}: {record[0]} wins, {record[1]} draws, {record[2]} losses "
+          f"for A in {played} matches ({elapsed:.1f}s) -> {args.stats}")
+    if verdict:
+        stronger = args.ai_a if verdict == "a" else args.ai_b
+        saved = args.max_matches - played
+        print(f"{stronger} is stronger at {args.confidence:.0%} confidence, decided after {decided_at} matches "
+              f"| {saved} of {args.max_matches} matches saved ({saved / args.max_matches:.0%})")
+    else:
+        print(f"Undecided after {played} matches | {test.status(*record)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""Gym-style environments for training paddle controllers against the built-in bots.
+
+PongEnv is one match with the learner on one side and ai_move_minimax or
+ai_move_hybrid on the other. VecEnv steps a batch of them, either in this
+process (with all opponent minimax searches batched into one NumPy call)
+or split across subprocess workers.
+
+    env = VecEnv(64, opponent="hybrid", workers=4)
+    obs = env.reset(seed=0)
+    obs, rewards, dones, infos = env.step(actions)   # actions: 0 stay, 1 up, 2 down
+
+Benchmark:
+    python vec_env.py --envs 64 --workers 4 --steps 2000
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import main as game
+import headless
+
+np = game.np
+
+ACTIONS = ("stay", "up", "down")
+OBS_SIZE = 8
+BALL_SPEED_SCALE = 10.0
+
+class PongEnv:
+    """One match; the learner plays `side` against the `opponent` bot.
+
+    Observations are seen from the learner's side (x mirrored when it
+    plays on the right): ball x, y, vx, vy, own paddle y, opponent paddle
+    y, center ball y and the fraction of the match left. The reward is +1
+    when the learner scores and -1 when the opponent does.
+    """
+    def __init__(self, opponent="hybrid", side="left", duration=game.MATCH_DURATION, frame_skip=1):
+        if np is None:
+            raise ImportError("vec_env needs numpy (pip install numpy)")
+        if opponent not in ("minimax", "hybrid"):
+            raise ValueError(f"Unknown opponent: {opponent}")
+        self.opponent = opponent
+        self.is_left = side == "left"
+        self.duration = duration
+        self.frame_skip = frame_skip
+        self.match = None
+
+    def reset(self):
+        learner = "learner"
+        if self.is_left:
+            self.match = headless.HeadlessMatch(learner, self.opponent, duration=self.duration)
+        else:
+            self.match = headless.HeadlessMatch(self.opponent, learner, duration=self.duration)
+        return self.observation()
+
+    @property
+    def learner_paddle(self):
+        return self.match.left_paddle if self.is_left else self.match.right_paddle
+
+    @property
+    def opponent_paddle(self):
+        return self.match.right_paddle if self.is_left else self.match.left_paddle
+
+    def observation(self):
+        match = self.match
+        ball = match.ball
+        x = ball.rect.centerx / game.SCREEN_WIDTH
+        vx = ball.speed_x / BALL_SPEED_SCALE
+        if not self.is_left:
+            x, vx = 1.0 - x, -vx
+        return np.array([
+            x,
+            ball.rect.centery / game.SCREEN_HEIGHT,
+            vx,
+            ball.speed_y / BALL_SPEED_SCALE,
+            self.learner_paddle.rect.centery / game.SCREEN_HEIGHT,
+            self.opponent_paddle.rect.centery / game.SCREEN_HEIGHT,
+            match.center_ball.rect.centery / game.SCREEN_HEIGHT,
+            1.0 - match.tick / match.total_ticks,
+        ], dtype=np.float32)
+
+    def minimax_search(self):
+        """The opponent's search for this frame, if it will need one, for batching"""
+        match = self.match
+        params = match.right_params if self.is_left else match.left_params
+        if game.needs_minimax_search(self.opponent, self.opponent_paddle, match.ball, not self.is_left,
+                                     match.left_score, match.right_score, params):
+            return (match.ball, self.opponent_paddle, self.learner_paddle, match.center_ball,
+                    not self.is_left, params)
+        return None
+
+    # A frame is split in two so SyncVecEnv can batch the opponents'
+    # searches between moving the balls and letting the bots act
+    def move_ball(self):
+        """First half of a frame; returns the reward it produced"""
+        reward = 0.0
+        for kind, side in self.match.move_ball():
+            if kind == 'score':
+                reward += 1.0 if (side == 'left') == self.is_left else -1.0
+        return reward
+
+    def act(self, action):
+        """Second half of a frame: opponent turn, learner move, paddles advance"""
+        match = self.match
+        left_reaction, right_reaction = game.auto_balance_difficulty(match.left_score, match.right_score,
+                                                                     match.left_params, match.right_params)
+        game.ai_turn(self.opponent, self.opponent_paddle, match.ball, self.learner_paddle,
+                     match.center_ball, not self.is_left, match.left_score, match.right_score,
+                     right_reaction if self.is_left else left_reaction,
+                     match.right_params if self.is_left else match.left_params)
+        direction = ACTIONS[action]
+        if direction != "stay":
+            self.learner_paddle.move(direction)
+        match.left_paddle.advance()
+        match.right_paddle.advance()
+        match.tick += 1
+
+    def info(self):
+        return {"left_score": self.match.left_score, "right_score": self.match.right_score}
+
+    def step(self, action):
+        reward = 0.0
+        for _ in range(self.frame_skip):
+            reward += self.move_ball()
+            self.act(action)
+            if self.match.finished():
+                break
+        return self.observation(), reward, self.match.finished(), self.info()
+
+class SyncVecEnv:
+    """Several PongEnvs stepped in this process, with auto-reset on episode end"""
+    def __init__(self, num_envs, opponent="hybrid", side="left", duration=game.MATCH_DURATION, frame_skip=1):
+        self.envs = [PongEnv(opponent, side, duration, frame_skip) for _ in range(num_envs)]
+        self.num_envs = num_envs
+
+    def reset(self, seed=None):
+        if seed is not None:
+            random.seed(seed)
+        return np.stack([env.reset() for env in self.envs])
+
+    def step(self, actions):
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        active = list(range(self.num_envs))
+        frame_skip = self.envs[0].frame_skip if self.envs else 1
+        for _ in range(frame_skip):
+            for i in active:
+                rewards[i] += self.envs[i].move_ball()
+            if game.minimax_eval_mode == "batched":
+                searches = [search for search in (self.envs[i].minimax_search() for i in active) if search]
+                game.prefetch_minimax(searches)
+            for i in active:
+                self.envs[i].act(int(actions[i]))
+            active = [i for i in active if not self.envs[i].match.finished()]
+
+        observations = []
+        dones = np.zeros(self.num_envs, dtype=bool)
+        infos = []
+        for i, env in enumerate(self.envs):
+            obs = env.observation()
+            info = env.info()
+            dones[i] = env.match.finished()
+            if dones[i]:
+                info["final_observation"] = obs
+                obs = env.reset()
+            observations.append(obs)
+            infos.append(info)
+        return np.stack(observations), rewards, dones, infos
+
+    def close(self):
+        pass
+
+def _worker(conn, num_envs, opponent, side, duration, frame_skip):
+    envs = SyncVecEnv(num_envs, opponent, side, duration, frame_skip)
+    while True:
+        command, data = conn.recv()
+        if command == "reset":
+            conn.send(envs.reset(data))
+        elif command == "step":
+            conn.send(envs.step(data))
+        else:
+            break
+    conn.close()
+
+class VecEnv:
+    """`num_envs` matches, in-process (workers=0) or split over subprocess workers"""
+    def __init__(self, num_envs, opponent="hybrid", workers=0, side="left",
+                 duration=game.MATCH_DURATION, frame_skip=1):
+        self.num_envs = num_envs
+        self.local = None
+        self.pipes = []
+        self.processes = []
+        if workers <= 0:
+            self.local = SyncVecEnv(num_envs, opponent, side, duration, frame_skip)
+            return
+        workers = min(workers, num_envs)
+        self.splits = [num_envs // workers + (1 if i < num_envs % workers else 0) for i in range(workers)]
+        for count in self.splits:
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker,
+                                              args=(child, count, opponent, side, duration, frame_skip),
+                                              daemon=True)
+            process.start()
+            child.close()
+            self.pipes.append(parent)
+            self.processes.append(process)
+
+    def reset(self, seed=None):
+        if self.local:
+            return self.local.reset(seed)
+        for i, pipe in enumerate(self.pipes):
+            pipe.send(("reset", None if seed is None else seed + i))
+        return np.concatenate([pipe.recv() for pipe in self.pipes])
+
+    def step(self, actions):
+        if self.local:
+            return self.local.step(actions)
+        start = 0
+        for pipe, count in zip(self.pipes, self.splits):
+            pipe.send(("step", actions[start:start + count]))
+            start += count
+        results = [pipe.recv() for pipe in self.pipes]
+        observations = np.concatenate([r[0] for r in results])
+        rewards = np.concatenate([r[1] for r in results])
+        dones = np.concatenate([r[2] for r in results])
+        infos = [info for r in results for info in r[3]]
+        return observations, rewards, dones, infos
+
+    def close(self):
+        for pipe in self.pipes:
+            pipe.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.pipes = []
+        self.processes = []
+
+def benchmark(num_envs, workers, steps, opponent, frame_skip):
+    """Steps/second with random actions"""
+    env = VecEnv(num_envs, opponent=opponent, workers=workers, frame_skip=frame_skip)
+    rng = np.random.default_rng(0)
+    env.reset(seed=0)
+    start = time.perf_counter()
+    episodes = 0
+    for _ in range(steps):
+        _, _, dones, _ = env.step(rng.integers(0, len(ACTIONS), num_envs))
+        episodes += int(dones.sum())
+    elapsed = time.perf_counter() - start
+    env.close()
+    return num_envs * steps / elapsed, episodes
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized training environment")
+    parser.add_argument("--envs", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=0, help="subprocess workers (0: in-process)")
+    parser.add_argument("--steps", type=int, default=1000, help="vector steps to run")
+    parser.add_argument("--opponent", choices=["minimax", "hybrid"], default="hybrid")
+    parser.add_argument("--frame-skip", type=int, default=1, help="frames per action")
+    parser.add_argument("--minimax-eval", choices=["tree", "batched"], help="minimax leaf evaluation mode")
+    args = parser.parse_args()
+    game.set_minimax_eval_mode(args.minimax_eval)
+
+    rate, episodes = benchmark(args.envs, args.workers, args.steps, args.opponent, args.frame_skip)
+    cores = max(1, args.workers)
+    print(f"{args.envs} envs x {args.steps} steps vs {args.opponent} ({game.minimax_eval_mode} minimax): "
+          f"{rate:,.0f} steps/s, {rate / cores:,.0f} steps/s per core, {episodes} episodes finished")
+
+if __name__ == "__main__":
+    main()
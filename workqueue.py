@@ -0,0 +1,288 @@
+"""Filesystem work queue for spreading tournament matches over several hosts.
+
+Everything goes through a spool directory that all nodes can see (NFS,
+SMB, a synced volume); there is no server. The coordinator splits a
+tournament into batch descriptors under pending/. A worker claims one by
+renaming it into claimed/ (rename is atomic, so exactly one worker gets
+it) and keeps its lease alive by touching the claimed file while it
+plays. Results go to results/ under the batch name. A claim whose file
+has not been touched for --lease seconds belongs to a dead worker; the
+next worker or coordinator to notice moves it back to pending/, and the
+match that was in flight resumes from its snapshot in snapshots/.
+
+Matches are deterministic per seed, so a batch played twice (a worker
+that was only slow) writes the same result file twice and nothing is
+counted double. The coordinator rebuilds the MatchStatistics file from
+the counts it had before the first merge plus every result file.
+
+Usage:
+    python workqueue.py submit /mnt/spool minimax hybrid --matches 2000 --batch-size 20
+    python workqueue.py work /mnt/spool                 # on every node, as many as it has cores
+    python workqueue.py collect /mnt/spool --wait --stats ai_battle_stats.json
+    python workqueue.py run /tmp/spool minimax hybrid --matches 200 --workers 4   # all of it locally
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import main as game
+from tournament import play_tournament_match
+
+LEASE_SECONDS = 120
+POLL_SECONDS = 1.0
+
+def write_json(path, data):
+    """Write through a temporary name and rename, so readers never see half a file"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def read_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+class SpoolQueue:
+    """pending/, claimed/, results/ and snapshots/ under one shared directory"""
+    def __init__(self, directory):
+        self.directory = directory
+        self.pending_dir = os.path.join(directory, "pending")
+        self.claimed_dir = os.path.join(directory, "claimed")
+        self.results_dir = os.path.join(directory, "results")
+        self.snapshot_dir = os.path.join(directory, "snapshots")
+        for path in (self.pending_dir, self.claimed_dir, self.results_dir, self.snapshot_dir):
+            os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def _batches(directory):
+        return sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+
+    def submit(self, ai_a, ai_b, matches, batch_size, seed=0, duration=game.MATCH_DURATION, decision_interval=1):
+        """Write the batch descriptors for `matches` seeds from `seed` on; returns how many"""
+        count = 0
+        for start in range(seed, seed + matches, batch_size):
+            name = f"batch-{start:08d}.json"
+            if any(os.path.exists(os.path.join(d, name)) for d in (self.pending_dir, self.results_dir)):
+                continue
+            write_json(os.path.join(self.pending_dir, name), {
+                'batch': name, 'ai_a': ai_a, 'ai_b': ai_b, 'duration': duration,
+                'decision_interval': decision_interval,
+                'seeds': list(range(start, min(start + batch_size, seed + matches))),
+            })
+            count += 1
+        return count
+
+    def claim(self, worker):
+        """Move the first pending batch into claimed/; returns (descriptor, claimed path) or None"""
+        for name in self._batches(self.pending_dir):
+            pending_path = os.path.join(self.pending_dir, name)
+            claimed_path = os.path.join(self.claimed_dir, f"{name}@{worker}")
+            try:
+                # Touch first: a descriptor that waited longer than the lease
+                # would otherwise look expired the moment it lands in claimed/
+                os.utime(pending_path)
+                os.rename(pending_path, claimed_path)
+                return read_json(claimed_path), claimed_path
+            except FileNotFoundError:
+                continue  # another worker got there first, or our claim was requeued
+        return None
+
+    def requeue_expired(self, lease=LEASE_SECONDS):
+        """Return claims untouched for `lease` seconds to pending/; returns how many"""
+        count = 0
+        now = time.time()
+        for claim in os.listdir(self.claimed_dir):
+            path = os.path.join(self.claimed_dir, claim)
+            try:
+                expired = now - os.path.getmtime(path) > lease
+                if expired:
+                    os.rename(path, os.path.join(self.pending_dir, claim.partition("@")[0]))
+                    count += 1
+            except FileNotFoundError:
+                pass  # finished or requeued by someone else meanwhile
+        return count
+
+    def complete(self, descriptor, winners, claimed_path, worker, elapsed):
+        write_json(os.path.join(self.results_dir, descriptor['batch']), {
+            'batch': descriptor['batch'], 'ai_a': descriptor['ai_a'], 'ai_b': descriptor['ai_b'],
+            'winners': winners, 'worker': worker, 'elapsed': round(elapsed, 3)})
+        try:
+            os.remove(claimed_path)
+        except FileNotFoundError:
+            pass  # our lease had expired; the batch may be played again, to the same result
+
+    def status(self):
+        return {'pending': len(self._batches(self.pending_dir)), 'claimed': len(os.listdir(self.claimed_dir)),
+                'done': len(self._batches(self.results_dir))}
+
+    def results(self):
+        for name in self._batches(self.results_dir):
+            yield read_json(os.path.join(self.results_dir, name))
+
+class Lease:
+    """Touches a claimed file from a background thread until stopped"""
+    def __init__(self, path, lease=LEASE_SECONDS):
+        self.path = path
+        self.lease = lease
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self._renew, name="lease", daemon=True)
+        self.thread.start()
+
+    def _renew(self):
+        while not self.done.wait(self.lease / 4):
+            try:
+                os.utime(self.path)
+            except FileNotFoundError:
+                return
+
+    def stop(self):
+        self.done.set()
+        self.thread.join()
+
+def run_batch(queue, descriptor, snapshot_every=600):
+    """Play every seed of a batch; returns {seed: winner from A's point of view}"""
+    winners = {}
+    for seed in descriptor['seeds']:
+        job = (descriptor['ai_a'], descriptor['ai_b'], seed % 2 == 0, seed, descriptor['duration'],
+               descriptor['decision_interval'], os.path.join(queue.snapshot_dir, f"{seed}.snap"), snapshot_every)
+        _, winners[str(seed)] = play_tournament_match(job)
+    return winners
+
+def work(queue, worker, lease=LEASE_SECONDS, follow=False):
+    """Claim and play batches until none are left (or forever with `follow`); returns batches played"""
+    played = 0
+    while True:
+        queue.requeue_expired(lease)
+        claim = queue.claim(worker)
+        if claim:
+            descriptor, claimed_path = claim
+            start = time.perf_counter()
+            renewal = Lease(claimed_path, lease)
+            try:
+                winners = run_batch(queue, descriptor)
+            finally:
+                renewal.stop()
+            elapsed = time.perf_counter() - start
+            queue.complete(descriptor, winners, claimed_path, worker, elapsed)
+            played += 1
+            print(f"{worker}: {descriptor['batch']} ({len(winners)} matches) in {elapsed:.1f}s", flush=True)
+        elif follow or queue.status()['claimed']:
+            # Claims still out may expire and need playing again
+            time.sleep(POLL_SECONDS)
+        else:
+            return played
+
+def merge(queue, stats_file):
+    """Rebuild the MatchStatistics file from its pre-merge counts and every result; returns the stats"""
+    base_path = os.path.join(queue.directory, "base_stats.json")
+    stats = game.MatchStatistics(stats_file)
+    if os.path.exists(base_path):
+        base = read_json(base_path)
+    else:
+        base = {'bot1_wins': stats.bot1_wins, 'bot2_wins': stats.bot2_wins, 'draws': stats.draws,
+                'total_matches': stats.total_matches}
+        write_json(base_path, base)
+    stats.bot1_wins, stats.bot2_wins = base['bot1_wins'], base['bot2_wins']
+    stats.draws, stats.total_matches = base['draws'], base['total_matches']
+    for result in queue.results():
+        for winner in result['winners'].values():
+            stats.total_matches += 1
+            if winner == "bot1":
+                stats.bot1_wins += 1
+            elif winner == "bot2":
+                stats.bot2_wins += 1
+            else:
+                stats.draws += 1
+    stats.save_stats()
+    return stats
+
+def collect(queue, stats_file, lease=LEASE_SECONDS, wait=False):
+    """Merge results, waiting for the queue to drain with `wait`; returns the stats"""
+    while True:
+        requeued = queue.requeue_expired(lease)
+        stats = merge(queue, stats_file)
+        status = queue.status()
+        print(f"\r{status['done']} batches done, {status['claimed']} claimed, {status['pending']} pending"
+              f"{f', {requeued} requeued' if requeued else ''} | {stats.get_summary()}",
+              end="" if wait else "\n", flush=True)
+        if not wait or not status['pending'] and not status['claimed']:
+            if wait:
+                print()
+            return stats
+        time.sleep(POLL_SECONDS)
+
+def add_match_arguments(parser):
+    parser.add_argument("ai_a", choices=game.AI_TYPES)
+    parser.add_argument("ai_b", choices=game.AI_TYPES)
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=10, help="matches per batch descriptor")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duration", type=float, default=game.MATCH_DURATION, help="match length in seconds")
+    parser.add_argument("--decision-interval", type=int, default=1, help="frames between AI decisions")
+
+def main():
+    parser = argparse.ArgumentParser(description="Share tournament matches between hosts through a spool directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    submit = commands.add_parser("submit", help="write batch descriptors into the spool")
+    submit.add_argument("spool")
+    add_match_arguments(submit)
+
+    worker = commands.add_parser("work", help="claim and play batches")
+    worker.add_argument("spool")
+    worker.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    worker.add_argument("--lease", type=float, default=LEASE_SECONDS, help="seconds before a silent claim expires")
+    worker.add_argument("--follow", action="store_true", help="keep waiting for new batches")
+    worker.add_argument("--policy-table", help="minimax policy table from build_policy_table.py")
+
+    collector = commands.add_parser("collect", help="merge results into a MatchStatistics file")
+    collector.add_argument("spool")
+    collector.add_argument("--stats", default="tournament_stats.json")
+    collector.add_argument("--lease", type=float, default=LEASE_SECONDS, help="seconds before a silent claim expires")
+    collector.add_argument("--wait", action="store_true", help="keep merging until every batch is done")
+
+    local = commands.add_parser("run", help="submit, play with local worker processes and collect")
+    local.add_argument("spool")
+    add_match_arguments(local)
+    local.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    local.add_argument("--stats", default="tournament_stats.json")
+    local.add_argument("--lease", type=float, default=LEASE_SECONDS, help="seconds before a silent claim expires")
+    local.add_argument("--policy-table", help="minimax policy table from build_policy_table.py")
+    args = parser.parse_args()
+
+    queue = SpoolQueue(args.spool)
+    if args.command in ("submit", "run"):
+        count = queue.submit(args.ai_a, args.ai_b, args.matches, args.batch_size, args.seed,
+                             args.duration, args.decision_interval)
+        print(f"Submitted {count} batches of up to {args.batch_size} matches to {args.spool}")
+    if args.command == "work":
+        if args.policy_table:
+            game.load_minimax_policy(args.policy_table)
+        played = work(queue, args.worker_id, args.lease, args.follow)
+        print(f"{args.worker_id}: no work left after {played} batches")
+    elif args.command == "collect":
+        collect(queue, args.stats, args.lease, args.wait)
+    elif args.command == "run":
+        start = time.perf_counter()
+        command = [sys.executable, os.path.abspath(__file__), "work", args.spool, "--lease", str(args.lease)]
+        if args.policy_table:
+            command += ["--policy-table", args.policy_table]
+        workers = [subprocess.Popen(command + ["--worker-id", f"local-{n}"])
+                   for n in range(args.workers or os.cpu_count() or 1)]
+        try:
+            stats = collect(queue, args.stats, args.lease, wait=True)
+        finally:
+            for process in workers:
+                process.wait()
+        print(f"{stats.get_summary()} in {time.perf_counter() - start:.1f}s -> {args.stats}")
+
+if __name__ == "__main__":
+    main()